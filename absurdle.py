@@ -0,0 +1,261 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from game import MAX_GUESSES, Game, get_recommender
+from lexicon import get_lexicon
+from operator import itemgetter
+from patterns import PatternMatrix, decode_pattern
+import argparse
+import os
+import time
+
+
+def revealed(pattern: int, length: int) -> tuple:
+    '''
+    :param pattern: A packed pattern
+    :param length: The number of letters in the pattern
+    :return: (greens, yellows, the pattern), which is smaller the less the pattern gives away
+    '''
+    colors = decode_pattern(pattern, length)
+    return colors.count('G'), colors.count('Y'), pattern
+
+
+def largest_bucket(row, candidates: list, length: int) -> tuple:
+    '''
+    Partitions the candidates by the pattern a guess shows for them and picks the bucket the adversary keeps: the
+        largest one, with ties going to the pattern that gives away the fewest greens, then the fewest yellows
+    The patterns come straight from the guess's row of the pattern table, so this is one lookup per candidate and a count
+    :param row: The guess's row of the pattern table
+    :param candidates: Indexes (in the pattern table) of the words the answer could still be, in order
+    :param length: The number of letters in a word
+    :return: (the kept pattern, the candidates that give it, in order)
+    '''
+    if len(candidates) == len(row):
+        patterns = row
+    elif len(candidates) == 1:
+        patterns = [row[candidates[0]]]
+    else:
+        patterns = itemgetter(*candidates)(row)
+    counts = Counter(patterns)
+    largest = max(counts.values())
+    tied = [pattern for pattern, n in counts.items() if n == largest]
+    pattern = tied[0] if len(tied) == 1 else min(tied, key=lambda pattern: revealed(pattern, length))
+    return pattern, [i for i, p in zip(candidates, patterns) if p == pattern]
+
+
+class AbsurdleGame(Game):
+    '''
+    A class containing the rules and state of an adversarial (Absurdle-style) game, which never commits to an answer
+    Every guess is scored against all the words the answer could still be, and the game keeps whichever group of
+        them shares the most common pattern (see largest_bucket), so the player wins only once a single word is left
+        and they guess it
+    '''
+    def new_game(self, curated: bool = False, helper: bool = False, answer: str = None, hard: bool = False) -> None:
+        '''
+        Sets up the data needed to play a game
+        :param curated: Whether the answer may only be a curated word
+        :param helper: Whether the helper tracks the remaining possible words
+        :param answer: Ignored, since the game has no answer until it is over
+        :param hard: Whether every guess must use the hints revealed so far
+        '''
+        super().new_game(curated, helper, hard=hard)
+        self.answer = '' # Until the game is over, any candidate could be the answer
+        self.matrix = get_recommender(self.lexicon).matrix
+        self.candidates = list(self.lexicon.curated_indices) if curated else list(range(len(self.all_words)))
+
+    def take_guess(self, guess: str, filter_now: bool = True) -> list:
+        '''
+        Keeps the largest group of candidates that agree on the guess's pattern, then scores the guess against one of
+            them, which gives that same pattern and updates the helper exactly as in a normal game
+        :param guess: The user's guess, which must have passed check_guess
+        :param filter_now: Whether to filter remaining_words now, or leave it to be done elsewhere (see pending_work)
+        :return: A list of colors ('G', 'Y' or 'X'), one for each letter of the guess
+        '''
+        if self.is_over():
+            raise ValueError("ValueError: The game is already over")
+        _, self.candidates = largest_bucket(self.matrix.row(guess), self.candidates, self.word_length)
+        self.answer = self.all_words[self.candidates[0]] # A word consistent with every pattern shown so far
+        return super().take_guess(guess, filter_now)
+
+    def record(self) -> dict:
+        '''
+        Describes the game for the game history, with the word the game settled on as the answer
+        :return: The same fields as Game.record, plus that the game was adversarial
+        '''
+        record = super().record()
+        record['absurdle'] = True
+        return record
+
+    def tree_suggestion(self) -> str:
+        '''
+        The decision tree assumes a fixed answer, so it does not apply
+        :return: None
+        '''
+        return None
+
+
+class ForcedWinSearch:
+    '''
+    A class that searches for a sequence of guesses that wins against the adversary within a number of guesses
+    The adversary's reply to a guess is fixed (see largest_bucket), so a forced win is a single line of guesses
+        rather than a tree; at each position the guesses that leave the smallest largest bucket are tried first,
+        and positions already shown to be lost are remembered
+    '''
+    def __init__(self, matrix: PatternMatrix, width: int = 10) -> None:
+        '''
+        :param matrix: The pattern table of the word list guesses come from
+        :param width: How many guesses are tried at each position before the last two guesses (the second to last
+            guess always tries every word, since it must split the candidates completely)
+        '''
+        self.matrix = matrix
+        self.length = len(matrix.words[0])
+        self.width = width
+        self.lost = set()
+        self.partitions = 0
+
+    def bucket(self, guess: str, candidates: list) -> list:
+        '''
+        :param guess: A word guessed
+        :param candidates: Indexes of the words the answer could still be
+        :return: The candidates the adversary keeps
+        '''
+        self.partitions += 1
+        return largest_bucket(self.matrix.row(guess), candidates, self.length)[1]
+
+    def rank(self, candidates: list) -> list:
+        '''
+        :param candidates: Indexes of the words the answer could still be
+        :return: (largest bucket size, guess) pairs for every word, smallest first, preferring guesses that could
+            be the answer themselves
+        '''
+        lookup = itemgetter(*candidates)
+        possible = set(candidates)
+        ranked = []
+        for i, guess in enumerate(self.matrix.words):
+            self.partitions += 1
+            ranked.append((max(Counter(lookup(self.matrix.row(guess))).values()), i not in possible, guess))
+        ranked.sort()
+        return [(size, guess) for size, _, guess in ranked]
+
+    def solve(self, candidates: list, guesses_left: int) -> list:
+        '''
+        Finds guesses that are sure to win from a position
+        :param candidates: Indexes of the words the answer could still be, in order
+        :param guesses_left: How many guesses may still be made
+        :return: The winning guesses (the last is the answer), or None if none were found
+        '''
+        if len(candidates) == 1:
+            return [self.matrix.words[candidates[0]]] if guesses_left >= 1 else None
+        key = (tuple(candidates), guesses_left)
+        if guesses_left <= 1 or key in self.lost:
+            return None
+        if guesses_left == 2 and len(candidates) > 3 ** self.length: # More candidates than patterns can tell apart
+            self.lost.add(key)
+            return None
+        ranked = self.rank(candidates)
+        if guesses_left > 2:
+            ranked = ranked[:self.width]
+        for size, guess in ranked:
+            if size >= len(candidates) or (guesses_left == 2 and size > 1): # The rest are no better
+                break
+            line = self.solve(self.bucket(guess, candidates), guesses_left - 1)
+            if line is not None:
+                return [guess] + line
+        self.lost.add(key)
+        return None
+
+
+_search = None
+
+
+def init_worker(width: int) -> None:
+    '''
+    Opens the pattern table once per worker process (the memory-mapped table is shared between processes)
+    '''
+    global _search
+    _search = ForcedWinSearch(PatternMatrix(get_lexicon().get_words()), width)
+
+
+def opener_sizes(guesses: list, candidates: list) -> list:
+    '''
+    :param guesses: Opening guesses
+    :param candidates: Indexes of the words the answer could be
+    :return: (largest bucket size, guess) for each guess
+    '''
+    lookup = itemgetter(*candidates)
+    return [(max(Counter(lookup(_search.matrix.row(guess))).values()), guess) for guess in guesses]
+
+
+def solve_opening(opener: str, candidates: list, max_guesses: int) -> tuple:
+    '''
+    Searches for a forced win that starts with a given opening guess
+    :param opener: The first guess
+    :param candidates: Indexes of the words the answer could be
+    :param max_guesses: How many guesses the win may take
+    :return: (the winning guesses or None, partitions computed)
+    '''
+    _search.partitions = 0
+    line = _search.solve(_search.bucket(opener, candidates), max_guesses - 1)
+    return None if line is None else [opener] + line, _search.partitions
+
+
+def find_forced_win(curated: bool = True, max_guesses: int = MAX_GUESSES, openers: int = 16, width: int = 10,
+                    workers: int = None) -> tuple:
+    '''
+    Searches for the shortest forced win, trying each of the best few openers in its own process
+    Openers are ranked by the size of the bucket they leave, which is also spread over the processes
+    :param curated: Whether the answer may only be a curated word
+    :param max_guesses: The most guesses a win may take
+    :param openers: How many opening guesses to try
+    :param width: How many guesses to try at each later position (see ForcedWinSearch)
+    :param workers: How many processes to use (defaults to one per core)
+    :return: (the winning guesses or None, partitions computed)
+    '''
+    lexicon = get_lexicon()
+    words = lexicon.get_words()
+    candidates = list(lexicon.curated_indices) if curated else list(range(len(words)))
+    workers = workers or os.cpu_count() or 1
+    partitions = 0
+    with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(width,)) as pool:
+        chunk = -(-len(words) // workers)
+        sizes = [pair for result in pool.map(opener_sizes, [words[i:i + chunk] for i in range(0, len(words), chunk)],
+                                             [candidates] * workers) for pair in result]
+        partitions += len(words)
+        opening = [guess for _, guess in sorted(sizes)[:openers]]
+        for guesses in range(2, max_guesses + 1): # The first length with any win is the shortest
+            wins = []
+            for line, searched in pool.map(solve_opening, opening, [candidates] * len(opening),
+                                           [guesses] * len(opening)):
+                partitions += searched
+                if line is not None:
+                    wins.append(line)
+            if wins:
+                return wins[0], partitions
+    return None, partitions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Searches for guesses that are sure to beat the adversarial mode")
+    parser.add_argument('--all', action='store_true', help="let the answer be any word instead of a curated word")
+    parser.add_argument('--max-guesses', type=int, default=MAX_GUESSES, help="most guesses a win may take")
+    parser.add_argument('--openers', type=int, default=16, help="opening guesses to try, spread over the processes")
+    parser.add_argument('--width', type=int, default=10, help="guesses tried at each later position")
+    parser.add_argument('--workers', type=int, default=None, help="number of processes (default: one per core)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    line, partitions = find_forced_win(not args.all, args.max_guesses, args.openers, args.width, args.workers)
+    seconds = time.perf_counter() - start
+    if line is None:
+        print(f"No forced win in {args.max_guesses} guesses was found (try more --openers or --width)")
+    else:
+        game = AbsurdleGame()
+        game.new_game(curated=not args.all)
+        for guess in line:
+            colors = game.take_guess(guess)
+            print(f"{guess} {''.join(colors)} ({len(game.candidates)} left)")
+        print(f"Forced win in {len(line)} guesses")
+    print(f"{partitions} partitions in {seconds:.1f}s ({partitions / seconds:.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+from collections import Counter
+from game import get_allowed_guesses, get_recommender
+from hardmode import HardModeRules
+from history import GameHistory
+from lexicon import ALL_WORDS_FILE, CURATED_WORDS_FILE, Lexicon, default_answers_file, get_lexicon
+from patterns import encode_pattern
+from recommender import expected_size
+import argparse
+import math
+
+
+def best_guess(lexicon: Lexicon, candidates: list, progress=None, rules: HardModeRules = None) -> tuple:
+    '''
+    :param lexicon: The lexicon guesses come from
+    :param candidates: The words the answer could be
+    :param progress: Called as progress(done, total) while guesses are scored; it may raise to stop the ranking
+    :param rules: Hard mode's requirements at this position (None outside hard mode)
+    :return: (the guess that leaves the fewest candidates on average, that expected number)
+    '''
+    if len(candidates) == 1:
+        return candidates[0], 1.0
+    guesses = None if rules is None else get_allowed_guesses(lexicon).lookup(rules)
+    return get_recommender(lexicon).rank(candidates, 1, guesses, progress)[0]
+
+
+def analyze_turn(lexicon: Lexicon, candidates: list, guess: str, colors: list, best: tuple) -> tuple:
+    '''
+    Compares one guess with the best guess from the same position
+    :param lexicon: The lexicon guesses come from
+    :param candidates: The words the answer could be before the guess
+    :param guess: The word guessed
+    :param colors: The colors the guess showed
+    :param best: The result of best_guess for the candidates
+    :return: (the words the answer could be after the guess, the turn's report)
+    '''
+    matrix = get_recommender(lexicon).matrix
+    row, index = matrix.row(guess), matrix.index
+    patterns = [row[index[word]] for word in candidates]
+    pattern = encode_pattern(colors)
+    after = [word for word, p in zip(candidates, patterns) if p == pattern]
+    expected = expected_size(list(Counter(patterns).values()), len(candidates))
+    best_word, best_expected = best if best[1] <= expected else (guess, expected) # A pre-screened ranking can miss the guess
+    return after, {'guess': guess, 'before': len(candidates), 'after': len(after), 'expected': round(expected, 3),
+                   'best': best_word, 'best_expected': round(best_expected, 3),
+                   'bits': round(math.log2(len(candidates) / max(len(after), 1)), 3)}
+
+
+class GameAnalysis:
+    '''
+    A class that builds a game's post-game report one turn at a time
+    The report follows the exact words the answer could be (by the coloring rules, from the word list the answer
+        was picked from), and for each turn compares the expected remaining words of the guess played with those of
+        the best guess, and counts the bits of information the guess actually gave
+    Ranking the best guess at a position is the slow part, and it only needs the guesses before that position, so it
+        can be done while the player is still thinking; everything else is one pattern lookup per candidate
+    In hard mode the best guess at each position is only picked from the guesses hard mode allowed there
+    Work is taken as a snapshot (pending_work), done anywhere (compute) and stored (apply), like the helper's filtering
+    '''
+    def __init__(self, lexicon: Lexicon, pool: list, hard: bool = False) -> None:
+        '''
+        :param lexicon: The lexicon guesses come from
+        :param pool: The words the answer was picked from
+        :param hard: Whether the game was played in hard mode
+        '''
+        self.lexicon = lexicon
+        self.candidates = [pool] # The words the answer could be before each analyzed turn, and after the last
+        self.best = [None] # best_guess for each entry of candidates, once it has been ranked
+        self.rules = [HardModeRules(lexicon.word_length) if hard else None] # Hard mode's rules for each entry of candidates
+        self.turns = [] # The report of each analyzed turn
+
+    def pending_work(self, guesses: list) -> tuple:
+        '''
+        :param guesses: (guess, colors) pairs of the game so far
+        :return: (the first turn not analyzed, the candidates before it, best guesses known from it on,
+            the guesses not analyzed, hard mode's rules before it)
+        '''
+        start = len(self.turns)
+        return start, self.candidates[start], list(self.best[start:]), list(guesses[start:]), self.rules[start]
+
+    @staticmethod
+    def compute(lexicon: Lexicon, start: int, candidates: list, best: list, guesses: list,
+                rules: HardModeRules = None, ahead: bool = True, progress=None) -> tuple:
+        '''
+        Analyzes the turns in a snapshot from pending_work, ranking any position that has not been ranked
+        This only reads its arguments, so it can run on another thread
+        :param lexicon: The lexicon guesses come from
+        :param start: The first turn analyzed
+        :param candidates: The words the answer could be before it
+        :param best: Best guesses known from it on
+        :param guesses: The guesses to analyze
+        :param rules: Hard mode's rules before the first turn analyzed (None outside hard mode), which are not changed
+        :param ahead: Whether to also rank the position after the last guess, ready for the next turn
+        :param progress: Passed on to best_guess
+        :return: (start, the candidates before each turn and after the last, the best guess at each of those
+            positions, or None where it was not ranked, the report of each turn, and hard mode's rules at each
+            of those positions)
+        '''
+        best = best + [None] * (len(guesses) + 1 - len(best))
+        positions = [candidates]
+        rules = [rules]
+        turns = []
+        for n, (guess, colors) in enumerate(guesses):
+            if best[n] is None:
+                best[n] = best_guess(lexicon, positions[n], progress, rules[n])
+            after, turn = analyze_turn(lexicon, positions[n], guess, colors, best[n])
+            positions.append(after)
+            turns.append(turn)
+            if rules[n] is not None:
+                rules.append(rules[n].copy())
+                rules[-1].update(guess, colors)
+            else:
+                rules.append(None)
+        solved = bool(guesses) and all(color == 'G' for color in guesses[-1][1])
+        if ahead and not solved and positions[-1] and best[len(guesses)] is None:
+            best[len(guesses)] = best_guess(lexicon, positions[-1], progress, rules[-1])
+        return start, positions, best, turns, rules
+
+    def apply(self, start: int, positions: list, best: list, turns: list, rules: list) -> None:
+        '''
+        Stores the result of compute, unless the turns it analyzed have already been stored
+        '''
+        if start != len(self.turns):
+            return
+        self.candidates[start:] = positions
+        self.best[start:] = best
+        self.rules[start:] = rules
+        self.turns += turns
+
+    def complete(self, guesses: list) -> bool:
+        '''
+        :param guesses: (guess, colors) pairs of the game so far
+        :return: Whether every guess has been analyzed
+        '''
+        return len(self.turns) == len(guesses)
+
+
+def analyze_record(record: dict, lexicon: Lexicon = None) -> list:
+    '''
+    Gets the report of a past game, which is free if it was stored with the record and otherwise computed in full
+    :param record: A game record (see Game.record)
+    :param lexicon: The lexicon the game was played with (defaults to the standard word files)
+    :return: The report of each turn
+    '''
+    if 'analysis' in record:
+        return record['analysis']
+    lexicon = lexicon or get_lexicon()
+    analysis = GameAnalysis(lexicon, lexicon.get_words(record.get('curated', False)), record.get('hard', False))
+    guesses = list(zip(record['guesses'], [list(pattern) for pattern in record['patterns']]))
+    analysis.apply(*GameAnalysis.compute(lexicon, *analysis.pending_work(guesses), ahead=False))
+    return analysis.turns
+
+
+def format_turn(n: int, turn: dict) -> str:
+    '''
+    :param n: The turn number
+    :param turn: The turn's report
+    :return: The report as one line of text
+    '''
+    return (f"{n}. {turn['guess']}: {turn['before']} -> {turn['after']} words, {turn['bits']:.2f} bits, "
+            f"expected {turn['expected']:.1f} (best {turn['best']} {turn['best_expected']:.1f})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prints the post-game report of recent games")
+    parser.add_argument('--last', type=int, default=1, help="how many of the most recent games to report")
+    parser.add_argument('--words', default=ALL_WORDS_FILE, help=f"file of every valid word (default: {ALL_WORDS_FILE})")
+    parser.add_argument('--answers', default=None, help="file of curated answers (default: "
+                        f"{CURATED_WORDS_FILE} with the standard words, otherwise every word)")
+    args = parser.parse_args()
+    answers = default_answers_file(args.words, args.answers)
+    lexicon = get_lexicon(True, args.words, answers)
+    records = [record for record in GameHistory().records() if 'guesses' in record and 'answer' in record
+               and record.get('word_list', lexicon.words_hash) == lexicon.words_hash] # Games of other lists are skipped
+    for record in records[-args.last:]:
+        print(f"{record['answer']} ({'won' if record['won'] else 'lost'} in {len(record['guesses'])})")
+        for n, turn in enumerate(analyze_record(record, lexicon), 1):
+            print(f"  {format_turn(n, turn)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+def child(target: str) -> None:
+    '''
+    Runs one cold start in this (fresh) process and prints how long each phase took as JSON
+    :param target: 'core' imports the game rules and starts a game, 'gui' also imports PyQt6 and paints the window
+    '''
+    timings = {}
+    start = time.perf_counter()
+    import game
+    timings['import core'] = time.perf_counter() - start
+    game.Game()
+    timings['first game'] = time.perf_counter() - start
+    if target == 'gui':
+        from PyQt6.QtCore import QTimer
+        from PyQt6.QtWidgets import QApplication
+        from logic import Logic
+        timings['import gui'] = time.perf_counter() - start
+        application = QApplication([])
+        window = Logic()
+        window.show()
+        QTimer.singleShot(0, application.quit) # Runs once the window's first paint has been processed
+        application.exec()
+        timings['first paint'] = time.perf_counter() - start
+    print(json.dumps(timings))
+
+
+def measure(target: str, runs: int) -> dict:
+    '''
+    Starts a fresh interpreter for every run so nothing is already imported or cached in memory
+    :param target: What each run starts ('core' or 'gui')
+    :param runs: How many cold starts to measure
+    :return: Each phase's timings over all runs, plus the whole process lifetime
+    '''
+    results = {}
+    for _ in range(runs):
+        start = time.perf_counter()
+        output = subprocess.run([sys.executable, __file__, '--child', target], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        total = time.perf_counter() - start
+        for phase, seconds in json.loads(output.stdout.strip().splitlines()[-1]).items():
+            results.setdefault(phase, []).append(seconds)
+        results.setdefault('whole process', []).append(total)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measures cold-start time of the game rules and the GUI")
+    parser.add_argument('--runs', type=int, default=10, help="number of cold starts to measure")
+    parser.add_argument('--gui', action='store_true', help="also import PyQt6 and measure time to first paint")
+    parser.add_argument('--budget', type=float, default=None, help="exit with an error if the median core import takes longer (ms)")
+    parser.add_argument('--child', choices=['core', 'gui'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+    results = measure('gui' if args.gui else 'core', args.runs)
+    print(f"{'phase':<16}{'min ms':>10}{'median ms':>12}{'max ms':>10}")
+    for phase, samples in results.items():
+        print(f"{phase:<16}{min(samples) * 1000:>10.1f}{statistics.median(samples) * 1000:>12.1f}{max(samples) * 1000:>10.1f}")
+    if args.budget is not None and statistics.median(results['import core']) * 1000 > args.budget:
+        sys.exit(f"Core import exceeded the {args.budget} ms budget")
+
+
+if __name__ == "__main__":
+    main()
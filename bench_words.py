@@ -0,0 +1,98 @@
+from constraints import ConstraintIndex
+from lexicon import ALL_WORDS_FILE
+from patterns import score_guess
+from wordleinfo import WordleInfo
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+
+
+class DictInfo:
+    '''
+    The helper info as it was stored before WordleInfo had __slots__, used only to compare instance sizes
+    '''
+    def __init__(self, info: WordleInfo) -> None:
+        self.green = info.green
+        self.yellow = info.yellow
+        self.black = info.black
+        self.index = info.index
+
+
+def allocated(build) -> tuple:
+    '''
+    :param build: Makes the object being measured
+    :return: (the object, bytes still allocated for it once it is built)
+    '''
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def random_states(words: list, count: int, seed: int) -> list:
+    '''
+    :param words: The word list guesses and answers come from
+    :param count: How many states to make
+    :param seed: Seed for the guesses and answers
+    :return: Helper info after 1 to 3 random guesses against random answers
+    '''
+    rng = random.Random(seed)
+    states = []
+    for _ in range(count):
+        answer = rng.choice(words)
+        info = WordleInfo(None, len(answer))
+        for _ in range(rng.randint(1, 3)):
+            guess = rng.choice(words)
+            info.process_input_info(guess, score_guess(guess, answer))
+        states.append(info)
+    return states
+
+
+def time_filter(states: list, run) -> tuple:
+    '''
+    :param states: Helper info to filter with
+    :param run: Filters the whole word list with one state and returns the words left
+    :return: (seconds per filter pass, the words left by each state)
+    '''
+    start = time.perf_counter()
+    results = [run(info) for info in states]
+    return (time.perf_counter() - start) / len(states), results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compares string and bitset word lists in memory and filter speed")
+    parser.add_argument('--words', default=ALL_WORDS_FILE, help=f"word file (default: {ALL_WORDS_FILE})")
+    parser.add_argument('--states', type=int, default=300, help="random helper states to filter with")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the random states")
+    args = parser.parse_args()
+
+    with open(args.words, 'r') as f:
+        text = f.read()
+    words, string_bytes = allocated(text.split)
+    index, index_bytes = allocated(lambda: ConstraintIndex(words))
+    print(f"{len(words)} words from {args.words}")
+    print(f"{'representation':<28}{'bytes':>12}{'bytes/word':>12}")
+    for name, size in [('list of str', string_bytes), ('bitset index', index_bytes)]:
+        print(f"{name:<28}{size:>12}{size / len(words):>12.1f}")
+
+    states = random_states(words, args.states, args.seed)
+    info = states[0]
+    dict_info = DictInfo(info)
+    print(f"WordleInfo instance: {sys.getsizeof(info)} bytes with __slots__, "
+          f"{sys.getsizeof(dict_info) + sys.getsizeof(dict_info.__dict__)} bytes with a __dict__")
+
+    string_time, expected = time_filter(states, lambda info: [word for word in words if info.check_against_info(word)])
+    index_time, index_results = time_filter(states, lambda info: index.words_of(index.filter(info.green, info.yellow, info.black)))
+    if index_results != expected:
+        sys.exit("Filter results differ between representations")
+    print(f"{'filter pass':<28}{'ms':>12}{'speedup':>12}")
+    for name, seconds in [('list of str', string_time), ('bitset index', index_time)]:
+        print(f"{name:<28}{seconds * 1000:>12.3f}{string_time / seconds:>12.1f}x")
+    print(f"All {len(states)} states give the same words with every representation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from bisect import bisect_left
+
+
+class PrefixIndex:
+    '''
+    A class that finds the words starting with a prefix, and how many of them are in a set of candidates, without
+        scanning the word list
+    Words are kept in sorted order, so the words with a prefix are one contiguous run found by two binary searches,
+        and a set of candidates is a bitset over the same order, so counting the candidates in the run is a shift,
+        a mask and a bit count
+    '''
+    def __init__(self, words: list) -> None:
+        '''
+        :param words: The word list, in any order
+        '''
+        self.words = sorted(words)
+        self.position = {word: i for i, word in enumerate(self.words)}
+        self.full = (1 << len(self.words)) - 1
+
+    def span(self, prefix: str) -> tuple:
+        '''
+        :param prefix: The start of a word
+        :return: (first, last + 1) positions of the words with the prefix
+        '''
+        if not prefix:
+            return 0, len(self.words)
+        after = prefix[:-1] + chr(ord(prefix[-1]) + 1) # The first string after every string with the prefix
+        return bisect_left(self.words, prefix), bisect_left(self.words, after)
+
+    def mask_of(self, words: list) -> int:
+        '''
+        :param words: Words from the indexed list
+        :return: A bitset of those words, where bit i stands for the i-th word in sorted order
+        '''
+        if len(words) == len(self.words):
+            return self.full
+        bits = bytearray((len(self.words) + 7) // 8)
+        for word in words:
+            i = self.position[word]
+            bits[i >> 3] |= 1 << (i & 7)
+        return int.from_bytes(bits, 'little')
+
+    def complete(self, prefix: str, candidates: int = None, top_n: int = 8) -> tuple:
+        '''
+        :param prefix: The start of a word
+        :param candidates: A bitset from mask_of to keep completions to (None allows every word)
+        :param top_n: How many completions to return
+        :return: (how many allowed words have the prefix, the first top_n of them in alphabetical order)
+        '''
+        start, end = self.span(prefix)
+        if candidates is None or candidates == self.full:
+            return end - start, self.words[start:min(end, start + top_n)]
+        run = (candidates >> start) & ((1 << (end - start)) - 1)
+        count = run.bit_count()
+        completions = []
+        while run and len(completions) < top_n:
+            lowest = run & -run
+            completions.append(self.words[start + lowest.bit_length() - 1])
+            run ^= lowest
+        return count, completions
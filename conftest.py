@@ -0,0 +1,51 @@
+from lexicon import get_lexicon
+from patterns import PatternMatrix
+import pytest
+import random
+
+
+SEED = 0 # Every random case is drawn from generators seeded with this, so a failure can be rerun exactly
+
+
+def pytest_addoption(parser) -> None:
+    parser.addoption('--exhaustive', action='store_true', help="score every word against every curated answer")
+    parser.addoption('--benchmark', action='store_true', help="print the timing tables of the benchmark tests")
+
+
+def pytest_configure(config) -> None:
+    config.addinivalue_line('markers', "exhaustive: checks every pair of words, run with --exhaustive")
+    config.addinivalue_line('markers', "benchmark: prints timing tables instead of checking results, run with --benchmark")
+
+
+def pytest_collection_modifyitems(config, items) -> None:
+    for marker in ('exhaustive', 'benchmark'):
+        if not config.getoption(marker):
+            skip = pytest.mark.skip(reason=f"run with --{marker}")
+            for item in items:
+                if marker in item.keywords:
+                    item.add_marker(skip)
+
+
+@pytest.fixture(scope='session')
+def lexicon():
+    return get_lexicon()
+
+
+@pytest.fixture(scope='session')
+def words(lexicon) -> list:
+    return lexicon.get_words()
+
+
+@pytest.fixture(scope='session')
+def answers(lexicon) -> list:
+    return lexicon.get_words(True)
+
+
+@pytest.fixture(scope='session')
+def matrix(words) -> PatternMatrix:
+    return PatternMatrix(words)
+
+
+@pytest.fixture
+def rng() -> random.Random:
+    return random.Random(SEED)
@@ -0,0 +1,228 @@
+from array import array
+from collections import OrderedDict
+from patterns import CACHE_DIR, word_list_hash
+import os
+import struct
+import threading
+
+
+INDEX_MAGIC = b"WIDX1"
+
+
+class ConstraintIndex:
+    '''
+    A class that indexes a word list as bitsets so known information can be applied to every word at once
+    Bit i of every bitset stands for the i-th word of the list
+    '''
+    def __init__(self, words: list, saved: bytes = None) -> None:
+        '''
+        Builds the per-position and per-letter-count bitsets for a word list
+        Position bitsets mark every word with a letter in a position, count bitsets mark every word with at least k
+            copies of a letter
+        :param words: The word list to index
+        :param saved: Bitsets of the same list saved by to_bytes, used instead of building them
+        '''
+        self.words = list(words)
+        self.size = len(self.words)
+        self.index = {word: i for i, word in enumerate(self.words)}
+        self.full = (1 << self.size) - 1
+        if saved is not None:
+            self.position_masks, self.count_masks = self.masks_from_bytes(saved)
+            return
+        position_bits = {}
+        count_bits = {}
+        for j, word in enumerate(self.words):
+            byte, bit = j >> 3, 1 << (j & 7)
+            counts = {}
+            for i, letter in enumerate(word):
+                position_bits.setdefault((i, letter), bytearray((self.size + 7) // 8))[byte] |= bit
+                counts[letter] = counts.get(letter, 0) + 1
+            for letter, n in counts.items():
+                for k in range(1, n + 1):
+                    count_bits.setdefault((letter, k), bytearray((self.size + 7) // 8))[byte] |= bit
+        self.position_masks = {key: int.from_bytes(bits, 'little') for key, bits in position_bits.items()}
+        self.count_masks = {key: int.from_bytes(bits, 'little') for key, bits in count_bits.items()}
+
+    def to_bytes(self) -> bytes:
+        '''
+        :return: Every bitset, each as a kind ('P' for a position, 'C' for a count), a number, a letter and the
+            bitset's bytes
+        '''
+        width = (self.size + 7) // 8
+        entries = [(b'P', i, letter, mask) for (i, letter), mask in self.position_masks.items()]
+        entries += [(b'C', n, letter, mask) for (letter, n), mask in self.count_masks.items()]
+        return b''.join(struct.pack('<cBc', kind, n, letter.encode('ascii')) + mask.to_bytes(width, 'little')
+                        for kind, n, letter, mask in entries)
+
+    def masks_from_bytes(self, data: bytes) -> tuple:
+        '''
+        :param data: Bytes written by to_bytes for a list of this index's size
+        :return: (the position bitsets, the count bitsets)
+        '''
+        width = (self.size + 7) // 8
+        position_masks = {}
+        count_masks = {}
+        for offset in range(0, len(data), 3 + width):
+            kind, n, letter = struct.unpack_from('<cBc', data, offset)
+            mask = int.from_bytes(data[offset + 3:offset + 3 + width], 'little')
+            if kind == b'P':
+                position_masks[(n, letter.decode('ascii'))] = mask
+            else:
+                count_masks[(letter.decode('ascii'), n)] = mask
+        return position_masks, count_masks
+
+    def at_position(self, i: int, letter: str) -> int:
+        '''
+        :param i: A letter position
+        :param letter: A letter
+        :return: A bitset of every word with the letter in position i
+        '''
+        return self.position_masks.get((i, letter), 0)
+
+    def at_least(self, letter: str, n: int) -> int:
+        '''
+        :param letter: A letter
+        :param n: A number of copies
+        :return: A bitset of every word with at least n copies of the letter
+        '''
+        if n <= 0:
+            return self.full
+        return self.count_masks.get((letter, n), 0)
+
+    def filter(self, green: list, yellow: dict, black: list) -> int:
+        '''
+        Finds every word that agrees with known information, following the same rules as WordleInfo.check_against_info
+        :param green: Known letters by position ('_' where unknown)
+        :param yellow: Letters known to be in the answer, as letter: [duplicity, excluded positions]
+        :param black: Letters known not to be in the answer beyond the copies accounted for by green and yellow
+        :return: A bitset of every word that can still be the answer
+        '''
+        mask = self.full
+        for letter in black: # Removes words with more copies of a black letter than green and yellow account for
+            n = green.count(letter)
+            if letter in yellow:
+                n += len(yellow[letter])
+            mask &= ~self.at_least(letter, n + 1)
+        for i, letter in enumerate(green): # Keeps words with every known letter in place
+            if letter != '_':
+                mask &= self.at_position(i, letter)
+        for key, [y_duplicity, y_indices] in yellow.items():
+            for i in y_indices: # Removes words with a yellow letter in a position it is known not to be in
+                mask &= ~self.at_position(i, key)
+            mask &= self.at_least(key, y_duplicity + green.count(key))
+        return mask
+
+    def mask_of(self, words: list) -> int:
+        '''
+        :param words: Words from the indexed list
+        :return: A bitset of those words
+        '''
+        if len(words) == self.size:
+            return self.full
+        bits = bytearray((self.size + 7) // 8)
+        for word in words:
+            i = self.index[word]
+            bits[i >> 3] |= 1 << (i & 7)
+        return int.from_bytes(bits, 'little')
+
+    def words_of(self, mask: int) -> list:
+        '''
+        :param mask: A bitset of the indexed list
+        :return: The words in the bitset, in word list order
+        '''
+        bits = bin(mask)[:1:-1] # Reversed so that character i is bit i
+        words = []
+        i = bits.find('1')
+        while i != -1:
+            words.append(self.words[i])
+            i = bits.find('1', i + 1)
+        return words
+
+
+class CandidateCache:
+    '''
+    A class that remembers which words were left by filtering, keyed by the helper states that did the filtering
+    Results are kept as compact arrays of word indexes, the least recently used results are dropped once the cache
+        holds too many results or too many indexes in total, and hits, misses and evictions are counted
+    '''
+    def __init__(self, words: list, max_entries: int = 4096, max_indexes: int = 4_000_000) -> None:
+        '''
+        :param words: The word list the cached indexes point into
+        :param max_entries: The most results kept
+        :param max_indexes: The most word indexes kept over all results
+        '''
+        self.words = words
+        self.index = {word: i for i, word in enumerate(words)}
+        self.typecode = 'H' if len(words) <= 0xFFFF else 'I'
+        self.max_entries = max_entries
+        self.max_indexes = max_indexes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock() # The helper filters on worker threads as well as the GUI thread
+
+    def lookup(self, key: tuple) -> list:
+        '''
+        :param key: The helper states applied, in order, starting from the full word list
+        :return: The words left, or None if the result is not cached
+        '''
+        with self.lock:
+            indexes = self.entries.get(key)
+            if indexes is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        words = self.words
+        return [words[i] for i in indexes]
+
+    def store(self, key: tuple, remaining_words: list) -> None:
+        '''
+        :param key: The helper states applied, in order, starting from the full word list
+        :param remaining_words: The words left
+        '''
+        index = self.index
+        indexes = array(self.typecode, [index[word] for word in remaining_words])
+        with self.lock:
+            if key in self.entries:
+                self.size -= len(self.entries.pop(key))
+            self.entries[key] = indexes
+            self.size += len(indexes)
+            while len(self.entries) > self.max_entries or (self.size > self.max_indexes and len(self.entries) > 1):
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        '''
+        :return: The cache's counters and current size
+        '''
+        with self.lock:
+            return {'entries': len(self.entries), 'indexes': self.size, 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions}
+
+
+def load_index(words: list, path: str = None) -> ConstraintIndex:
+    '''
+    Loads the bitset index of a word list from disk, building and saving it first if it has not been built before
+    (or was saved in an older format)
+    :param words: The word list to index
+    :param path: Where the index is stored (defaults to a file in the cache directory named by the list's hash)
+    :return: The index
+    '''
+    if path is None:
+        path = os.path.join(CACHE_DIR, f"index-{word_list_hash(words)}.bin")
+    if os.path.exists(path):
+        with open(path, 'rb') as file:
+            data = file.read()
+        if data[:len(INDEX_MAGIC)] == INDEX_MAGIC:
+            return ConstraintIndex(words, data[len(INDEX_MAGIC):])
+    index = ConstraintIndex(words)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(f"{path}.tmp", 'wb') as file:
+        file.write(INDEX_MAGIC)
+        file.write(index.to_bytes())
+    os.replace(f"{path}.tmp", path)
+    return index
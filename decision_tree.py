@@ -0,0 +1,322 @@
+from concurrent.futures import ProcessPoolExecutor
+from game import MAX_GUESSES
+from lexicon import ALL_WORDS_FILE, CURATED_WORDS_FILE, Lexicon, default_answers_file, get_lexicon
+from patterns import CACHE_DIR, PatternMatrix, all_green, pattern_width, word_list_hash
+from recommender import Recommender
+from operator import itemgetter
+import argparse
+import os
+import struct
+import time
+
+
+MAGIC = b"WTREE1"
+FAIL_PENALTY = 100 # Added to a subtree's cost for every answer it cannot find within MAX_GUESSES
+
+
+class DecisionTree:
+    '''
+    A class that holds a complete solving strategy as a flat table
+    Each entry maps the feedback patterns seen so far (pattern_width bytes per guess) to the next guess, so following
+        the strategy is one dictionary lookup per turn
+    '''
+    def __init__(self, words: list, table: dict) -> None:
+        '''
+        :param words: The word list guesses are indexes into
+        :param table: Pattern paths (bytes) mapped to guess indexes
+        '''
+        self.words = words
+        self.table = table
+        self.width = pattern_width(len(words[0])) if words else 1
+
+    def next_guess(self, path: bytes) -> str:
+        '''
+        :param path: The packed pattern of every guess so far, in order, as long as every guess followed the tree
+        :return: The tree's next guess, or None if the path is not in the tree
+        '''
+        guess = self.table.get(path)
+        return None if guess is None else self.words[guess]
+
+    def follow(self, guesses: list) -> str:
+        '''
+        Checks that a game has followed the tree and finds its next guess
+        :param guesses: (guess, packed pattern) pairs of the game so far
+        :return: The tree's next guess, or None if the game left the tree
+        '''
+        path = b''
+        for guess, pattern in guesses:
+            if self.next_guess(path) != guess:
+                return None
+            path += pattern.to_bytes(self.width, 'little')
+        return self.next_guess(path)
+
+    def save(self, path: str) -> None:
+        '''
+        Saves the table as a binary file: each entry is a path length byte, the path and a 4-byte guess index
+        :param path: The file to write
+        '''
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(f"{path}.tmp", 'wb') as f:
+            f.write(MAGIC + struct.pack('<I', len(self.table)))
+            for key, guess in self.table.items():
+                f.write(bytes([len(key)]) + key + struct.pack('<I', guess))
+        os.replace(f"{path}.tmp", path)
+
+    @classmethod
+    def load(cls, path: str, words: list) -> 'DecisionTree':
+        '''
+        :param path: A file written by save
+        :param words: The word list the tree was built with
+        :return: The saved tree
+        '''
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"ValueError: {path} is not a decision tree file")
+        offset = len(MAGIC)
+        (count,) = struct.unpack_from('<I', data, offset)
+        offset += 4
+        table = {}
+        for _ in range(count):
+            length = data[offset]
+            key = data[offset + 1:offset + 1 + length]
+            (table[key],) = struct.unpack_from('<I', data, offset + 1 + length)
+            offset += 5 + length
+        return cls(words, table)
+
+
+class TreeSearch:
+    '''
+    A class that searches for a solving strategy over a set of answers
+    At each position the best few guesses by expected remaining size are each tried with a full subtree below them,
+        and the one that finds every answer in the fewest total guesses is kept
+    '''
+    def __init__(self, matrix: PatternMatrix, width: int = 3, deep_width: int = 1, wide_depth: int = 1) -> None:
+        '''
+        :param matrix: The pattern table of the word list guesses come from
+        :param width: How many guesses are tried at each position in the first wide_depth turns
+        :param deep_width: How many guesses are tried at each position after that
+        :param wide_depth: How many turns use width instead of deep_width
+        '''
+        self.matrix = matrix
+        self.all_green = all_green(len(matrix.words[0]))
+        self.recommender = Recommender(matrix)
+        self.width = width
+        self.deep_width = deep_width
+        self.wide_depth = wide_depth
+
+    def partition(self, guess: str, answers: list) -> dict:
+        '''
+        :param guess: A word guessed
+        :param answers: Indexes of the possible answers
+        :return: The answers grouped by the pattern the guess shows for them
+        '''
+        row = self.matrix.row(guess)
+        patterns = [row[answers[0]]] if len(answers) == 1 else itemgetter(*answers)(row)
+        buckets = {}
+        for answer, pattern in zip(answers, patterns):
+            buckets.setdefault(pattern, []).append(answer)
+        return buckets
+
+    def candidates(self, answers: list, depth: int) -> list:
+        '''
+        :param answers: Indexes of the possible answers
+        :param depth: How many guesses have been made
+        :return: The guesses worth trying
+        '''
+        words = [self.matrix.words[i] for i in answers]
+        if len(answers) <= 2:
+            return words[:1]
+        width = self.width if depth < self.wide_depth else self.deep_width
+        return [word for word, _ in self.recommender.rank(words, width)]
+
+    def solve(self, answers: list, depth: int = 0, guesses: list = None) -> tuple:
+        '''
+        Finds the best subtree for a set of answers
+        :param answers: Indexes of the possible answers
+        :param depth: How many guesses have been made
+        :param guesses: The guesses to try first (defaults to the best few by expected remaining size)
+        :return: (total guesses to find every answer, most guesses for any answer, subtree)
+            A subtree is (guess, {pattern: child subtree})
+        '''
+        best = None
+        for guess in guesses or self.candidates(answers, depth):
+            total, worst, children, pruned = 0, 0, {}, False
+            for pattern, bucket in self.partition(guess, answers).items():
+                if pattern == self.all_green:
+                    total += depth + 1
+                    worst = max(worst, depth + 1)
+                elif depth + 1 >= MAX_GUESSES:
+                    total += len(bucket) * (depth + 1 + FAIL_PENALTY)
+                    worst = max(worst, depth + 1 + FAIL_PENALTY)
+                else:
+                    child_total, child_worst, children[pattern] = self.solve(bucket, depth + 1)
+                    total += child_total
+                    worst = max(worst, child_worst)
+                if best is not None and total > best[0]: # This guess is already worse than the best one
+                    pruned = True
+                    break
+            if not pruned and (best is None or (total, worst) < best[:2]):
+                best = (total, worst, (guess, children))
+        return best
+
+
+def flatten(subtree: tuple, index: dict, width: int = 1, path: bytes = b'', table: dict = None) -> dict:
+    '''
+    Turns a nested subtree into a flat table of pattern paths
+    :param subtree: (guess, {pattern: child subtree})
+    :param index: Word indexes in the word list
+    :param width: How many bytes each pattern takes in a path (see pattern_width)
+    :param path: The patterns leading to the subtree
+    :param table: The table being filled in
+    :return: Pattern paths mapped to guess indexes
+    '''
+    if table is None:
+        table = {}
+    guess, children = subtree
+    table[path] = index[guess]
+    for pattern, child in children.items():
+        flatten(child, index, width, path + pattern.to_bytes(width, 'little'), table)
+    return table
+
+
+_search = None
+
+
+def init_worker(answers: list, width: int, deep_width: int, wide_depth: int, all_file: str = ALL_WORDS_FILE,
+                curated_file: str = CURATED_WORDS_FILE) -> None:
+    '''
+    Opens the pattern table once per worker process (the memory-mapped table is shared between processes)
+    '''
+    global _search
+    _search = TreeSearch(PatternMatrix(get_lexicon(True, all_file, curated_file).get_words()), width, deep_width,
+                         wide_depth)
+    _search.answers = answers
+
+
+def solve_opening(opener: str) -> tuple:
+    '''
+    Builds the best tree that starts with a given opening guess
+    :param opener: The first guess
+    :return: The result of TreeSearch.solve
+    '''
+    return _search.solve(_search.answers, 0, [opener])
+
+
+def tree_path(words: list, answers: list, openers: int, width: int, deep_width: int, wide_depth: int) -> str:
+    '''
+    Names the tree file after everything that changes the tree
+    '''
+    key = f"{word_list_hash(words)}-{word_list_hash(answers)}-{openers}-{width}-{deep_width}-{wide_depth}"
+    return os.path.join(CACHE_DIR, f"tree-{key}.bin")
+
+
+def build_tree(openers: int = 8, width: int = 3, deep_width: int = 1, wide_depth: int = 1, workers: int = None,
+               all_file: str = ALL_WORDS_FILE, curated_file: str = CURATED_WORDS_FILE) -> tuple:
+    '''
+    Searches for a strategy over the curated answers, trying each of the best few openers in its own process
+    :param openers: How many opening guesses to try
+    :param width: How many guesses to try at each position in the first wide_depth turns after the opener
+    :param deep_width: How many guesses to try at each later position
+    :param wide_depth: How many turns after the opener use width
+    :param workers: How many processes to use (defaults to one per core)
+    :param all_file: The file of every valid word
+    :param curated_file: The file of curated answers (None lets every word be the answer)
+    :return: (the tree, total guesses over every answer, worst-case guesses)
+    '''
+    lexicon = get_lexicon(True, all_file, curated_file)
+    words = lexicon.get_words()
+    answers = list(lexicon.curated_indices)
+    matrix = PatternMatrix(words)
+    opening = [word for word, _ in Recommender(matrix).rank([words[i] for i in answers], openers)]
+    best = None
+    with ProcessPoolExecutor(workers or os.cpu_count() or 1, initializer=init_worker,
+                             initargs=(answers, width, deep_width, wide_depth + 1, all_file, curated_file)) as pool:
+        for result in pool.map(solve_opening, opening):
+            if best is None or result[:2] < best[:2]:
+                best = result
+    total, worst, subtree = best
+    return DecisionTree(words, flatten(subtree, lexicon.index, matrix.width)), total, worst
+
+
+_trees = {} # Lexicon: its tree, or None if none had been built when it was first looked for
+
+
+def get_decision_tree(lexicon: Lexicon = None) -> DecisionTree:
+    '''
+    Gets the most recently built tree for a lexicon's word lists, without building one
+    The cache directory is only searched the first time, so a tree built by another process while this one runs is
+        picked up the next time it starts
+    :param lexicon: The lexicon the tree was built for (defaults to the standard word files)
+    :return: The tree, or None if no tree has been built for the word lists
+    '''
+    lexicon = lexicon or get_lexicon()
+    if lexicon not in _trees:
+        _trees[lexicon] = None
+        prefix = f"tree-{word_list_hash(lexicon.get_words())}-{word_list_hash(lexicon.get_words(True))}-"
+        if os.path.isdir(CACHE_DIR):
+            built = [name for name in os.listdir(CACHE_DIR) if name.startswith(prefix) and name.endswith('.bin')]
+            if built:
+                newest = max(built, key=lambda name: os.path.getmtime(os.path.join(CACHE_DIR, name)))
+                _trees[lexicon] = DecisionTree.load(os.path.join(CACHE_DIR, newest), lexicon.get_words())
+    return _trees[lexicon]
+
+
+def evaluate(tree: DecisionTree, matrix: PatternMatrix, answers: list) -> tuple:
+    '''
+    Plays the tree against every answer
+    :param tree: The tree
+    :param matrix: The pattern table of the tree's word list
+    :param answers: The answers to play against
+    :return: (average guesses, worst-case guesses, answers not found within MAX_GUESSES)
+    '''
+    counts = []
+    missed = 0
+    for answer in answers:
+        path = b''
+        for turn in range(1, MAX_GUESSES + 1):
+            guess = tree.next_guess(path)
+            if guess is None or guess == answer:
+                break
+            path += matrix.pattern(guess, answer).to_bytes(matrix.width, 'little')
+        if guess == answer:
+            counts.append(turn)
+        else:
+            missed += 1
+    return sum(counts) / max(len(counts), 1), max(counts, default=0), missed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Builds the helper's decision tree for a word list's curated answers")
+    parser.add_argument('--words', default=ALL_WORDS_FILE, help=f"file of every valid word (default: {ALL_WORDS_FILE})")
+    parser.add_argument('--answers', default=None, help="file of curated answers (default: "
+                        f"{CURATED_WORDS_FILE} with the standard words, otherwise every word)")
+    parser.add_argument('--openers', type=int, default=8, help="opening guesses to try, one process each")
+    parser.add_argument('--width', type=int, default=3, help="guesses tried at each position on the second turn")
+    parser.add_argument('--deep-width', type=int, default=1, help="guesses tried at each later position")
+    parser.add_argument('--wide-depth', type=int, default=1, help="turns after the opener that use --width")
+    parser.add_argument('--workers', type=int, default=None, help="number of processes (default: one per core)")
+    parser.add_argument('--force', action='store_true', help="rebuild even if the word lists have not changed")
+    args = parser.parse_args()
+
+    answers = default_answers_file(args.words, args.answers)
+    lexicon = get_lexicon(True, args.words, answers)
+    words = lexicon.get_words()
+    path = tree_path(words, lexicon.get_words(True), args.openers, args.width, args.deep_width, args.wide_depth)
+    if os.path.exists(path) and not args.force:
+        print(f"The tree is up to date with the word lists ({path})")
+        tree = DecisionTree.load(path, words)
+    else:
+        start = time.perf_counter()
+        tree, _, _ = build_tree(args.openers, args.width, args.deep_width, args.wide_depth, args.workers, args.words,
+                                answers)
+        tree.save(path)
+        print(f"Built {path} with {len(tree.table)} positions in {time.perf_counter() - start:.1f}s")
+    average, worst, missed = evaluate(tree, PatternMatrix(words), lexicon.get_words(True))
+    print(f"Average guesses: {average:.4f}")
+    print(f"Worst case: {worst} guesses")
+    print(f"Answers not found in {MAX_GUESSES} guesses: {missed}")
+
+
+if __name__ == "__main__":
+    main()
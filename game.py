@@ -0,0 +1,348 @@
+from constraints import CandidateCache, ConstraintIndex, load_index
+from hardmode import AllowedGuesses, HardModeRules
+from lexicon import Lexicon, get_lexicon
+from patterns import encode_pattern, score_guess
+from priors import get_prior
+from profiling import profiler, timed
+from wordleinfo import WordleInfo
+import random
+import time
+
+
+MAX_GUESSES = 6
+
+
+_word_indexes = {}
+_candidate_caches = {}
+_recommenders = {}
+_weighted_recommenders = {}
+_allowed_guesses = {}
+
+
+def get_word_index(lexicon: Lexicon = None) -> ConstraintIndex:
+    '''
+    Gets the process-wide bitset index of a full word list, loading it from disk (or building it, the first time the
+        list is seen) the first time it is needed
+    :param lexicon: The lexicon whose full list is indexed (defaults to the standard word files)
+    :return: The shared index
+    '''
+    lexicon = lexicon or get_lexicon()
+    if lexicon not in _word_indexes:
+        _word_indexes[lexicon] = load_index(lexicon.get_words())
+    return _word_indexes[lexicon]
+
+
+def get_candidate_cache(lexicon: Lexicon = None) -> CandidateCache:
+    '''
+    Gets the process-wide cache of filtering results, so states reached again in later games are not filtered again
+    :param lexicon: The lexicon whose full list the cached results come from (defaults to the standard word files)
+    :return: The shared cache
+    '''
+    lexicon = lexicon or get_lexicon()
+    if lexicon not in _candidate_caches:
+        _candidate_caches[lexicon] = CandidateCache(lexicon.get_words())
+    return _candidate_caches[lexicon]
+
+
+def filter_cached(remaining_words: list, info: WordleInfo, state_path: tuple, lexicon: Lexicon = None) -> tuple:
+    '''
+    Filters the remaining words with the helper info, reusing the result if the same states were applied before
+    The key is every canonical state applied since the full word list, so a cached result is exactly what filtering
+        after each of those guesses would give
+    :param remaining_words: The words left by the states in state_path
+    :param info: The helper info after the next guess
+    :param state_path: The canonical states already applied
+    :param lexicon: The lexicon remaining_words comes from (defaults to the standard word files)
+    :return: (the words that can still be the answer, the state path including info)
+    '''
+    state_path = state_path + (info.canonical_state(),)
+    cache = get_candidate_cache(lexicon)
+    cached = cache.lookup(state_path)
+    if cached is not None:
+        profiler.count('filter cache hits')
+        return cached, state_path
+    profiler.count('filter cache misses')
+    remaining_words = info.get_possible_words(remaining_words)
+    cache.store(state_path, remaining_words)
+    return remaining_words, state_path
+
+
+def get_allowed_guesses(lexicon: Lexicon = None) -> AllowedGuesses:
+    '''
+    Gets the process-wide cache of the words hard mode allows in each state, so states reached again are free
+    :param lexicon: The lexicon guesses come from (defaults to the standard word files)
+    :return: The shared cache
+    '''
+    lexicon = lexicon or get_lexicon()
+    if lexicon not in _allowed_guesses:
+        _allowed_guesses[lexicon] = AllowedGuesses(get_word_index(lexicon))
+    return _allowed_guesses[lexicon]
+
+
+def get_recommender(lexicon: Lexicon = None):
+    '''
+    Gets the process-wide guess recommender, creating it the first time it is needed since it loads (or builds)
+        the pattern table
+    :param lexicon: The lexicon guesses and answers come from (defaults to the standard word files)
+    :return: A recommender over the full word list
+    '''
+    lexicon = lexicon or get_lexicon()
+    if lexicon not in _recommenders:
+        from patterns import PatternMatrix
+        from recommender import Recommender
+        _recommenders[lexicon] = Recommender(PatternMatrix(lexicon.get_words()))
+    return _recommenders[lexicon]
+
+
+def get_weighted_recommender(lexicon: Lexicon = None):
+    '''
+    Gets the process-wide recommender the helper uses, which scores guesses by the expected information they reveal
+        when answers are weighted by the lexicon's prior (see priors.py), sharing the plain recommender's pattern table
+    Its opening ranking is loaded (or computed and cached on disk) along with it, so the first suggestion of a game
+        does not wait for it
+    :param lexicon: The lexicon guesses and answers come from (defaults to the standard word files)
+    :return: A weighted recommender over the full word list
+    '''
+    lexicon = lexicon or get_lexicon()
+    if lexicon not in _weighted_recommenders:
+        from recommender import WeightedRecommender
+        recommender = WeightedRecommender(get_recommender(lexicon).matrix, get_prior(lexicon))
+        recommender.opening_ranking()
+        _weighted_recommenders[lexicon] = recommender
+    return _weighted_recommenders[lexicon]
+
+
+class Game:
+    '''
+    A class containing the rules and state of a wordle game, with no dependency on the GUI
+    '''
+    def __init__(self, lexicon: Lexicon = None, max_guesses: int = MAX_GUESSES, curated: bool = False,
+                 helper: bool = False, hard: bool = False, analyzed: bool = False) -> None:
+        '''
+        Initializes the shared word lists and starts a game; the helper's index and recommender are shared by every
+            game and created when first needed
+        :param lexicon: The word lists to play with, which also set the word length (defaults to the standard word files)
+        :param max_guesses: How many guesses a game allows
+        :param curated: The first game's curated setting (see new_game)
+        :param helper: The first game's helper setting
+        :param hard: The first game's hard mode setting
+        :param analyzed: Whether every game gets a post-game report (see analysis.py), which only the GUI fills in
+        '''
+        self.lexicon = lexicon or get_lexicon()
+        self.all_words = self.lexicon.get_words()
+        self.word_length = self.lexicon.word_length
+        self.max_guesses = max_guesses
+        self.analyzed = analyzed
+        self.new_game(curated, helper, hard=hard)
+
+    def new_game(self, curated: bool = False, helper: bool = False, answer: str = None, hard: bool = False) -> None:
+        '''
+        Sets up the data needed to play a game
+        :param curated: Whether the answer is picked from the curated word list
+        :param helper: Whether the helper tracks the remaining possible words
+        :param answer: The answer to play against (picked at random by default)
+        :param hard: Whether every guess must use the hints revealed so far (see hardmode.py)
+        '''
+        self.reset(curated, helper, hard)
+        if answer is None:
+            answer = self.word_list[random.randint(0, len(self.word_list) - 1)]
+        self.answer = answer
+        self.remaining_words = self.all_words
+        self.weighted = get_prior(self.lexicon).everything # remaining_words with their weighted statistics
+        self.state_path = () # Canonical helper states applied to get remaining_words, used as the cache key
+        self.helper_info = WordleInfo(get_word_index(self.lexicon) if helper else None, self.word_length)
+        self.pending_infos = [] # Snapshots of helper info not yet applied to remaining_words
+        self.analysis = None # The post-game report if analyzed, filled in off the game thread (see analysis.py)
+        if self.analyzed:
+            from analysis import GameAnalysis
+            self.analysis = GameAnalysis(self.lexicon, self.word_list, hard)
+
+    def reset(self, curated: bool, helper: bool, hard: bool) -> None:
+        '''
+        Sets up the state every kind of game shares, leaving the answers and the helper's words to new_game
+        :param curated: Whether answers are picked from the curated word list
+        :param helper: Whether the helper tracks the remaining possible words
+        :param hard: Whether every guess must use the hints revealed so far
+        '''
+        self.helper = helper
+        self.curated = curated
+        self.hard = hard
+        self.rules = HardModeRules(self.word_length)
+        self.started = time.time()
+        self.word_list = self.lexicon.get_words(curated)
+        self.completion_source = None # The remaining words completion_mask was made from
+        self.completion_mask = None
+        self.guesses = []
+        self.guesses_made = 0
+
+    @timed('Game.check_guess')
+    def check_guess(self, guess: str) -> str:
+        '''
+        Checks that a guess is an English word of the game's word length found in the dictionary, suggesting the
+            closest words if it is not, and in hard mode that it uses every hint revealed so far
+        :param guess: The user's guess, already stripped and upper case
+        :return: A message explaining why the guess is rejected, or an empty string if it is accepted
+        '''
+        if not guess.isalpha():
+            return "Guesses must only contain letters."
+        elif len(guess) != self.word_length:
+            return f"Guesses must be {self.word_length} letters long."
+        elif not self.lexicon.is_word(guess):
+            suggestions = [word.title() for word in self.lexicon.did_you_mean(guess)]
+            if not suggestions:
+                return f"{guess.title()} is not an English word."
+            options = suggestions[0] if len(suggestions) == 1 else f"{', '.join(suggestions[:-1])} or {suggestions[-1]}"
+            return f"{guess.title()} is not an English word. Did you mean {options}?"
+        elif self.hard:
+            return self.rules.violation(guess)
+        return ''
+
+    def completions(self, prefix: str, top_n: int = 8) -> tuple:
+        '''
+        Completes a partly typed guess with valid words, keeping to the remaining words when the helper is enabled
+        The remaining words are turned into a bitset once each time they change, so each keystroke only costs two
+            binary searches and a bit count (see completion.PrefixIndex)
+        :param prefix: The letters typed so far, upper case
+        :param top_n: How many completions to return
+        :return: (how many words could complete the prefix, the first top_n of them in alphabetical order)
+        '''
+        prefixes = self.lexicon.get_prefixes()
+        if not self.helper:
+            return prefixes.complete(prefix, None, top_n)
+        if self.completion_source is not self.remaining_words:
+            self.completion_source = self.remaining_words
+            self.completion_mask = prefixes.mask_of(self.possible_words())
+        return prefixes.complete(prefix, self.completion_mask, top_n)
+
+    def possible_words(self) -> list:
+        '''
+        :return: The words that can still be the answer, as far as the helper has filtered them
+        '''
+        return self.remaining_words
+
+    @timed('Game.take_guess')
+    def take_guess(self, guess: str, filter_now: bool = True) -> list:
+        '''
+        Scores an accepted guess against the answer and updates the helper if it is enabled
+        :param guess: The user's guess, which must have passed check_guess
+        :param filter_now: Whether to filter remaining_words now, or leave it to be done elsewhere (see pending_work)
+        :return: A list of colors ('G', 'Y' or 'X'), one for each letter of the guess
+        '''
+        if self.is_over():
+            raise ValueError("ValueError: The game is already over")
+        colors = score_guess(guess, self.answer)
+        if self.hard:
+            self.rules.update(guess, colors)
+        if self.helper:
+            self.helper_info.process_input_info(guess, colors)
+            self.pending_infos.append(self.helper_info.copy())
+            if filter_now:
+                self.apply_filtered(*self.filter_pending(*self.pending_work(), self.lexicon), len(self.pending_infos))
+        self.guesses.append((guess, colors))
+        self.guesses_made += 1
+        return colors
+
+    def pending_work(self) -> tuple:
+        '''
+        Gets everything needed to bring remaining_words up to date, none of which changes as later guesses are taken
+        :return: (the current remaining words, snapshots of the helper info after each guess not yet applied,
+            the canonical states applied to get the current remaining words)
+        '''
+        return self.remaining_words, list(self.pending_infos), self.state_path
+
+    @staticmethod
+    def filter_pending(remaining_words: list, infos: list, state_path: tuple = (), lexicon: Lexicon = None) -> tuple:
+        '''
+        Applies each snapshot of helper info in turn, exactly as if the words had been filtered after every guess
+        This only reads its arguments, so it can run on another thread
+        :param remaining_words: The words that could be the answer before the snapshots
+        :param infos: Snapshots of helper info from pending_work
+        :param state_path: The canonical states applied to get remaining_words
+        :param lexicon: The lexicon remaining_words comes from (defaults to the standard word files)
+        :return: (the words that can still be the answer, the canonical states applied to get them)
+        '''
+        for info in infos:
+            remaining_words, state_path = filter_cached(remaining_words, info, state_path, lexicon)
+        return remaining_words, state_path
+
+    def apply_filtered(self, remaining_words: list, state_path: tuple, applied: int, weighted=None) -> None:
+        '''
+        Stores the result of filter_pending, updating the weighted statistics by the words that were removed unless
+            they were already narrowed elsewhere
+        :param remaining_words: The filtered words
+        :param state_path: The canonical states applied to get them
+        :param applied: How many pending snapshots were applied to get them
+        :param weighted: The filtered words with their weighted statistics (see priors.WeightedCandidates), if known
+        '''
+        self.weighted = weighted if weighted is not None else self.weighted.narrowed(remaining_words)
+        self.remaining_words = remaining_words
+        self.state_path = state_path
+        del self.pending_infos[:applied]
+
+    def is_won(self) -> bool:
+        '''
+        :return: Whether the last guess was the answer
+        '''
+        return bool(self.guesses) and self.guesses[-1][0] == self.answer
+
+    def is_over(self) -> bool:
+        '''
+        :return: Whether the answer has been guessed or the maximum number of guesses has been reached
+        '''
+        return self.is_won() or self.guesses_made >= self.max_guesses
+
+    def record(self) -> dict:
+        '''
+        Describes the game for the game history
+        :return: The answer, each guess and its colors, when the game started and finished, which settings and word
+            list were used, with the post-game report if every turn has been analyzed
+        '''
+        record = {'answer': self.answer, 'guesses': [guess for guess, _ in self.guesses],
+                  'patterns': [''.join(colors) for _, colors in self.guesses], 'won': self.is_won(),
+                  'helper': self.helper, 'curated': self.curated, 'hard': self.hard, 'started': self.started,
+                  'finished': time.time(), 'word_list': self.lexicon.words_hash}
+        if self.analysis is not None and self.analysis.complete(self.guesses):
+            record['analysis'] = self.analysis.turns
+        return record
+
+    def suggestions(self, top_n: int = 3) -> list:
+        '''
+        :param top_n: How many guesses to suggest
+        :return: The best next guesses over the remaining words weighted by the prior, best first (the decision tree's
+            guess leads if there is one)
+        '''
+        ranking = get_weighted_recommender(self.lexicon).rank(self.remaining_words, top_n, self.allowed_guesses(),
+                                                              statistics=self.weighted.statistics())
+        suggestions = [word for word, _ in ranking]
+        tree_guess = self.tree_suggestion()
+        if tree_guess is not None:
+            suggestions = [tree_guess] + [word for word in suggestions if word != tree_guess][:top_n - 1]
+        return suggestions
+
+    def allowed_guesses(self) -> list:
+        '''
+        :return: The words that may be guessed next, or None when every word may be (always, outside hard mode)
+        '''
+        if not self.hard:
+            return None
+        return get_allowed_guesses(self.lexicon).lookup(self.rules)
+
+    def tree_suggestion(self) -> str:
+        '''
+        Looks up the precomputed decision tree's next guess, which is only available for curated games that have
+            followed the tree so far and only once the tree has been built (see decision_tree.py)
+        The tree is built to find every answer within MAX_GUESSES, so games with another limit get no tree guess
+        In hard mode the tree's guess is only given if it uses every revealed hint
+        :return: The tree's next guess, or None
+        '''
+        if not self.curated or self.max_guesses != MAX_GUESSES:
+            return None
+        from decision_tree import get_decision_tree
+        tree = get_decision_tree(self.lexicon)
+        if tree is None:
+            return None
+        tree_guess = tree.follow([(guess, encode_pattern(colors)) for guess, colors in self.guesses])
+        if tree_guess is not None and self.hard and self.rules.violation(tree_guess):
+            return None
+        return tree_guess
+
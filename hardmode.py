@@ -0,0 +1,132 @@
+from collections import OrderedDict
+from constraints import ConstraintIndex
+import threading
+
+
+ORDINALS = ['1st', '2nd', '3rd'] # Letter positions past these are written as 4th, 5th and so on
+
+
+def ordinal(n: int) -> str:
+    '''
+    :param n: A number from 1 up
+    :return: The number as a position, such as 1st or 4th
+    '''
+    return ORDINALS[n - 1] if n <= len(ORDINALS) else f"{n}th"
+
+
+class HardModeRules:
+    '''
+    A class that keeps what hard mode requires of the next guess: every green letter in its place, and at least as
+        many copies of each letter as any single guess has shown to be in the answer (green or yellow)
+    The requirements only ever tighten, so they are updated from each guess's colors as it is taken and a guess is
+        checked against them in time set by the word length, without looking back at earlier guesses
+    '''
+    def __init__(self, length: int) -> None:
+        '''
+        :param length: The number of letters in a word
+        '''
+        self.greens = ['_'] * length # Letters required by position ('_' where any letter is allowed)
+        self.minimums = {} # Letters required anywhere, as letter: fewest copies
+
+    def copy(self) -> 'HardModeRules':
+        '''
+        :return: Requirements that can change without changing these
+        '''
+        rules = HardModeRules(len(self.greens))
+        rules.greens = list(self.greens)
+        rules.minimums = dict(self.minimums)
+        return rules
+
+    def update(self, guess: str, colors: list) -> None:
+        '''
+        Adds what a guess revealed to the requirements
+        :param guess: The word guessed
+        :param colors: The colors the guess showed ('G', 'Y' or 'X' for each letter)
+        '''
+        shown = {}
+        for i, (letter, color) in enumerate(zip(guess, colors)):
+            if color == 'G':
+                self.greens[i] = letter
+            if color != 'X':
+                shown[letter] = shown.get(letter, 0) + 1
+        for letter, n in shown.items():
+            if n > self.minimums.get(letter, 0):
+                self.minimums[letter] = n
+
+    def violation(self, guess: str) -> str:
+        '''
+        :param guess: A word of the game's length
+        :return: A message explaining which revealed hint the guess does not use, or an empty string if it uses them all
+        '''
+        for i, letter in enumerate(self.greens):
+            if letter != '_' and guess[i] != letter:
+                return f"Hard mode: the {ordinal(i + 1)} letter must be {letter}."
+        for letter, n in self.minimums.items():
+            if guess.count(letter) < n:
+                return f"Hard mode: guesses must contain {letter}" + (f" {n} times." if n > 1 else ".")
+        return ''
+
+    def state(self) -> tuple:
+        '''
+        :return: The requirements in a hashable form, equal for any two sets of guesses that require the same things
+        '''
+        return ''.join(self.greens), tuple(sorted(self.minimums.items()))
+
+    def is_empty(self) -> bool:
+        '''
+        :return: Whether every word is allowed
+        '''
+        return not self.minimums
+
+
+class AllowedGuesses:
+    '''
+    A class that finds the words hard mode allows as the next guess, as a bitset over the word list
+    The bitset is a handful of ANDs of the index's position and letter-count bitsets, and the allowed words for each
+        set of requirements are kept (least recently used dropped first), so the helper and the simulator pay for
+        each state once however many games reach it
+    '''
+    def __init__(self, index: ConstraintIndex, max_entries: int = 1024) -> None:
+        '''
+        :param index: The bitset index of the word list guesses come from
+        :param max_entries: The most states kept
+        '''
+        self.index = index
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock() # The helper ranks on worker threads as well as the GUI thread
+
+    def mask(self, rules: HardModeRules) -> int:
+        '''
+        :param rules: Hard mode's requirements
+        :return: A bitset of every word that meets them
+        '''
+        index = self.index
+        mask = index.full
+        for i, letter in enumerate(rules.greens):
+            if letter != '_':
+                mask &= index.at_position(i, letter)
+        for letter, n in rules.minimums.items():
+            mask &= index.at_least(letter, n)
+        return mask
+
+    def lookup(self, rules: HardModeRules) -> list:
+        '''
+        :param rules: Hard mode's requirements
+        :return: The words that meet them, in word list order, or None when every word does (so callers can keep
+            using whatever they cache for the whole word list)
+        '''
+        if rules.is_empty():
+            return None
+        key = rules.state()
+        with self.lock:
+            words = self.entries.get(key)
+            if words is not None:
+                self.entries.move_to_end(key)
+                return words
+        words = self.index.words_of(self.mask(rules))
+        with self.lock:
+            self.entries[key] = words
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return words
@@ -0,0 +1,187 @@
+from contextlib import contextmanager
+import json
+import os
+
+try:
+    import fcntl
+except ImportError: # Windows locks files with msvcrt instead
+    fcntl = None
+    import msvcrt
+
+
+HISTORY_FILE = "game_history.jsonl"
+SNAPSHOT_FILE = "game_history.snapshot.json"
+LOCK_FILE = "game_history.lock"
+LEGACY_STATS_FILE = "stats_data.txt"
+COMPACT_EVERY = 50 # Games appended after the snapshot before the counters are compacted into a new snapshot
+
+
+@contextmanager
+def locked(path: str):
+    '''
+    Holds an exclusive lock on a lock file, so that separate game windows never write the history at the same time
+    :param path: The lock file
+    '''
+    with open(path, 'a+b') as file:
+        if fcntl is not None:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def empty_counters() -> list:
+    '''
+    :return: Statistics for no games, in the order of stats_data.txt (games played, then games finished in 1 to 6 guesses)
+        Games allowed more than 6 guesses add counters to the end as they are needed (see count_game)
+    '''
+    return [0] * 7
+
+
+def count_game(counters: list, record: dict) -> None:
+    '''
+    Adds one game record to a set of statistics, the same way the old stats_data.txt was updated
+    :param counters: The statistics to update
+    :param record: The game record
+    '''
+    counters[0] += 1
+    n = len(record['guesses'])
+    if n >= len(counters):
+        counters.extend([0] * (n + 1 - len(counters)))
+    counters[n] += 1
+
+
+class GameHistory:
+    '''
+    A class that keeps every finished game in an append-only log, along with running statistics
+    Each game is one JSON line that is written and synced in a single append, so a crash can at worst leave one
+        unfinished line, which is ignored
+    Statistics are kept in a snapshot that records how far into the log it has counted, so loading them only reads
+        the few games appended since the last snapshot no matter how long the history is
+    '''
+    def __init__(self, history_file: str = HISTORY_FILE, snapshot_file: str = SNAPSHOT_FILE,
+                 lock_file: str = LOCK_FILE, legacy_stats_file: str = LEGACY_STATS_FILE) -> None:
+        '''
+        :param history_file: The append-only log of games
+        :param snapshot_file: The statistics snapshot
+        :param lock_file: The file locked while the history is written
+        :param legacy_stats_file: The old statistics file, counted as games played before the log existed
+        '''
+        self.history_file = history_file
+        self.snapshot_file = snapshot_file
+        self.lock_file = lock_file
+        self.legacy_stats_file = legacy_stats_file
+
+    def append(self, record: dict) -> None:
+        '''
+        Adds a finished game to the end of the log and compacts the statistics if enough games have been added
+        :param record: The game record (see Game.record)
+        '''
+        line = (json.dumps(record, separators=(',', ':')) + '\n').encode()
+        with locked(self.lock_file):
+            with open(self.history_file, 'ab') as file:
+                if file.tell() > 0 and not self.ends_with_newline():
+                    line = b'\n' + line # Closes off a line left unfinished by a crash so it cannot corrupt this one
+                file.write(line)
+                file.flush()
+                os.fsync(file.fileno())
+            counters, offset, pending = self.read_counters()
+            if pending >= COMPACT_EVERY:
+                self.write_snapshot(counters, offset)
+
+    def ends_with_newline(self) -> bool:
+        '''
+        :return: Whether the last record in the log was written completely
+        '''
+        with open(self.history_file, 'rb') as file:
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) == b'\n'
+
+    def stats(self) -> list:
+        '''
+        :return: Statistics in the order of stats_data.txt (games played, then games finished in 1 to 6 guesses,
+            then in 7 or more guesses if any game allowed them)
+        '''
+        return self.read_counters()[0]
+
+    def read_counters(self) -> tuple:
+        '''
+        Loads the snapshot and counts the games logged after it
+        Without a snapshot, counting starts from the old statistics file and replays the whole log
+        :return: (statistics, log offset they count up to, number of games counted since the snapshot)
+        '''
+        if os.path.exists(self.snapshot_file):
+            with open(self.snapshot_file, 'r') as file:
+                snapshot = json.load(file)
+            counters, offset = snapshot['counters'], snapshot['offset']
+        else:
+            counters, offset = self.legacy_counters(), 0
+        pending = 0
+        for record, offset in self.read_records(offset):
+            count_game(counters, record)
+            pending += 1
+        return counters, offset, pending
+
+    def legacy_counters(self) -> list:
+        '''
+        :return: The statistics in the old stats_data.txt file, which is no longer written to
+        '''
+        if not os.path.exists(self.legacy_stats_file):
+            return empty_counters()
+        with open(self.legacy_stats_file, 'r') as file:
+            values = [int(n) for n in file.readline().split()]
+        return values if len(values) == 7 else empty_counters()
+
+    def read_records(self, offset: int = 0):
+        '''
+        Reads complete game records from a position in the log
+        :param offset: Where in the log to start reading
+        :return: A generator of (record, offset just after the record) pairs
+        '''
+        if not os.path.exists(self.history_file):
+            return
+        with open(self.history_file, 'rb') as file:
+            file.seek(offset)
+            for line in file:
+                if not line.endswith(b'\n'): # An unfinished last line is not counted until it is finished
+                    return
+                offset += len(line)
+                try:
+                    record = json.loads(line)
+                except ValueError: # A line cut off by a crash and then closed off by a later append
+                    continue
+                yield record, offset
+
+    def records(self) -> list:
+        '''
+        :return: Every complete game record in the log, oldest first
+        '''
+        return [record for record, _ in self.read_records()]
+
+    def write_snapshot(self, counters: list, offset: int) -> None:
+        '''
+        Replaces the statistics snapshot in one step, so a crash leaves either the old snapshot or the new one
+        :param counters: The statistics
+        :param offset: The log offset the statistics count up to
+        '''
+        with open(f"{self.snapshot_file}.tmp", 'w') as file:
+            json.dump({'counters': counters, 'offset': offset}, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(f"{self.snapshot_file}.tmp", self.snapshot_file)
+
+    def compact(self) -> None:
+        '''
+        Writes a new snapshot that counts every game in the log
+        '''
+        with locked(self.lock_file):
+            counters, offset, _ = self.read_counters()
+            self.write_snapshot(counters, offset)
@@ -0,0 +1,234 @@
+from array import array
+from completion import PrefixIndex
+from patterns import CACHE_DIR, word_list_hash
+from profiling import timed
+from spelling import SpellingIndex
+import hashlib
+import os
+import struct
+
+
+ALL_WORDS_FILE = "all_five_words.txt"
+CURATED_WORDS_FILE = "previous_wordle_answers.txt"
+MAGIC = b"WLEX2"
+PRIOR_SUFFIX = ".prior.txt" # A list's word frequencies sit beside it, such as all_five_words.prior.txt (see priors.py)
+MIN_WORD_LENGTH = 4
+MAX_WORD_LENGTH = 8
+
+
+class Lexicon:
+    '''
+    A class that holds both word lists, loaded once and shared by everything in the process
+    Words are stored once as fixed-width bytes, with a hash set for validation and an array of indexes that picks
+        the curated answers out of the full list; the shared list of words is built from the bytes when loading
+    The spelling index used to suggest words for rejected guesses is saved with the binary form, so it is only
+        sorted once
+    '''
+    def __init__(self, data: bytes, word_length: int, curated_indices: array, spelling_data: bytes = None) -> None:
+        '''
+        :param data: Every valid word in file order, as ASCII, word_length bytes each
+        :param word_length: The number of letters in every word
+        :param curated_indices: Indexes (into the full list) of the curated answers, in file order
+        :param spelling_data: The saved spelling index (see SpellingIndex.to_bytes), if there is one
+        '''
+        text = data.decode('ascii')
+        words = [text[i:i + word_length] for i in range(0, len(text), word_length)]
+        self.data = data
+        self.words = words
+        self.words_hash = word_list_hash(words) # Names every file derived from the full list
+        self.word_length = word_length
+        self.word_set = frozenset(words)
+        self.index = {word: i for i, word in enumerate(words)}
+        self.curated_indices = curated_indices
+        self.curated_words = [words[i] for i in curated_indices]
+        self.curated_set = frozenset(self.curated_words)
+        self.spelling = None
+        self.spelling_data = spelling_data
+        self.prefixes = None # Sorted form of words for completing guesses, built the first time it is needed
+        self.prior_file = None # The list's word frequencies, if it has a prior file (see get_lexicon)
+
+    def get_words(self, curated: bool = False) -> list:
+        '''
+        :param curated: Determines which list to use (False uses the full list, True uses the curated answers)
+        :return: The shared word list, which must not be modified
+        '''
+        return self.curated_words if curated else self.words
+
+    def get_prefixes(self) -> PrefixIndex:
+        '''
+        :return: The full list sorted for prefix lookups (see completion.PrefixIndex)
+        '''
+        if self.prefixes is None:
+            self.prefixes = PrefixIndex(self.words)
+        return self.prefixes
+
+    def get_spelling(self) -> SpellingIndex:
+        '''
+        :return: The spelling index of the full list, loaded from the binary form or built the first time it is needed
+        '''
+        if self.spelling is None:
+            if self.spelling_data:
+                self.spelling = SpellingIndex.from_bytes(self.words, self.spelling_data)
+            else:
+                self.spelling = SpellingIndex.build(self.words)
+            self.spelling_data = None
+        return self.spelling
+
+    def did_you_mean(self, word: str, top_n: int = 3) -> list:
+        '''
+        :param word: A word that is not in the full list
+        :param top_n: How many words to suggest
+        :return: The closest valid words, closest first, curated answers first among equally close words
+        '''
+        return self.get_spelling().suggest(word, top_n, self.curated_set)
+
+    def is_word(self, word: str) -> bool:
+        '''
+        :param word: A word to validate
+        :return: Whether the word is in the full word list
+        '''
+        return word in self.word_set
+
+    def word_at(self, i: int) -> str:
+        '''
+        :param i: An index into the full list
+        :return: The word at that index, read from the compact storage
+        '''
+        start = i * self.word_length
+        return self.data[start:start + self.word_length].decode('ascii')
+
+    @classmethod
+    @timed('Lexicon.from_files')
+    def from_files(cls, all_file: str = ALL_WORDS_FILE, curated_file: str = CURATED_WORDS_FILE) -> 'Lexicon':
+        '''
+        Parses the word files, which contain words separated by whitespace, in either case
+        Every word must have the same number of letters, between MIN_WORD_LENGTH and MAX_WORD_LENGTH, and only use
+            the letters A to Z
+        :param all_file: The file of every valid word
+        :param curated_file: The file of curated answers, which must all be valid words (None lets every word be
+            the answer)
+        :return: The lexicon of both files
+        '''
+        with open(all_file, 'r') as f:
+            words = f.read().upper().split()
+        if curated_file is None:
+            curated = words
+        else:
+            with open(curated_file, 'r') as f:
+                curated = f.read().upper().split()
+        if not words:
+            raise ValueError(f"ValueError: {all_file} has no words")
+        if not all(word.isascii() and word.isalpha() for word in words):
+            raise ValueError(f"ValueError: Words in {all_file} must only use the letters A to Z")
+        lengths = {len(word) for word in words}
+        if len(lengths) != 1:
+            raise ValueError(f"ValueError: Words in {all_file} must all be the same length")
+        if not MIN_WORD_LENGTH <= len(words[0]) <= MAX_WORD_LENGTH:
+            raise ValueError(f"ValueError: Words must be {MIN_WORD_LENGTH} to {MAX_WORD_LENGTH} letters long")
+        index = {word: i for i, word in enumerate(words)}
+        missing = [word for word in curated if word not in index]
+        if missing:
+            raise ValueError(f"ValueError: Curated words missing from {all_file}: {' '.join(missing[:5])}")
+        return cls(''.join(words).encode('ascii'), len(words[0]), array('I', [index[word] for word in curated]))
+
+    @classmethod
+    @timed('Lexicon.from_binary')
+    def from_binary(cls, path: str) -> 'Lexicon':
+        '''
+        Loads a lexicon saved by save_binary without parsing any text
+        :param path: The binary file
+        :return: The saved lexicon
+        '''
+        with open(path, 'rb') as f:
+            data = f.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"ValueError: {path} is not a lexicon file")
+        offset = len(MAGIC)
+        word_length, word_count, curated_count = struct.unpack_from('<III', data, offset)
+        offset += 12
+        word_data = data[offset:offset + word_length * word_count]
+        offset += word_length * word_count
+        curated_indices = array('I')
+        curated_indices.frombytes(data[offset:offset + curated_count * curated_indices.itemsize])
+        offset += curated_count * curated_indices.itemsize
+        return cls(word_data, word_length, curated_indices, data[offset:])
+
+    def save_binary(self, path: str) -> None:
+        '''
+        Saves the lexicon in a binary form that loads without text parsing, followed by the spelling index
+        The file is written to a temporary file first so a partial file is never loaded
+        :param path: The binary file
+        '''
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(f"{path}.tmp", 'wb') as f:
+            f.write(MAGIC)
+            f.write(struct.pack('<III', self.word_length, len(self.words), len(self.curated_indices)))
+            f.write(self.data)
+            f.write(self.curated_indices.tobytes())
+            f.write(self.get_spelling().to_bytes())
+        os.replace(f"{path}.tmp", path)
+
+
+def binary_path(all_file: str = ALL_WORDS_FILE, curated_file: str = CURATED_WORDS_FILE) -> str:
+    '''
+    Names the binary form of a pair of word files after their contents and the format version, so only a real
+        change to either list (or to the format) makes a new binary form, while copying, renaming or touching the
+        files reuses the old one
+    :param all_file: The file of every valid word
+    :param curated_file: The file of curated answers (None when every word may be the answer)
+    :return: The path of the binary form
+    '''
+    digest = hashlib.sha256(MAGIC)
+    for filename in (all_file, curated_file):
+        digest.update(b'\0')
+        if filename is not None:
+            with open(filename, 'rb') as f:
+                digest.update(f.read())
+    return os.path.join(CACHE_DIR, f"lexicon-{digest.hexdigest()[:16]}.bin")
+
+
+def default_answers_file(all_file: str, curated_file: str = None) -> str:
+    '''
+    Picks the file of curated answers for the word files given to a command line tool
+    :param all_file: The file of every valid word
+    :param curated_file: The file of curated answers that was given, if any
+    :return: curated_file if it was given, otherwise CURATED_WORDS_FILE with the standard words and None (every word
+        may be the answer) with any other list
+    '''
+    return curated_file or (CURATED_WORDS_FILE if all_file == ALL_WORDS_FILE else None)
+
+
+def prior_path(all_file: str) -> str:
+    '''
+    :param all_file: The file of every valid word
+    :return: Where the list's prior file would be
+    '''
+    return os.path.splitext(all_file)[0] + PRIOR_SUFFIX
+
+
+_lexicons = {}
+
+
+def get_lexicon(use_binary: bool = True, all_file: str = ALL_WORDS_FILE, curated_file: str = CURATED_WORDS_FILE) -> Lexicon:
+    '''
+    Gets the process-wide lexicon of a pair of word files, loading it the first time it is needed and noting the list's
+        prior file if there is one
+    :param use_binary: Whether to load from (and save) the precompiled binary form instead of parsing the text files
+    :param all_file: The file of every valid word
+    :param curated_file: The file of curated answers (None lets every word be the answer)
+    :return: The shared lexicon
+    '''
+    key = (all_file, curated_file)
+    if key not in _lexicons:
+        if use_binary:
+            path = binary_path(all_file, curated_file)
+            if os.path.exists(path):
+                _lexicons[key] = Lexicon.from_binary(path)
+            else:
+                _lexicons[key] = Lexicon.from_files(all_file, curated_file)
+                _lexicons[key].save_binary(path)
+        else:
+            _lexicons[key] = Lexicon.from_files(all_file, curated_file)
+        if os.path.exists(prior_path(all_file)):
+            _lexicons[key].prior_file = prior_path(all_file)
+    return _lexicons[key]
@@ -0,0 +1,149 @@
+from lexicon import get_lexicon
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+
+class Client:
+    '''
+    One keep-alive HTTP connection to the game server, timing every request it makes
+    '''
+    def __init__(self, host: str, port: int, latencies: dict) -> None:
+        '''
+        :param host: The server's address
+        :param port: The server's port
+        :param latencies: Where request times are recorded, as route name: list of seconds
+        '''
+        self.host = host
+        self.port = port
+        self.latencies = latencies
+        self.reader = None
+        self.writer = None
+
+    async def connect(self) -> None:
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+
+    async def request(self, name: str, method: str, path: str, payload: dict = None) -> tuple:
+        '''
+        Sends one request and waits for its response
+        :param name: The route name the time is recorded under
+        :param method: The HTTP method
+        :param path: The path and query string
+        :param payload: The JSON body, if any
+        :return: (status, decoded JSON body)
+        '''
+        body = b'' if payload is None else json.dumps(payload).encode()
+        start = time.perf_counter()
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                          f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            header, _, value = line.decode('latin-1').partition(':')
+            if header.strip().lower() == 'content-length':
+                length = int(value)
+        data = await self.reader.readexactly(length)
+        self.latencies.setdefault(name, []).append(time.perf_counter() - start)
+        return status, json.loads(data)
+
+
+async def play(client: Client, words: list, rng: random.Random, helper: bool, suggest: float) -> None:
+    '''
+    Plays one game with random guesses, asking for suggestions before some guesses
+    :param client: The connection to play over
+    :param words: Valid guesses
+    :param rng: Picks guesses and when to ask for suggestions
+    :param helper: Whether the game has the helper enabled
+    :param suggest: The chance of asking for suggestions before each guess (helper games only)
+    '''
+    status, game = await client.request('start', 'POST', '/games', {'helper': helper})
+    if status != 201:
+        raise RuntimeError(f"RuntimeError: Starting a game failed with {status}: {game}")
+    over = False
+    while not over:
+        if helper and rng.random() < suggest:
+            await client.request('suggest', 'GET', f"/games/{game['id']}/suggestions?n=3")
+        status, result = await client.request('guess', 'POST', f"/games/{game['id']}/guesses",
+                                              {'guess': rng.choice(words)})
+        if status != 200:
+            raise RuntimeError(f"RuntimeError: A guess failed with {status}: {result}")
+        over = result['over']
+
+
+async def run_client(host: str, port: int, games: int, words: list, seed: int, helper: bool, suggest: float,
+                     latencies: dict) -> None:
+    '''
+    Plays a number of games one after another over a single connection
+    '''
+    client = Client(host, port, latencies)
+    await client.connect()
+    rng = random.Random(seed)
+    try:
+        for _ in range(games):
+            await play(client, words, rng, helper, suggest)
+    finally:
+        await client.close()
+
+
+def percentile(values: list, fraction: float) -> float:
+    '''
+    :param values: Sorted values
+    :param fraction: Which percentile, from 0 to 1
+    :return: The value at that percentile (nearest rank)
+    '''
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def generate_load(host: str, port: int, clients: int, games: int, helper: bool, suggest: float, seed: int) -> tuple:
+    '''
+    Runs many clients at once
+    :return: (request times by route name, wall time in seconds)
+    '''
+    words = get_lexicon().get_words()
+    latencies = {}
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(host, port, games, words, seed + n, helper, suggest, latencies)
+                           for n in range(clients)))
+    return latencies, time.perf_counter() - start
+
+
+def print_report(latencies: dict, seconds: float) -> None:
+    '''
+    Prints the request count, p50 and p99 latency of each route and overall, and the request rate
+    '''
+    every = sorted(t for times in latencies.values() for t in times)
+    print(f"{'route':<10}{'requests':>10}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    for name, times in sorted(latencies.items()) + [('all', every)]:
+        times = sorted(times)
+        print(f"{name:<10}{len(times):>10}{percentile(times, 0.5) * 1000:>10.2f}{percentile(times, 0.99) * 1000:>10.2f}"
+              f"{statistics.fmean(times) * 1000:>10.2f}")
+    print(f"{len(every)} requests in {seconds:.2f}s ({len(every) / seconds:.1f} requests/sec)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Plays many games against server.py at once and reports latency")
+    parser.add_argument('--host', default='127.0.0.1', help="server address (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8080, help="server port (default: 8080)")
+    parser.add_argument('--clients', type=int, default=50, help="concurrent connections")
+    parser.add_argument('--games', type=int, default=20, help="games each client plays")
+    parser.add_argument('--helper', action='store_true', help="enable the helper in every game")
+    parser.add_argument('--suggest', type=float, default=0.0, help="chance of asking for suggestions before a guess")
+    parser.add_argument('--seed', type=int, default=0, help="seed for the guesses")
+    args = parser.parse_args()
+    print_report(*asyncio.run(generate_load(args.host, args.port, args.clients, args.games, args.helper,
+                                            args.suggest, args.seed)))
+
+
+if __name__ == "__main__":
+    main()
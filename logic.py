@@ -1,81 +1,125 @@
+from PyQt6.QtCore import QStringListModel, QThreadPool, QTimer, Qt
+from PyQt6.QtGui import QCloseEvent
 from PyQt6.QtWidgets import *
 from gui import *
-from wordleinfo import WordleInfo
-import random
+from game import MAX_GUESSES, Game
+from lexicon import Lexicon, get_lexicon
+from history import GameHistory
+from profilepanel import install_profile_panel
+from profiling import profiler, timed
+from analysis import format_turn
+from workers import AnalysisTask, HelperTask
+from wordlists import find_word_lists
+from wordmodel import PossibleWordsModel
+
+
+COLOR_STYLES = {'G': "color: green;", 'Y': "color: yellow;", 'X': "color: gray;"}
+COMPLETION_DELAY = 40 # Milliseconds of no typing before completions are shown, so fast typing is not interrupted
 
 
 class Logic(QMainWindow, Ui_main_window):
     '''
-    A class containing the logic that drives the wordle game.
+    A class containing the GUI that drives the wordle game; the game rules live in game.Game.
     '''
-    def __init__(self) -> None:
+    def __init__(self, lexicon: Lexicon = None, max_guesses: int = MAX_GUESSES, absurdle: bool = False,
+                 word_lists: list = None) -> None:
         '''
         Initializes the GUI object and variables related to the functionality of GUI widgets.
+        :param lexicon: The word lists to play with, which also set the word length (defaults to the standard word files)
+        :param max_guesses: How many guesses a game allows
+        :param absurdle: Whether to play the adversarial mode, which never commits to an answer (see absurdle.py)
+        :param word_lists: The lists that can be picked in the startup menu, the first being lexicon's
+            (see wordlists.find_word_lists, which is also the default)
         '''
         super().__init__()
         self.setupUi(self)
 
-        self.all_words = self.get_all_words()
+        if absurdle:
+            from absurdle import AbsurdleGame
+            self.game = AbsurdleGame(lexicon, max_guesses, analyzed=True)
+        else:
+            self.game = Game(lexicon, max_guesses, analyzed=True)
+        self.history = GameHistory()
+        self.helper_generation = 0 # Identifies the newest helper task so results from stale tasks are ignored
+        self.helper_task = None
+        self.analysis_generation = 0 # Identifies the current game's analysis tasks, like helper_generation
+        self.analysis_task = None
+        self.record_pending = False # Whether a finished game is waiting for its analysis before it is saved
+        self.possible_words_model = PossibleWordsModel(self)
+        self.label_helper_status, self.list_possibilities = self.make_helper_widgets()
+        self.completion_model = QStringListModel(self)
+        self.completer, self.completion_timer = self.make_completion_widgets()
+        self.checkBox_hard_toggle = self.make_hard_mode_toggle()
+        self.word_lists = word_lists or find_word_lists()
+        self.word_list_index = 0 # The list being played, kept so a list that fails to load can be switched back from
+        self.comboBox_word_list = self.make_word_list_box()
+        self.profile_panel = install_profile_panel(self)
 
         # Grouping widgets for collective editing and initializing instance variables
         self.gameplay_group = self.make_gameplay_group()
         self.letter_array = self.make_letter_array()
+        self.guess_label_group = self.make_guess_title_list()
         self.appearing_group = self.make_appearing_group()
+        self.stats_rows = self.make_stats_rows()
         self.startup_group = self.make_startup_group()
-        self.guess_label_group = self.make_guess_title_list()
-        self.helper_info = WordleInfo()
+        self.fit_window_to_rows()
+        self.helper_group = [self.label_helper_status, self.list_possibilities]
 
         # Connecting buttons to their functions
         self.exit_button.clicked.connect(self.close)
         self.return_button.clicked.connect(self.enter_startup_mode)
         self.start_button.clicked.connect(self.enter_gameplay_mode)
+        self.comboBox_word_list.currentIndexChanged.connect(self.switch_word_list)
         self.guess_button.clicked.connect(self.take_guess)
         self.entry_guess.returnPressed.connect(self.take_guess)
+        self.entry_guess.textEdited.connect(lambda _: self.completion_timer.start()) # Restarting the timer debounces typing
 
 
         self.enter_startup_mode()
 
 
+    def cancel_helper_task(self) -> None:
+        '''
+        Stops any running helper task and makes sure nothing it has already posted is shown
+        '''
+        self.helper_generation += 1
+        if self.helper_task is not None:
+            self.helper_task.cancel()
+            self.helper_task = None
+
+
+    def cancel_analysis_task(self) -> None:
+        '''
+        Stops any running analysis task and makes sure nothing it has already posted is used
+        '''
+        self.analysis_generation += 1
+        if self.analysis_task is not None:
+            self.analysis_task.cancel()
+            self.analysis_task = None
+
+
+    @timed('Logic.check_against_answer')
     def check_against_answer(self, guess: str) -> None:
         '''
         Checks a user's guess against the answer to correctly color the letters for user's information.
-        :param guess: Five-letter word guessed by the user.
-        '''
-        if len(guess) != len(self.answer):
-            raise ValueError("ValueError: Guess and answer must be the same length")
-        colors = ['X', 'X', 'X', 'X', 'X']
-        guess_counts = {}
-        answer_counts = {}
-        for i, letter in enumerate(guess): # Records all instances of green placement (correct letter and placement)
-            green_round = False
-            self.letter_array[self.guesses_made][i].setText(guess[i])
-            if letter == self.answer[i]:
-                colors[i] = 'G'
-                self.letter_array[self.guesses_made][i].setStyleSheet("color: green;")
-                green_round = True
-            else:
-                self.letter_array[self.guesses_made][i].setStyleSheet("color: gray;")
-            if letter in guess_counts: # Counts of letters in guess and answer give information used in yellow placement
-                guess_counts[letter] += 1
-            else:
-                guess_counts.update({letter: 1})
-            if not green_round:
-                if self.answer[i] in answer_counts:
-                    answer_counts[self.answer[i]] += 1
-                else:
-                    answer_counts.update({self.answer[i]: 1})
-        for i, letter in enumerate(guess): # Records all instances of yellow placement (correct letter but incorrect placement)
-            if letter in guess_counts and letter in answer_counts and not colors[i] == 'G':
-                colors[i] = 'Y'
-                self.letter_array[self.guesses_made][i].setStyleSheet("color: yellow;")
-                guess_counts[letter] -= 1 # Counts must be recorded for yellow placement in case of duplicate letters
-                answer_counts[letter] -= 1
-                if guess_counts[letter] <= 0:
-                    del guess_counts[letter]
-                if answer_counts[letter] <= 0:
-                    del answer_counts[letter]
-        if self.checkBox_helper_toggle.isChecked():
-            self.helper_info.process_input_info(guess, colors)
+        :param guess: Word guessed by the user.
+        '''
+        row = self.game.guesses_made
+        colors = self.game.take_guess(guess, filter_now=False) # Filtering is left to the helper task
+        for i, letter in enumerate(guess): # Displays each letter in the color given by the scoring rules
+            self.letter_array[row][i].setText(letter)
+            self.letter_array[row][i].setStyleSheet(COLOR_STYLES[colors[i]])
+
+
+    def closeEvent(self, event: QCloseEvent) -> None:
+        '''
+        Saves a finished game still waiting for its analysis, without it, before the window closes
+        :param event: The close event
+        '''
+        self.cancel_analysis_task()
+        if self.record_pending:
+            self.save_record()
+        super().closeEvent(event)
 
 
     def enter_gameplay_mode(self) -> None:
@@ -86,24 +130,24 @@ class Logic(QMainWindow, Ui_main_window):
             widget.setVisible(False)
         for widget in self.gameplay_group:
             widget.setVisible(True)
-        if self.checkBox_helper_toggle.isChecked:
-            self.all_possibilities.setVisible(True)
+        if self.checkBox_helper_toggle.isChecked():
+            for widget in self.helper_group:
+                widget.setVisible(True)
         self.initialize_gamestate()
 
 
     def enter_startup_mode(self) -> None:
         '''
         Hides widgets for the game, shows widgets for the startup menu and updates statistic displays
+        A finished game still waiting for its analysis is saved without it
         '''
-        with open("stats_data.txt", 'r') as file:
-            data = file.readline().split() # Reads in user statistics data and displays it
-            self.label_games_played.setText(data[0])
-            self.label_stats_1g.setText(data[1])
-            self.label_stats_2g.setText(data[2])
-            self.label_stats_3g.setText(data[3])
-            self.label_stats_4g.setText(data[4])
-            self.label_stats_5g.setText(data[5])
-            self.label_stats_6g.setText(data[6])
+        self.cancel_helper_task()
+        self.cancel_analysis_task()
+        if self.record_pending:
+            self.save_record()
+        data = self.history.stats() # Reads in user statistics data and displays it
+        for i, (_, label_value) in enumerate(self.stats_rows):
+            label_value.setText(str(data[i] if i < len(data) else 0))
         for widget in self.startup_group:  # Hides and reveals appropriate widgets
             widget.setVisible(True)
         for widget in self.gameplay_group:
@@ -112,37 +156,32 @@ class Logic(QMainWindow, Ui_main_window):
             widget.setVisible(False)
 
 
-    def get_all_words(self, curated=False) -> list:
+    def fit_window_to_rows(self) -> None:
         '''
-        Reads words from a file of words separated by whitespace and makes them a list
-        Words can come from all_five_words.txt, a file of all 5-letter English words, or previous_wordle_answers.txt,
-        a file of previous answers from the official Wordle game, depending on the users choice (curation)
-        :param curated: Determines which file to use (False uses all_five_words.txt, True uses previous_wordle_answers.txt)
-        :return: A list of all possible answers at the beginning of the game based on the desired set of words
+        Moves the answer row and the buttons below the last guess or statistics row and resizes the window to fit,
+            which only changes the designer's layout when games allow more than 6 guesses
         '''
-        all_words = []
-        if curated: # These two files contain the words used in the game
-            filename = "previous_wordle_answers.txt"
-        else:
-            filename = "all_five_words.txt"
-        with open(filename, 'r') as f:
-            for line in f.readlines():
-                for word in line.strip().split():
-                    all_words.append(word)
-        return all_words
-    
+        rows = max(6, self.game.max_guesses)
+        answer_y = self.label_guess_1_title.y() + 20 * (rows + 1)
+        self.label_answer_title.move(self.label_answer_title.x(), answer_y)
+        self.label_answer.move(self.label_answer.x(), answer_y)
+        button_y = max(self.exit_button.y(), answer_y + 40)
+        self.exit_button.move(self.exit_button.x(), button_y)
+        self.return_button.move(self.return_button.x(), button_y)
+        self.resize(self.width(), max(button_y, self.start_button.y()) + 48)
+
 
     def initialize_gamestate(self) -> None:
         '''
         Sets up the data needed to play the game
         '''
-        self.remaining_words = self.get_all_words()
-        self.word_list = self.get_all_words(self.checkBox_curation_toggle.isChecked())
-        self.answer = self.word_list[random.randint(0, len(self.word_list) - 1)]
-        self.label_answer.setText(self.answer)
-        self.helper_info = WordleInfo()
-        self.all_possibilities.setText('')
-        self.guesses_made = 0
+        self.game.new_game(self.checkBox_curation_toggle.isChecked(), self.checkBox_helper_toggle.isChecked(),
+                           hard=self.checkBox_hard_toggle.isChecked())
+        self.label_answer.setText(self.game.answer)
+        self.label_helper_status.setText("Possible words:")
+        self.possible_words_model.set_words(self.game.remaining_words if self.game.helper else [], self.game.weighted)
+        self.cancel_analysis_task()
+        self.start_analysis_task() # Ranks the opening position while the player picks a first guess
 
 
     def make_appearing_group(self) -> list:
@@ -152,9 +191,9 @@ class Logic(QMainWindow, Ui_main_window):
         :return: A list of all widgets that appear during gameplay
         '''
         appearing_group = [self.label_previous_title, self.label_answer_title, self.label_answer]
-        appearing_group += [self.label_guess_1_title, self.label_guess_2_title, self.label_guess_3_title]
-        appearing_group += [self.label_guess_4_title, self.label_guess_5_title, self.label_guess_6_title]
+        appearing_group += self.guess_label_group
         appearing_group += [self.label_congrats_answer, self.label_congrats_guesses, self.all_possibilities]
+        appearing_group += [self.label_helper_status, self.list_possibilities]
         for guess in self.letter_array:
             for letter in guess:
                 appearing_group.append(letter)
@@ -170,30 +209,91 @@ class Logic(QMainWindow, Ui_main_window):
         return [self.label_guess_title, self.entry_guess, self.guess_button, self.label_error_display, self.return_button]
     
 
+    def make_completion_widgets(self) -> tuple:
+        '''
+        Creates the popup of completions under entry_guess and the timer that waits for typing to pause
+        The popup is driven by show_completions rather than by the line edit, so it only ever holds words from the game
+        :return: The completer and the timer
+        '''
+        completer = QCompleter(self.completion_model, self)
+        completer.setWidget(self.entry_guess)
+        completer.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        completer.activated.connect(self.entry_guess.setText)
+        completion_timer = QTimer(self)
+        completion_timer.setSingleShot(True)
+        completion_timer.setInterval(COMPLETION_DELAY)
+        completion_timer.timeout.connect(self.show_completions)
+        return completer, completion_timer
+
+
+    def make_hard_mode_toggle(self) -> QCheckBox:
+        '''
+        Creates the hard mode setting below the designer's settings, moving the start button down to make room
+        :return: The hard mode check box
+        '''
+        geometry = self.checkBox_curation_toggle.geometry()
+        checkBox_hard_toggle = QCheckBox("Enable Hard Mode", parent=self)
+        checkBox_hard_toggle.setGeometry(geometry.x(), geometry.y() + 30, geometry.width(), geometry.height())
+        self.start_button.move(self.start_button.x(), self.start_button.y() + 30)
+        return checkBox_hard_toggle
+
+
+    def make_helper_widgets(self) -> tuple:
+        '''
+        Creates the helper's widgets in place of the all_possibilities text box, which is never shown
+        The list view only draws the rows in view, so showing thousands of possible words costs the same as showing ten
+        :return: A label for suggestions and progress, and a list view of the possible words
+        '''
+        geometry = self.all_possibilities.geometry()
+        label_helper_status = QLabel(parent=self)
+        label_helper_status.setGeometry(geometry.x(), geometry.y(), geometry.width(), 16)
+        list_possibilities = QListView(parent=self)
+        list_possibilities.setGeometry(geometry.x(), geometry.y() + 18, geometry.width(), geometry.height() - 18)
+        list_possibilities.setUniformItemSizes(True) # Lets the view lay out rows without measuring each one
+        list_possibilities.setModel(self.possible_words_model)
+        return label_helper_status, list_possibilities
+
+
     def make_guess_title_list(self) -> list:
         '''
-        Groups the labels for each of the guess numbers (ex: Guess 1)
+        Creates the labels for each of the guess numbers (ex: Guess 1), one per guess the game allows, laid out like
+            the designer's six titles (which are hidden and not used)
         These items are grouped in order to select a title to reveal without hard coding each title individually
         :return: A list of all guessing titles that appear during gameplay
         '''
-        title_list = [self.label_guess_1_title, self.label_guess_2_title, self.label_guess_3_title]
-        title_list += [self.label_guess_4_title, self.label_guess_5_title, self.label_guess_6_title]
+        designer_titles = [self.label_guess_1_title, self.label_guess_2_title, self.label_guess_3_title]
+        designer_titles += [self.label_guess_4_title, self.label_guess_5_title, self.label_guess_6_title]
+        for title in designer_titles:
+            title.setVisible(False)
+        geometry = self.label_guess_1_title.geometry()
+        title_list = []
+        for row in range(self.game.max_guesses):
+            title = QLabel(f"Guess {row + 1}:", parent=self)
+            title.setGeometry(geometry.x(), geometry.y() + 20 * row, geometry.width(), geometry.height())
+            title_list.append(title)
         return title_list
 
 
     def make_letter_array(self) -> list:
         '''
-        Groups all elements that represent letters of a user guess
+        Creates all elements that represent letters of a user guess, one row per guess the game allows and one column
+            per letter, laid out like the designer's 6 x 5 grid (whose labels are hidden and not used)
         These items are grouped in order to edit each item's letter and color without hard coding each item
         :return: An array of label widgets where each row is a guessed word and each column is a letter in that word
         '''
-        group1 = [self.g1c1, self.g1c2, self.g1c3, self.g1c4, self.g1c5]
-        group2 = [self.g2c1, self.g2c2, self.g2c3, self.g2c4, self.g2c5]
-        group3 = [self.g3c1, self.g3c2, self.g3c3, self.g3c4, self.g3c5]
-        group4 = [self.g4c1, self.g4c2, self.g4c3, self.g4c4, self.g4c5]
-        group5 = [self.g5c1, self.g5c2, self.g5c3, self.g5c4, self.g5c5]
-        group6 = [self.g6c1, self.g6c2, self.g6c3, self.g6c4, self.g6c5]
-        return [group1, group2, group3, group4, group5, group6]
+        for row in range(1, 7):
+            for column in range(1, 6):
+                getattr(self, f"g{row}c{column}").setVisible(False)
+        geometry = self.g1c1.geometry()
+        letter_array = []
+        for row in range(self.game.max_guesses):
+            group = []
+            for column in range(self.game.word_length):
+                letter = QLabel(parent=self)
+                letter.setGeometry(geometry.x() + 10 * column, geometry.y() + 20 * row, geometry.width(), geometry.height())
+                group.append(letter)
+            letter_array.append(group)
+        return letter_array
     
 
     def make_startup_group(self) -> list:
@@ -203,56 +303,232 @@ class Logic(QMainWindow, Ui_main_window):
         :return: A list of all widgets that appear during the setup phase
         '''
         startup_group = [self.label_welcome, self.label_settings, self.start_button, self.checkBox_helper_toggle]
-        startup_group += [self.checkBox_curation_toggle, self.label_stats_title, self.label_games_played_title, self.label_games_played]
-        startup_group += [self.label_stats_1g_title, self.label_stats_1g, self.label_stats_2g_title, self.label_stats_2g]
-        startup_group += [self.label_stats_3g_title, self.label_stats_3g, self.label_stats_4g_title, self.label_stats_4g]
-        startup_group += [self.label_stats_5g_title, self.label_stats_5g, self.label_stats_6g_title, self.label_stats_6g]
+        startup_group += [self.checkBox_curation_toggle, self.checkBox_hard_toggle, self.comboBox_word_list]
+        startup_group += [self.label_stats_title]
+        for label_title, label_value in self.stats_rows:
+            startup_group += [label_title, label_value]
         return startup_group
 
 
+    def make_word_list_box(self) -> QComboBox:
+        '''
+        Creates the choice of word list above the designer's settings
+        :return: The word list combo box
+        '''
+        comboBox_word_list = QComboBox(parent=self)
+        comboBox_word_list.addItems([name for name, _, _ in self.word_lists])
+        comboBox_word_list.setGeometry(self.label_settings.x(), self.label_settings.y() - 30, 171, 22)
+        return comboBox_word_list
+
+
+    def make_stats_rows(self) -> list:
+        '''
+        Groups the title and value label of each statistic, adding rows below the designer's for games that allow more
+            than 6 guesses
+        :return: A list of (title label, value label) pairs in the order of GameHistory.stats
+        '''
+        stats_rows = [(self.label_games_played_title, self.label_games_played)]
+        stats_rows += [(self.label_stats_1g_title, self.label_stats_1g), (self.label_stats_2g_title, self.label_stats_2g)]
+        stats_rows += [(self.label_stats_3g_title, self.label_stats_3g), (self.label_stats_4g_title, self.label_stats_4g)]
+        stats_rows += [(self.label_stats_5g_title, self.label_stats_5g), (self.label_stats_6g_title, self.label_stats_6g)]
+        title_geometry = self.label_stats_6g_title.geometry()
+        value_geometry = self.label_stats_6g.geometry()
+        for n in range(7, self.game.max_guesses + 1):
+            offset = 20 * (n - 6)
+            label_title = QLabel(f"Words found in {n} guesses:", parent=self)
+            label_title.setGeometry(title_geometry.x(), title_geometry.y() + offset, title_geometry.width(), title_geometry.height())
+            label_value = QLabel("0", parent=self)
+            label_value.setGeometry(value_geometry.x(), value_geometry.y() + offset, value_geometry.width(), value_geometry.height())
+            stats_rows.append((label_title, label_value))
+        return stats_rows
+
+
+    def save_record(self) -> None:
+        '''
+        Saves the finished game to the history, with its analysis if every turn has been analyzed, and shows the analysis
+        '''
+        self.record_pending = False
+        record = self.game.record()
+        self.history.append(record)
+        if 'analysis' in record:
+            self.label_helper_status.setText("How each guess went:")
+            self.possible_words_model.set_words([format_turn(n, turn) for n, turn in enumerate(record['analysis'], 1)])
+            for widget in self.helper_group:
+                widget.setVisible(True)
+
+
+    def show_analysis_results(self, generation: int, result: tuple) -> None:
+        '''
+        Stores the turns an analysis task analyzed, then either starts on the turns taken since it started or, once
+            the game is over and every turn is analyzed, saves the game
+        :param generation: The generation of the finished task
+        :param result: The result of GameAnalysis.compute
+        '''
+        if generation != self.analysis_generation:
+            return
+        self.analysis_task = None
+        self.game.analysis.apply(*result)
+        if not self.game.analysis.complete(self.game.guesses):
+            self.start_analysis_task()
+        elif self.record_pending:
+            self.save_record()
+
+
+    def show_completions(self) -> None:
+        '''
+        Shows valid words that complete what has been typed (only possible answers when the helper is enabled) and
+            how many there are, once typing has paused
+        '''
+        prefix = self.entry_guess.text().strip().upper()
+        if not prefix or not prefix.isalpha() or self.game.is_over():
+            self.completer.popup().hide()
+            return
+        with profiler.section('Logic.show_completions'):
+            count, words = self.game.completions(prefix)
+            kind = "possible answer" if self.game.helper else "word"
+            if count == 1:
+                self.label_error_display.setText(f"1 {kind} starts with {prefix}")
+            else:
+                self.label_error_display.setText(f"{count} {kind}s start with {prefix}")
+            self.completion_model.setStringList(words)
+            if words and words != [prefix]:
+                self.completer.setCompletionPrefix(prefix)
+                self.completer.complete()
+            else:
+                self.completer.popup().hide()
+
+
+    def show_helper_progress(self, generation: int, percent: int) -> None:
+        '''
+        Shows how far the helper task has got with its suggestions
+        :param generation: The generation of the task reporting progress
+        :param percent: How much of the ranking is done
+        '''
+        if generation == self.helper_generation:
+            self.label_helper_status.setText(f"Finding suggestions... {percent}%")
+
+
+    def show_helper_results(self, generation: int, remaining_words: list, state_path: tuple, applied: int,
+                            ranking: list, weighted) -> None:
+        '''
+        Stores and displays the results of a helper task, unless a newer task has replaced it
+        The list of possible words only loses the words that were ruled out, shows each word's new chance of being the
+            answer and is then reordered by score
+        :param generation: The generation of the finished task
+        :param remaining_words: The words that can still be the answer
+        :param state_path: The canonical helper states applied to get them
+        :param applied: How many guesses' helper info the task applied
+        :param ranking: A list of (guess, score) pairs, best first
+        :param weighted: The remaining words with their weighted statistics, narrowed by the task
+        '''
+        if generation != self.helper_generation:
+            return
+        self.helper_task = None
+        with profiler.section('Logic.show_helper_results'):
+            self.game.apply_filtered(remaining_words, state_path, applied, weighted)
+            self.possible_words_model.apply_filter(remaining_words, self.game.weighted.word_set)
+            self.possible_words_model.set_weights(self.game.weighted)
+            self.possible_words_model.sort_by_ranking(ranking)
+            suggestions = [word for word, _ in ranking[:3]]
+            tree_guess = self.game.tree_suggestion()
+            if tree_guess is not None:
+                suggestions = [f"{tree_guess} (tree)"] + [word for word in suggestions if word != tree_guess][:2]
+            self.label_helper_status.setText(f"Try: {', '.join(suggestions)}")
+
+
+    def start_analysis_task(self) -> None:
+        '''
+        Starts analyzing the turns not yet analyzed on a worker thread, unless a task is already running, in which case
+            that task starts the next one when it finishes (see show_analysis_results)
+        '''
+        if self.analysis_task is not None:
+            return
+        self.analysis_task = AnalysisTask(self.analysis_generation, self.game, not self.game.is_over())
+        self.analysis_task.signals.finished.connect(self.show_analysis_results)
+        QThreadPool.globalInstance().start(self.analysis_task)
+
+
+    def start_helper_task(self) -> None:
+        '''
+        Starts filtering the possible words and ranking suggestions on a worker thread, replacing any older task
+        '''
+        self.cancel_helper_task()
+        self.helper_task = HelperTask(self.helper_generation, self.game)
+        self.helper_task.signals.progress.connect(self.show_helper_progress)
+        self.helper_task.signals.finished.connect(self.show_helper_results)
+        self.label_helper_status.setText("Finding possible words...")
+        QThreadPool.globalInstance().start(self.helper_task)
+
+
+    def switch_word_list(self, i: int) -> None:
+        '''
+        Starts playing another word list, which is loaded from the cache of its contents (or parsed and cached the first
+            time it is used), remaking the letter grid if its words have a different length
+        If the list cannot be loaded, the error is shown and the previous list is picked again
+        :param i: The list's position in word_lists
+        '''
+        _, all_file, curated_file = self.word_lists[i]
+        try:
+            lexicon = get_lexicon(True, all_file, curated_file)
+        except (OSError, ValueError) as error:
+            QMessageBox.warning(self, "Word List", str(error))
+            self.comboBox_word_list.blockSignals(True) # Picking the previous list again must not reload it
+            self.comboBox_word_list.setCurrentIndex(self.word_list_index)
+            self.comboBox_word_list.blockSignals(False)
+            return
+        self.word_list_index = i
+        word_length = self.game.word_length
+        self.game = type(self.game)(lexicon, self.game.max_guesses, analyzed=True) # Keeps playing the adversarial mode if it was
+        if self.game.word_length != word_length:
+            for row in self.letter_array:
+                for letter in row:
+                    letter.deleteLater()
+            self.letter_array = self.make_letter_array()
+            self.appearing_group = self.make_appearing_group()
+            for widget in self.appearing_group:
+                widget.setVisible(False)
+
+
     def take_guess(self) -> None:
         '''
         Takes the user's guess and performs actions on it to progress the game
-        Prompts for a new answer if the guess is not a 5-letter English word found in the dictionary
+        Prompts for a new answer if the guess is not an English word of the game's word length found in the dictionary
         Uses guess to generate data which it displays using color-coded letters
-        Ends the gameplay loop if the answer is guessed or the maximum of 6 guesses is reached
+        Ends the gameplay loop if the answer is guessed or the maximum number of guesses is reached
         This is the main driver of gameplay progress
         '''
-        if self.guesses_made < 6: # Only 6 guesses are allowed in a game of wordle
+        if not self.game.is_over(): # Only max_guesses guesses are allowed in a game of wordle, and none after the answer is found
             guess = self.entry_guess.text().strip().upper()
-            if not guess.isalpha(): # Checking user input to make sure it is a 5-letter word
-                self.label_error_display.setText("Guesses must only contain letters.")
-            elif len(guess) != 5:
-                self.label_error_display.setText("Guesses must be 5 letters long.")
-            elif guess not in self.all_words:
-                self.label_error_display.setText(f"{guess.title()} is not an English word.")
+            error = self.game.check_guess(guess) # Checking user input to make sure it is a word of the right length
+            if error:
+                self.label_error_display.setText(error)
             else: # Reveals all pertinent widgets, gains information from guess and gives help if desired
                 self.label_error_display.setText('')
+                self.completion_timer.stop()
+                self.completer.popup().hide()
                 self.check_against_answer(guess)
                 self.label_previous_title.setVisible(True)
-                self.guess_label_group[self.guesses_made].setVisible(True)
-                for letter in self.letter_array[self.guesses_made]:
+                self.guess_label_group[self.game.guesses_made - 1].setVisible(True)
+                for letter in self.letter_array[self.game.guesses_made - 1]:
                     letter.setVisible(True)
-                if self.checkBox_helper_toggle.isChecked():
-                    self.remaining_words = self.helper_info.get_possible_words(self.remaining_words)
-                    self.all_possibilities.setText(f"Possible words:\n{'  '.join(self.remaining_words)}")
+                if self.checkBox_helper_toggle.isChecked() and not self.game.is_over():
+                    self.start_helper_task()
+                self.start_analysis_task()
                 self.entry_guess.setText('')
-                self.guesses_made += 1
-                if guess == self.answer or self.guesses_made == 6: # Ends the game
+                if self.game.is_over(): # Ends the game
+                    self.cancel_helper_task()
                     self.label_answer_title.setVisible(True) 
+                    self.label_answer.setText(self.game.answer) # The adversarial mode only settles on an answer now
                     self.label_answer.setVisible(True)
-                    self.all_possibilities.setText('')
-                    self.all_possibilities.setVisible(False)
-                    self.label_congrats_answer.setText(f"The answer was {self.answer}")
-                    if guess == self.answer:
-                        self.label_congrats_guesses.setText(f"You got it in {self.guesses_made} guesses!")
+                    for widget in self.helper_group:
+                        widget.setVisible(False)
+                    self.label_congrats_answer.setText(f"The answer was {self.game.answer}")
+                    if self.game.is_won():
+                        self.label_congrats_guesses.setText(f"You got it in {self.game.guesses_made} guesses!")
                     else:
                         self.label_congrats_guesses.setText(f"Better luck next time!")
                     self.label_congrats_answer.setVisible(True)
                     self.label_congrats_guesses.setVisible(True)
-                    with open("stats_data.txt", "r+") as file: # This file is 7 numbers separated by spaces
-                        stats = file.readline().split()
-                        stats[0] = str(int(stats[0]) + 1)
-                        stats[self.guesses_made] = str(int(stats[self.guesses_made]) + 1)
-                        file.seek(0)
-                        file.write(' '.join(stats))
\ No newline at end of file
+                    self.record_pending = True # Saved once the last turns are analyzed (see show_analysis_results)
+                    if self.game.analysis.complete(self.game.guesses):
+                        self.save_record()
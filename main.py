@@ -1,11 +1,45 @@
-from logic import *
+from game import MAX_GUESSES
+from lexicon import ALL_WORDS_FILE, CURATED_WORDS_FILE, default_answers_file, get_lexicon
+from profiling import PANEL_SHORTCUT, profiler
+import argparse
+
 
 def main():
+    parser = argparse.ArgumentParser(description="Plays Wordle")
+    parser.add_argument('--words', default=ALL_WORDS_FILE, help=f"file of every valid word (default: {ALL_WORDS_FILE})")
+    parser.add_argument('--answers', default=None, help="file of curated answers (default: "
+                        f"{CURATED_WORDS_FILE} with the standard words, otherwise every word)")
+    parser.add_argument('--max-guesses', type=int, default=None,
+                        help=f"guesses allowed per game (default: {MAX_GUESSES}, or 5 more than the number of boards)")
+    parser.add_argument('--boards', type=int, default=1, help="answers guessed at once, e.g. 4 for Quordle or 8 for Octordle")
+    parser.add_argument('--absurdle', action='store_true', help="play against an adversary that never commits to an answer")
+    parser.add_argument('--profile', action='store_true',
+                        help=f"turn the hot-path timers on and open the debug panel (also opened with {PANEL_SHORTCUT})")
+    args = parser.parse_args()
+    if args.absurdle and args.boards > 1:
+        parser.error("--absurdle plays a single board")
+    if args.profile: # Before the word lists load, so loading is timed too
+        profiler.enable()
+    answers = default_answers_file(args.words, args.answers)
+    lexicon = get_lexicon(True, args.words, answers)
+
+    # The GUI (and all of PyQt6) is only imported once the window is actually launched,
+    # so the game rules in game.py can be imported without it
+    from PyQt6.QtWidgets import QApplication
     application = QApplication([])
-    window = Logic()
+    if args.boards > 1:
+        from multilogic import MultiLogic
+        window = MultiLogic(args.boards, lexicon, args.max_guesses)
+    else:
+        from logic import Logic
+        from wordlists import find_word_lists
+        word_lists = find_word_lists(default=(args.words, answers))
+        window = Logic(lexicon, args.max_guesses or MAX_GUESSES, args.absurdle, word_lists)
     window.show()
+    if args.profile:
+        window.profile_panel.show()
     application.exec()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,180 @@
+from game import Game, filter_cached, get_recommender, get_word_index
+from lexicon import Lexicon
+from patterns import score_guess
+from profiling import timed
+from wordleinfo import WordleInfo
+import random
+import time
+
+
+def default_max_guesses(boards: int) -> int:
+    '''
+    :param boards: The number of boards in a game
+    :return: The usual guess limit for that many boards (9 for Quordle's 4 boards, 13 for Octordle's 8)
+    '''
+    return boards + 5
+
+
+class MultiGame(Game):
+    '''
+    A class containing the rules and state of a multi-board game (like Quordle or Octordle), where every guess is
+        scored against several hidden answers at once and the game is won once every answer has been guessed
+    Each board has its own helper info and remaining words; boards stop taking guesses once they are solved
+    '''
+    def __init__(self, boards: int = 4, lexicon: Lexicon = None, max_guesses: int = None) -> None:
+        '''
+        :param boards: The number of hidden answers
+        :param lexicon: The word lists to play with, which also set the word length (defaults to the standard word files)
+        :param max_guesses: How many guesses a game allows (defaults to default_max_guesses)
+        '''
+        self.boards = boards
+        super().__init__(lexicon, max_guesses or default_max_guesses(boards))
+
+    def new_game(self, curated: bool = False, helper: bool = False, answers: list = None, hard: bool = False) -> None:
+        '''
+        Sets up the data needed to play a game
+        :param curated: Whether the answers are picked from the curated word list
+        :param helper: Whether the helper tracks the remaining possible words of each board
+        :param answers: The answers to play against, one per board (picked at random without repeats by default)
+        :param hard: Must be False, since hard mode is only played on a single board
+        '''
+        if hard:
+            raise ValueError("ValueError: Hard mode is only played on a single board")
+        self.reset(curated, helper, False)
+        if answers is None:
+            answers = random.sample(self.word_list, self.boards)
+        if len(answers) != self.boards:
+            raise ValueError(f"ValueError: A {self.boards}-board game needs {self.boards} answers")
+        self.answers = list(answers)
+        index = get_word_index(self.lexicon) if helper else None
+        self.helper_infos = [WordleInfo(index, self.word_length) for _ in range(self.boards)]
+        self.remaining_words = [self.all_words] * self.boards
+        self.state_paths = [()] * self.boards
+        self.pending_infos = [[] for _ in range(self.boards)] # Snapshots of each board's helper info not yet applied
+        self.board_colors = [[] for _ in range(self.boards)] # Colors each board showed for each guess it took
+        self.solved_at = [None] * self.boards # The guess number that solved each board
+        self.weighted = None # Boards are not weighted by the prior
+        self.analysis = None # The post-game report only covers single-board games
+
+    def possible_words(self) -> list:
+        '''
+        :return: The words that can still be the answer on any unsolved board, in word list order
+        '''
+        possible = set()
+        for board in self.unsolved():
+            possible.update(self.remaining_words[board])
+        return [word for word in self.all_words if word in possible]
+
+    def unsolved(self) -> list:
+        '''
+        :return: The numbers of the boards whose answer has not been guessed
+        '''
+        return [board for board in range(self.boards) if self.solved_at[board] is None]
+
+    @timed('MultiGame.take_guess')
+    def take_guess(self, guess: str, filter_now: bool = True) -> list:
+        '''
+        Scores an accepted guess against the answer of every unsolved board and updates their helper info
+        :param guess: The user's guess, which must have passed check_guess
+        :param filter_now: Whether to filter remaining_words now, or leave it to be done elsewhere (see pending_work)
+        :return: For each board, a list of colors ('G', 'Y' or 'X') or None if the board was already solved
+        '''
+        if self.is_over():
+            raise ValueError("ValueError: The game is already over")
+        self.guesses.append(guess)
+        self.guesses_made += 1
+        board_colors = [None] * self.boards
+        for board in self.unsolved():
+            colors = score_guess(guess, self.answers[board])
+            board_colors[board] = colors
+            self.board_colors[board].append(colors)
+            if guess == self.answers[board]:
+                self.solved_at[board] = self.guesses_made
+            if self.helper:
+                self.helper_infos[board].process_input_info(guess, colors)
+                self.pending_infos[board].append(self.helper_infos[board].copy())
+        if self.helper and filter_now:
+            self.apply_filtered(*self.filter_pending(*self.pending_work(), self.lexicon))
+        return board_colors
+
+    def pending_work(self) -> tuple:
+        '''
+        Gets everything needed to bring every board's remaining words up to date
+        :return: (the current remaining words, snapshots of helper info not yet applied and the canonical states
+            applied so far, each as one entry per board)
+        '''
+        return list(self.remaining_words), [list(infos) for infos in self.pending_infos], list(self.state_paths)
+
+    @staticmethod
+    def filter_pending(remaining_words: list, infos: list, state_paths: list, lexicon: Lexicon = None) -> tuple:
+        '''
+        Applies each board's snapshots of helper info to that board's remaining words (see Game.filter_pending)
+        :param remaining_words: Each board's words before its snapshots
+        :param infos: Each board's snapshots from pending_work
+        :param state_paths: Each board's canonical states applied to get its remaining words
+        :param lexicon: The lexicon the words come from (defaults to the standard word files)
+        :return: (each board's filtered words, each board's new state path, how many snapshots each board applied)
+        '''
+        remaining_words, state_paths = list(remaining_words), list(state_paths)
+        for board, board_infos in enumerate(infos):
+            for info in board_infos:
+                remaining_words[board], state_paths[board] = filter_cached(remaining_words[board], info,
+                                                                           state_paths[board], lexicon)
+        return remaining_words, state_paths, [len(board_infos) for board_infos in infos]
+
+    def apply_filtered(self, remaining_words: list, state_paths: list, applied: list) -> None:
+        '''
+        Stores the result of filter_pending
+        :param remaining_words: Each board's filtered words
+        :param state_paths: Each board's canonical states applied to get them
+        :param applied: How many pending snapshots each board applied
+        '''
+        self.remaining_words = remaining_words
+        self.state_paths = state_paths
+        for board, n in enumerate(applied):
+            del self.pending_infos[board][:n]
+
+    def is_won(self) -> bool:
+        '''
+        :return: Whether every board has been solved
+        '''
+        return all(solved is not None for solved in self.solved_at)
+
+    def record(self) -> dict:
+        '''
+        Describes the game
+        :return: The answers, each guess, the colors each board showed, when each board was solved, when the game
+            started and finished and which settings were used
+        '''
+        return {'answers': self.answers, 'guesses': list(self.guesses),
+                'patterns': [[''.join(colors) for colors in board] for board in self.board_colors],
+                'solved_at': self.solved_at, 'won': self.is_won(), 'helper': self.helper, 'curated': self.curated,
+                'started': self.started, 'finished': time.time()}
+
+    def suggestions(self, top_n: int = 3) -> list:
+        '''
+        A board with a single possible answer is solved for certain by guessing it, so those answers come first,
+            followed by the guesses with the best combined score over every unsolved board
+        :param top_n: How many guesses to suggest
+        :return: The best next guesses, best first
+        '''
+        boards = [self.remaining_words[board] for board in self.unsolved()]
+        return combine_suggestions(boards, get_recommender(self.lexicon).rank_boards(boards, top_n), top_n)
+
+    def tree_suggestion(self) -> str:
+        '''
+        The decision tree only covers single-board games
+        :return: None
+        '''
+        return None
+
+
+def combine_suggestions(boards: list, ranking: list, top_n: int = 3) -> list:
+    '''
+    :param boards: The words that can still be the answer on each unsolved board
+    :param ranking: A list of (guess, score) pairs from Recommender.rank_boards, best first
+    :param top_n: How many guesses to suggest
+    :return: Certain solves (the only word left on a board) followed by the best-ranked guesses, without repeats
+    '''
+    certain = [words[0] for words in boards if len(words) == 1]
+    return list(dict.fromkeys(certain + [word for word, _ in ranking]))[:top_n]
@@ -0,0 +1,204 @@
+from PyQt6.QtCore import QThreadPool
+from PyQt6.QtWidgets import *
+from lexicon import Lexicon
+from logic import COLOR_STYLES
+from multiboard import MultiGame, combine_suggestions
+from profilepanel import install_profile_panel
+from profiling import profiler
+from workers import MultiHelperTask
+
+
+class MultiLogic(QMainWindow):
+    '''
+    A class containing the GUI for multi-board games; the game rules live in multiboard.MultiGame.
+    The window is built in code, since the number of boards, letters and guesses is only known when it is opened.
+    '''
+    def __init__(self, boards: int = 4, lexicon: Lexicon = None, max_guesses: int = None) -> None:
+        '''
+        Initializes the GUI object, one grid of letters per board and the helper's status label.
+        :param boards: The number of hidden answers
+        :param lexicon: The word lists to play with, which also set the word length (defaults to the standard word files)
+        :param max_guesses: How many guesses a game allows (defaults to multiboard.default_max_guesses)
+        '''
+        super().__init__()
+        self.setWindowTitle("Wordle")
+        self.game = MultiGame(boards, lexicon, max_guesses)
+        self.helper_generation = 0 # Identifies the newest helper task so results from stale tasks are ignored
+        self.helper_task = None
+
+        central = QWidget(parent=self)
+        layout = QVBoxLayout(central)
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Enter Guess:"))
+        self.entry_guess = QLineEdit()
+        controls.addWidget(self.entry_guess)
+        self.guess_button = QPushButton("Guess")
+        controls.addWidget(self.guess_button)
+        self.checkBox_helper_toggle = QCheckBox("Enable Helper")
+        controls.addWidget(self.checkBox_helper_toggle)
+        self.checkBox_curation_toggle = QCheckBox("Use Curated Word List")
+        controls.addWidget(self.checkBox_curation_toggle)
+        self.new_game_button = QPushButton("New Game")
+        controls.addWidget(self.new_game_button)
+        layout.addLayout(controls)
+        self.label_error_display = QLabel()
+        layout.addWidget(self.label_error_display)
+        self.label_helper_status = QLabel()
+        layout.addWidget(self.label_helper_status)
+        self.board_boxes, self.letter_arrays = self.make_boards(layout)
+        self.setCentralWidget(central)
+        self.profile_panel = install_profile_panel(self)
+
+        self.guess_button.clicked.connect(self.take_guess)
+        self.entry_guess.returnPressed.connect(self.take_guess)
+        self.new_game_button.clicked.connect(self.initialize_gamestate)
+
+        self.initialize_gamestate()
+
+
+    def cancel_helper_task(self) -> None:
+        '''
+        Stops any running helper task and makes sure nothing it has already posted is shown
+        '''
+        self.helper_generation += 1
+        if self.helper_task is not None:
+            self.helper_task.cancel()
+            self.helper_task = None
+
+
+    def initialize_gamestate(self) -> None:
+        '''
+        Starts a new game with the current settings and clears every board
+        '''
+        self.cancel_helper_task()
+        self.game.new_game(self.checkBox_curation_toggle.isChecked(), self.checkBox_helper_toggle.isChecked())
+        for letter_array in self.letter_arrays:
+            for row in letter_array:
+                for letter in row:
+                    letter.setText('')
+        self.label_error_display.setText('')
+        self.label_helper_status.setText('')
+        self.entry_guess.setText('')
+        self.show_board_titles()
+
+
+    def make_boards(self, layout: QVBoxLayout) -> tuple:
+        '''
+        Creates a grid of letter labels for every board, with the boards laid out in two rows
+        :param layout: The window's layout the boards are added to
+        :return: The group box of each board, and for each board an array of label widgets where each row is a
+            guessed word and each column is a letter in that word
+        '''
+        boards_grid = QGridLayout()
+        columns = (self.game.boards + 1) // 2
+        board_boxes = []
+        letter_arrays = []
+        for board in range(self.game.boards):
+            box = QGroupBox()
+            grid = QGridLayout(box)
+            grid.setSpacing(2)
+            letter_array = []
+            for row in range(self.game.max_guesses):
+                group = []
+                for column in range(self.game.word_length):
+                    letter = QLabel()
+                    letter.setFixedSize(16, 16)
+                    grid.addWidget(letter, row, column)
+                    group.append(letter)
+                letter_array.append(group)
+            boards_grid.addWidget(box, board // columns, board % columns)
+            board_boxes.append(box)
+            letter_arrays.append(letter_array)
+        layout.addLayout(boards_grid)
+        return board_boxes, letter_arrays
+
+
+    def show_board_titles(self) -> None:
+        '''
+        Titles each board with its number and either when it was solved or, with the helper, how many words remain
+        '''
+        for board, box in enumerate(self.board_boxes):
+            title = f"Board {board + 1}"
+            if self.game.solved_at[board] is not None:
+                title += f" (solved in {self.game.solved_at[board]})"
+            elif self.game.is_over():
+                title += f" ({self.game.answers[board]})"
+            elif self.game.helper:
+                title += f" ({len(self.game.remaining_words[board])} left)"
+            box.setTitle(title)
+
+
+    def show_helper_progress(self, generation: int, percent: int) -> None:
+        '''
+        Shows how far the helper task has got with its suggestions
+        :param generation: The generation of the task reporting progress
+        :param percent: How much of the ranking is done
+        '''
+        if generation == self.helper_generation:
+            self.label_helper_status.setText(f"Finding suggestions... {percent}%")
+
+
+    def show_helper_results(self, generation: int, remaining_words: list, state_paths: list, applied: list,
+                            ranking: list, weighted) -> None:
+        '''
+        Stores and displays the results of a helper task, unless a newer task has replaced it
+        :param generation: The generation of the finished task
+        :param remaining_words: Each board's words that can still be the answer
+        :param state_paths: Each board's canonical helper states applied to get them
+        :param applied: How many guesses' helper info the task applied to each board
+        :param ranking: A list of (guess, combined score) pairs over the unsolved boards, best first
+        :param weighted: Always None, since boards are not weighted
+        '''
+        if generation != self.helper_generation:
+            return
+        self.helper_task = None
+        with profiler.section('MultiLogic.show_helper_results'):
+            self.game.apply_filtered(remaining_words, state_paths, applied)
+            boards = [remaining_words[board] for board in self.game.unsolved()]
+            self.label_helper_status.setText(f"Try: {', '.join(combine_suggestions(boards, ranking))}")
+            self.show_board_titles()
+
+
+    def start_helper_task(self) -> None:
+        '''
+        Starts filtering every board and ranking suggestions on a worker thread, replacing any older task
+        '''
+        self.cancel_helper_task()
+        self.helper_task = MultiHelperTask(self.helper_generation, self.game)
+        self.helper_task.signals.progress.connect(self.show_helper_progress)
+        self.helper_task.signals.finished.connect(self.show_helper_results)
+        self.label_helper_status.setText("Finding possible words...")
+        QThreadPool.globalInstance().start(self.helper_task)
+
+
+    def take_guess(self) -> None:
+        '''
+        Takes the user's guess, colors it on every board that has not been solved and ends the game once every board
+            is solved or the maximum number of guesses is reached
+        '''
+        if self.game.is_over():
+            return
+        guess = self.entry_guess.text().strip().upper()
+        error = self.game.check_guess(guess)
+        if error:
+            self.label_error_display.setText(error)
+            return
+        self.label_error_display.setText('')
+        row = self.game.guesses_made
+        with profiler.section('MultiLogic.color_boards'):
+            for board, colors in enumerate(self.game.take_guess(guess, filter_now=False)):
+                if colors is None: # The board was solved by an earlier guess
+                    continue
+                for i, letter in enumerate(guess):
+                    self.letter_arrays[board][row][i].setText(letter)
+                    self.letter_arrays[board][row][i].setStyleSheet(COLOR_STYLES[colors[i]])
+        self.entry_guess.setText('')
+        if self.game.is_over():
+            self.cancel_helper_task()
+            if self.game.is_won():
+                self.label_helper_status.setText(f"You got them all in {self.game.guesses_made} guesses!")
+            else:
+                self.label_helper_status.setText("Better luck next time!")
+        elif self.game.helper:
+            self.start_helper_task()
+        self.show_board_titles()
@@ -0,0 +1,243 @@
+from array import array
+from profiling import profiler, timed
+import hashlib
+import mmap
+import os
+import sys
+
+
+CACHE_DIR = "wordle_cache"
+COLOR_DIGITS = {'X': 0, 'Y': 1, 'G': 2}
+DIGIT_COLORS = ['X', 'Y', 'G']
+
+
+def score_guess(guess: str, answer: str) -> list:
+    '''
+    Scores a guess against an answer using the Wordle coloring rules, including the rules for duplicate letters
+    Green (G) is a correct letter in the correct place, yellow (Y) is a correct letter in the wrong place and
+        gray (X) is a letter that is not in the answer (or has already been accounted for by other greens and yellows)
+    :param guess: The word guessed by the user
+    :param answer: The answer the guess is checked against
+    :return: A list of colors ('G', 'Y' or 'X'), one for each letter of the guess
+    '''
+    if len(guess) != len(answer):
+        raise ValueError("ValueError: Guess and answer must be the same length")
+    colors = ['X'] * len(guess)
+    guess_counts = {}
+    answer_counts = {}
+    for i, letter in enumerate(guess): # Records all instances of green placement (correct letter and placement)
+        if letter == answer[i]:
+            colors[i] = 'G'
+        elif answer[i] in answer_counts: # Counts of letters in guess and answer give information used in yellow placement
+            answer_counts[answer[i]] += 1
+        else:
+            answer_counts.update({answer[i]: 1})
+        if letter in guess_counts:
+            guess_counts[letter] += 1
+        else:
+            guess_counts.update({letter: 1})
+    for i, letter in enumerate(guess): # Records all instances of yellow placement (correct letter but incorrect placement)
+        if letter in guess_counts and letter in answer_counts and not colors[i] == 'G':
+            colors[i] = 'Y'
+            guess_counts[letter] -= 1 # Counts must be recorded for yellow placement in case of duplicate letters
+            answer_counts[letter] -= 1
+            if guess_counts[letter] <= 0:
+                del guess_counts[letter]
+            if answer_counts[letter] <= 0:
+                del answer_counts[letter]
+    return colors
+
+
+def encode_pattern(colors: list) -> int:
+    '''
+    Packs a list of colors into a single base-3 number (gray = 0, yellow = 1, green = 2, first letter is the lowest digit)
+    A five-letter pattern always fits in one byte (the largest value, all green, is 242), longer words need two
+        (see pattern_width)
+    :param colors: A list of colors ('G', 'Y' or 'X')
+    :return: The packed pattern
+    '''
+    code = 0
+    for color in reversed(colors):
+        code = code * 3 + COLOR_DIGITS[color]
+    return code
+
+
+def decode_pattern(code: int, length: int = 5) -> list:
+    '''
+    Unpacks a base-3 pattern made by encode_pattern back into a list of colors
+    :param code: The packed pattern
+    :param length: The number of letters in the pattern
+    :return: A list of colors ('G', 'Y' or 'X')
+    '''
+    colors = []
+    for _ in range(length):
+        colors.append(DIGIT_COLORS[code % 3])
+        code //= 3
+    return colors
+
+
+def pattern_width(length: int) -> int:
+    '''
+    :param length: The number of letters in a word
+    :return: How many bytes a packed pattern of that length is stored in (1 up to five letters, 2 up to ten)
+    '''
+    return 1 if 3 ** length <= 256 else 2
+
+
+def all_green(length: int) -> int:
+    '''
+    :param length: The number of letters in a word
+    :return: The packed pattern of a correct guess
+    '''
+    return 3 ** length - 1
+
+
+def word_list_hash(words: list) -> str:
+    '''
+    Makes a short hash of a word list, used to key files derived from that list
+    :param words: The word list
+    :return: A hex digest that changes whenever the words or their order change
+    '''
+    return hashlib.sha256(' '.join(words).encode()).hexdigest()[:16]
+
+
+class PatternScorer:
+    '''
+    A class that scores one guess against every word of a word list at once
+    Each answer gets one "lane" of a large integer, so every step of the coloring rules is a handful of
+        big-integer operations over the whole list instead of a loop over words
+    Lanes are as wide as a packed pattern (see pattern_width), so no lane ever carries into the next
+    '''
+    def __init__(self, words: list) -> None:
+        '''
+        Builds lane masks for the word list
+        Position lanes hold a 1 for every answer that has a letter in a position, count lanes hold a 1 for every
+            answer that has at least k copies of a letter
+        :param words: The answers patterns are computed against
+        '''
+        self.size = len(words)
+        self.width = pattern_width(len(words[0])) if words else 1
+        self.one = int.from_bytes((b'\x01' + b'\x00' * (self.width - 1)) * self.size, 'little')
+        position_bytes = {}
+        count_bytes = {}
+        for j, word in enumerate(words):
+            lane = j * self.width
+            counts = {}
+            for i, letter in enumerate(word):
+                position_bytes.setdefault((i, letter), bytearray(self.size * self.width))[lane] = 1
+                counts[letter] = counts.get(letter, 0) + 1
+            for letter, n in counts.items():
+                for k in range(1, n + 1):
+                    count_bytes.setdefault((letter, k), bytearray(self.size * self.width))[lane] = 1
+        self.position_lanes = {key: int.from_bytes(lanes, 'little') for key, lanes in position_bytes.items()}
+        self.count_lanes = {key: int.from_bytes(lanes, 'little') for key, lanes in count_bytes.items()}
+
+    def row(self, guess: str) -> bytes:
+        '''
+        Scores a guess against every answer in the word list
+        A non-green copy of a letter is yellow when the answer has at least (its rank among the guess's copies of that
+            letter) + (the number of later copies that are green) copies of the letter, which is exactly the
+            left-to-right counting done by score_guess
+        :param guess: The word being scored
+        :return: One packed pattern per answer, in word list order, each self.width bytes long (little-endian)
+        '''
+        one = self.one
+        greens = [self.position_lanes.get((i, letter), 0) for i, letter in enumerate(guess)]
+        spots = {}
+        for i, letter in enumerate(guess):
+            spots.setdefault(letter, []).append(i)
+        pattern = 0
+        for letter, indices in spots.items():
+            after = [one] # after[s] marks answers where exactly s of the later copies of the letter are green
+            for rank in range(len(indices) - 1, -1, -1):
+                i = indices[rank]
+                not_green = greens[i] ^ one
+                yellow = 0
+                for s, lanes in enumerate(after):
+                    yellow |= lanes & self.count_lanes.get((letter, rank + 1 + s), 0)
+                pattern += (yellow & not_green) * 3 ** i + greens[i] * (2 * 3 ** i)
+                after = [after[0] & not_green] + [(after[s] & not_green) | (after[s - 1] & greens[i])
+                                                  for s in range(1, len(after))] + [after[-1] & greens[i]]
+        return pattern.to_bytes(self.size * self.width, 'little')
+
+
+class PatternMatrix:
+    '''
+    A class that holds the pattern of every guess against every answer of a word list
+    The table is stored as a binary file of one packed pattern per (guess, answer) pair, keyed by a hash of the word
+        list, and is memory-mapped so it is only built once and reloading it does not copy it into memory
+    Patterns take one byte for words of up to five letters and two bytes for longer words
+    '''
+    def __init__(self, words: list, path: str = None) -> None:
+        '''
+        Opens the table for a word list, building it first if it has not been built before
+        :param words: The word list used for both guesses and answers
+        :param path: Where the table is stored (defaults to a file in the cache directory named by the list's hash)
+        '''
+        self.words = list(words)
+        self.size = len(self.words)
+        self.index = {word: i for i, word in enumerate(self.words)}
+        self.width = pattern_width(len(self.words[0])) if self.words else 1
+        if path is None:
+            path = os.path.join(CACHE_DIR, f"patterns-{word_list_hash(self.words)}.bin")
+        self.path = path
+        if not os.path.exists(self.path) or os.path.getsize(self.path) != self.size * self.size * self.width:
+            self.build()
+        with open(self.path, 'rb') as file:
+            self.table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.table)
+        if self.width == 2: # Two-byte patterns are read as unsigned shorts, which must be swapped on big-endian hosts
+            if sys.byteorder == 'little':
+                self.view = self.view.cast('H')
+            else:
+                swapped = array('H')
+                swapped.frombytes(self.table)
+                swapped.byteswap()
+                self.view = memoryview(swapped)
+
+    @timed('PatternMatrix.build')
+    def build(self) -> None:
+        '''
+        Computes every row of the table and writes it to disk
+        The table is written to a temporary file first so an interrupted build never leaves a partial table behind
+        '''
+        scorer = PatternScorer(self.words)
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'wb') as file:
+            for guess in self.words:
+                file.write(scorer.row(guess))
+        os.replace(temp_path, self.path)
+        profiler.count('patterns scored', self.size * self.size)
+
+    def pattern(self, guess: str, answer: str) -> int:
+        '''
+        Looks up the packed pattern of a guess against an answer
+        :param guess: The word guessed
+        :param answer: The answer
+        :return: The packed pattern (see encode_pattern)
+        '''
+        return self.view[self.index[guess] * self.size + self.index[answer]]
+
+    def row(self, guess: str) -> memoryview:
+        '''
+        Gets the patterns of a guess against every answer without copying them
+        :param guess: The word guessed
+        :return: A view of one packed pattern per answer, in word list order
+        '''
+        start = self.index[guess] * self.size
+        return self.view[start:start + self.size]
+
+    def colors(self, guess: str, answer: str) -> list:
+        '''
+        Looks up the colors of a guess against an answer
+        :param guess: The word guessed
+        :param answer: The answer
+        :return: A list of colors ('G', 'Y' or 'X'), one for each letter of the guess
+        '''
+        return decode_pattern(self.pattern(guess, answer), len(guess))
+
+
+if __name__ == "__main__":
+    with open("all_five_words.txt", 'r') as f:
+        PatternMatrix(f.read().split())
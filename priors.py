@@ -0,0 +1,189 @@
+from array import array
+from collections import Counter
+from lexicon import Lexicon, get_lexicon
+import hashlib
+import math
+
+
+MAX_WEIGHT = 16 # Heaviest weight a word can have; every word weighs at least 1
+CURATED_WEIGHT = 16 # Weight of a curated answer when there is no prior file (other words weigh 1)
+
+
+def quantize(frequencies: dict, words: list) -> array:
+    '''
+    Turns word frequencies into whole-number weights from 1 to MAX_WEIGHT, evenly spaced by the logarithm of the
+        frequency, since word frequencies span many orders of magnitude
+    :param frequencies: Word: frequency (any positive number, such as a count in a corpus)
+    :param words: The word list; words without a frequency weigh 1
+    :return: The weight of each word, in word list order
+    '''
+    logs = [math.log(frequency) for frequency in frequencies.values() if frequency > 0]
+    if not logs:
+        return array('B', [1] * len(words))
+    low, high = min(logs), max(logs)
+    spread = (high - low) or 1.0
+    weights = array('B')
+    for word in words:
+        frequency = frequencies.get(word, 0)
+        if frequency <= 0:
+            weights.append(1)
+        else:
+            weights.append(1 + round((MAX_WEIGHT - 1) * (math.log(frequency) - low) / spread))
+    return weights
+
+
+def read_prior_file(path: str, words: list) -> array:
+    '''
+    Parses a prior file, which has one word and its frequency per line, separated by whitespace
+    :param path: The prior file
+    :param words: The word list the weights are for
+    :return: The weight of each word, in word list order (see quantize)
+    '''
+    frequencies = {}
+    with open(path, 'r') as f:
+        for n, line in enumerate(f, 1):
+            fields = line.split()
+            if not fields:
+                continue
+            try:
+                frequencies[fields[0].upper()] = float(fields[1])
+            except (IndexError, ValueError):
+                raise ValueError(f"ValueError: Line {n} of {path} must be a word and its frequency")
+    return quantize(frequencies, words)
+
+
+class Prior:
+    '''
+    A class that holds how likely each word is to be the answer before any guess, as small whole-number weights
+    Whole numbers let a weighted count be a plain count over a list in which each word appears as many times as its
+        weight, which is how the recommender scores guesses by weighted buckets at the same speed as unweighted ones
+    '''
+    def __init__(self, words: list, weights: array) -> None:
+        '''
+        :param words: The full word list
+        :param weights: The weight of each word, in word list order, each from 1 to MAX_WEIGHT
+        '''
+        self.words = words
+        self.weights = weights
+        self.weight = dict(zip(words, weights))
+        self.hash = hashlib.sha256(weights.tobytes()).hexdigest()[:16] # Names files derived from the weights
+        self.everything = WeightedCandidates.of(self, words) # Every game starts here, so it is only added up once
+
+    @classmethod
+    def derived(cls, lexicon: Lexicon) -> 'Prior':
+        '''
+        Makes the prior used when a list has no prior file: curated answers weigh CURATED_WEIGHT and other words 1,
+            since the curated answers are the common words real answers are picked from
+        :param lexicon: The word lists
+        :return: The prior
+        '''
+        weights = array('B', [1] * len(lexicon.words))
+        for i in lexicon.curated_indices:
+            weights[i] = CURATED_WEIGHT
+        return cls(lexicon.words, weights)
+
+
+class WeightedCandidates:
+    '''
+    A class that holds the words that can still be the answer with the weighted statistics read by the helper and
+        the recommender's pre-screening: the total weight, the weight of the words with each letter, and the weight
+        of the words with each letter in each position
+    The words are also kept as a set, made once when the words are narrowed, which the next narrowing's removed
+        words and the GUI's list of possible words are both found with
+    Narrowing makes a new object and never changes the old one, so a snapshot can be narrowed on another thread
+    '''
+    def __init__(self, prior: Prior, words: list, word_set: set, total: int, letter_mass: Counter,
+                 position_mass: Counter) -> None:
+        '''
+        :param prior: The weights
+        :param words: The words that can still be the answer
+        :param word_set: The same words as a set
+        :param total: Their total weight
+        :param letter_mass: Letter: total weight of the words containing it
+        :param position_mass: (position, letter): total weight of the words with the letter there
+        '''
+        self.prior = prior
+        self.words = words
+        self.word_set = word_set
+        self.total = total
+        self.letter_mass = letter_mass
+        self.position_mass = position_mass
+
+    @classmethod
+    def of(cls, prior: Prior, words: list) -> 'WeightedCandidates':
+        '''
+        Adds up the statistics of a set of words from scratch
+        :param prior: The weights
+        :param words: The words that can be the answer
+        :return: The words with their statistics
+        '''
+        candidates = cls(prior, words, set(words), 0, Counter(), Counter())
+        candidates.add(words, 1)
+        return candidates
+
+    def add(self, words: list, sign: int) -> None:
+        '''
+        Adds the weight of words to the statistics, or takes it away
+        :param words: The words
+        :param sign: 1 to add, -1 to take away
+        '''
+        weight = self.prior.weight
+        letter_mass, position_mass = self.letter_mass, self.position_mass
+        for word in words:
+            w = sign * weight[word]
+            self.total += w
+            for letter in set(word):
+                letter_mass[letter] += w
+            for key in enumerate(word):
+                position_mass[key] += w
+
+    def narrowed(self, remaining_words: list) -> 'WeightedCandidates':
+        '''
+        Updates the statistics for fewer words by taking away the words removed, or by adding up the words kept
+            when there are fewer of those, so the cost follows whichever changed less
+        :param remaining_words: The words left, all of which are among these words
+        :return: The remaining words with their statistics
+        '''
+        if remaining_words is self.words:
+            return self
+        removed = len(self.words) - len(remaining_words)
+        if len(remaining_words) <= removed:
+            return WeightedCandidates.of(self.prior, remaining_words)
+        kept = set(remaining_words)
+        narrowed = WeightedCandidates(self.prior, remaining_words, kept, self.total, Counter(self.letter_mass),
+                                      Counter(self.position_mass))
+        narrowed.add([word for word in self.words if word not in kept], -1)
+        return narrowed
+
+    def probability(self, word: str) -> float:
+        '''
+        :param word: One of the words
+        :return: The chance the word is the answer, by the prior
+        '''
+        return self.prior.weight[word] / self.total if self.total else 0.0
+
+    def statistics(self) -> tuple:
+        '''
+        :return: (total weight, weight by letter, weight by position and letter), as the recommender's pre-screening
+            takes them
+        '''
+        return self.total, self.letter_mass, self.position_mass
+
+
+_priors = {}
+
+
+def get_prior(lexicon: Lexicon = None) -> Prior:
+    '''
+    Gets the process-wide prior of a lexicon's full list, read from the list's prior file if it has one and derived
+        from the curated answers otherwise (see Prior.derived)
+    :param lexicon: The word lists (defaults to the standard word files)
+    :return: The shared prior
+    '''
+    lexicon = lexicon or get_lexicon()
+    if lexicon not in _priors:
+        if lexicon.prior_file is not None:
+            _priors[lexicon] = Prior(lexicon.words, read_prior_file(lexicon.prior_file, lexicon.words))
+        else:
+            _priors[lexicon] = Prior.derived(lexicon)
+    return _priors[lexicon]
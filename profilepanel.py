@@ -0,0 +1,136 @@
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QFontDatabase, QHideEvent, QKeySequence, QShortcut, QShowEvent
+from PyQt6.QtWidgets import *
+from profiling import PANEL_SHORTCUT, profiler
+
+
+REFRESH_INTERVAL = 1000 # Milliseconds between refreshes while the panel is open
+
+
+class ProfilePanel(QDialog):
+    '''
+    A debug window showing the profiler's timers, counters and histograms, which can save them as JSON or run cProfile
+        on the GUI thread (worker threads only show up in the timers)
+    '''
+    def __init__(self, parent=None) -> None:
+        '''
+        Builds the panel, which only refreshes while it is open
+        :param parent: The game window
+        '''
+        super().__init__(parent)
+        self.setWindowTitle("Profiler")
+        self.resize(760, 480)
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        self.checkBox_enabled = QCheckBox("Timers On")
+        self.checkBox_enabled.setChecked(profiler.enabled)
+        self.checkBox_enabled.toggled.connect(self.enable_timers)
+        controls.addWidget(self.checkBox_enabled)
+        self.reset_button = QPushButton("Reset")
+        self.reset_button.clicked.connect(self.reset)
+        controls.addWidget(self.reset_button)
+        self.save_button = QPushButton("Save JSON...")
+        self.save_button.clicked.connect(self.save_json)
+        controls.addWidget(self.save_button)
+        self.profile_button = QPushButton("Start cProfile")
+        self.profile_button.clicked.connect(self.toggle_profile)
+        controls.addWidget(self.profile_button)
+        controls.addStretch()
+        layout.addLayout(controls)
+        self.tabs = QTabWidget()
+        self.text_totals, self.text_histograms, self.text_profile = [self.add_tab(name) for name in
+                                                                      ("Totals", "Histograms", "cProfile")]
+        layout.addWidget(self.tabs)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def add_tab(self, name: str) -> QPlainTextEdit:
+        '''
+        :param name: The tab's title
+        :return: The tab's read-only text box, in a fixed-width font so the tables line up
+        '''
+        text = QPlainTextEdit()
+        text.setReadOnly(True)
+        text.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        text.setFont(QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont))
+        self.tabs.addTab(text, name)
+        return text
+
+    def enable_timers(self, enabled: bool) -> None:
+        '''
+        :param enabled: Whether the timers and counters are on
+        '''
+        profiler.enable(enabled)
+        self.refresh()
+
+    def hideEvent(self, event: QHideEvent) -> None:
+        '''
+        Stops refreshing once the panel is closed
+        :param event: The hide event
+        '''
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self) -> None:
+        '''
+        Shows the latest timers, counters and histograms
+        '''
+        self.text_totals.setPlainText(profiler.report())
+        self.text_histograms.setPlainText(profiler.histograms())
+
+    def reset(self) -> None:
+        '''
+        Forgets everything timed so far, so the next turn can be timed on its own
+        '''
+        profiler.reset()
+        self.refresh()
+
+    def save_json(self) -> None:
+        '''
+        Saves the timers, counters and histograms to a JSON file picked by the user
+        '''
+        path, _ = QFileDialog.getSaveFileName(self, "Save Profile", "profile.json", "JSON (*.json)")
+        if path:
+            try:
+                profiler.dump_json(path)
+            except OSError as error:
+                QMessageBox.warning(self, "Profiler", str(error))
+
+    def showEvent(self, event: QShowEvent) -> None:
+        '''
+        Refreshes the panel when it is opened and every REFRESH_INTERVAL while it stays open
+        :param event: The show event
+        '''
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def toggle_profile(self) -> None:
+        '''
+        Starts cProfile, or stops it, offers to save its statistics for pstats and shows the costliest functions
+        '''
+        if profiler.profile is None:
+            profiler.start_profile()
+            self.profile_button.setText("Stop cProfile")
+            self.text_profile.setPlainText("cProfile is running on the GUI thread...")
+            return
+        self.profile_button.setText("Start cProfile")
+        path, _ = QFileDialog.getSaveFileName(self, "Save cProfile Statistics", "profile.pstats", "pstats (*.pstats)")
+        try:
+            self.text_profile.setPlainText(profiler.stop_profile(path or None))
+        except OSError as error:
+            QMessageBox.warning(self, "Profiler", str(error))
+        self.tabs.setCurrentWidget(self.text_profile)
+
+
+def install_profile_panel(window: QWidget) -> ProfilePanel:
+    '''
+    Gives a game window a debug panel opened with PANEL_SHORTCUT
+    :param window: The game window
+    :return: The panel, which starts hidden
+    '''
+    panel = ProfilePanel(window)
+    shortcut = QShortcut(QKeySequence(PANEL_SHORTCUT), window)
+    shortcut.activated.connect(panel.show)
+    return panel
@@ -0,0 +1,238 @@
+from contextlib import nullcontext
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+
+
+PROFILE_ENV = "WORDLE_PROFILE" # Set to 1 to start every process with the timers on
+BUCKETS = 24 # Histogram buckets by powers of two of microseconds: under 1µs, under 2µs, ... under 4s, and longer
+TOP_FUNCTIONS = 25 # Functions listed in a cProfile summary
+PANEL_SHORTCUT = "Ctrl+Shift+D" # Opens the debug panel from any game window (see profilepanel.py)
+
+
+class Timing:
+    '''
+    A class that adds up the calls to one timed piece of code: how many, how long in total and at worst, and a
+        histogram of how long each took, so a few slow calls stand out from many fast ones
+    '''
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.histogram = [0] * BUCKETS
+
+    def add(self, seconds: float) -> None:
+        '''
+        :param seconds: How long one call took
+        '''
+        self.calls += 1
+        self.total += seconds
+        if seconds > self.worst:
+            self.worst = seconds
+        self.histogram[min(int(seconds * 1e6).bit_length(), BUCKETS - 1)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        '''
+        :param fraction: The share of calls, such as 0.5 for the median
+        :return: The upper bound of the histogram bucket holding that share of calls, in seconds (so at most twice
+            the true value)
+        '''
+        seen = 0
+        for bucket, n in enumerate(self.histogram):
+            seen += n
+            if seen >= fraction * self.calls:
+                return min((1 << bucket) / 1e6, self.worst)
+        return self.worst
+
+    def to_dict(self) -> dict:
+        '''
+        :return: The counts as plain JSON values, the histogram keyed by each bucket's upper bound in microseconds
+        '''
+        return {'calls': self.calls, 'total': self.total, 'worst': self.worst,
+                'histogram': {f"<{1 << bucket}us" if bucket < BUCKETS - 1 else "longer": n
+                              for bucket, n in enumerate(self.histogram) if n}}
+
+
+class Profiler:
+    '''
+    A class that keeps the timers and counters of the hot paths, and runs cProfile on request
+    While disabled, timed code only checks the enabled flag, so the instrumentation can stay in place for good; while
+        enabled, each timed call costs two clock reads and a lock, which is small next to anything worth timing
+    '''
+    def __init__(self, enabled: bool = False) -> None:
+        '''
+        :param enabled: Whether to start with the timers on
+        '''
+        self.enabled = enabled
+        self.timings = {}
+        self.counters = {}
+        self.started = time.perf_counter()
+        self.lock = threading.Lock() # Helper and analysis tasks run timed code on worker threads
+        self.profile = None
+
+    def enable(self, enabled: bool = True) -> None:
+        '''
+        :param enabled: Whether to turn the timers and counters on or off (what they have counted is kept)
+        '''
+        self.enabled = enabled
+
+    def record(self, name: str, seconds: float) -> None:
+        '''
+        :param name: The timed code
+        :param seconds: How long one call took
+        '''
+        with self.lock:
+            timing = self.timings.get(name)
+            if timing is None:
+                timing = self.timings[name] = Timing()
+            timing.add(seconds)
+
+    def count(self, name: str, n: int = 1) -> None:
+        '''
+        :param name: The counted event
+        :param n: How many times it happened
+        '''
+        if self.enabled:
+            with self.lock:
+                self.counters[name] = self.counters.get(name, 0) + n
+
+    def section(self, name: str):
+        '''
+        Times a block of code, as in "with profiler.section('name'):"
+        :param name: The timed code
+        :return: A context manager, which does nothing while the timers are off
+        '''
+        return _Section(self, name) if self.enabled else _NO_SECTION
+
+    def reset(self) -> None:
+        '''
+        Forgets everything timed and counted so far
+        '''
+        with self.lock:
+            self.timings = {}
+            self.counters = {}
+            self.started = time.perf_counter()
+
+    def snapshot(self) -> dict:
+        '''
+        :return: Every timer and counter as plain JSON values, with the seconds since they were last reset
+        '''
+        with self.lock:
+            return {'seconds': time.perf_counter() - self.started, 'enabled': self.enabled,
+                    'timings': {name: timing.to_dict() for name, timing in self.timings.items()},
+                    'counters': dict(self.counters)}
+
+    def report(self) -> str:
+        '''
+        :return: A table of the timers, most total time first, followed by the counters
+        '''
+        with self.lock:
+            timings = sorted(self.timings.items(), key=lambda item: item[1].total, reverse=True)
+            counters = sorted(self.counters.items())
+            lines = [f"{'timer':<34}{'calls':>8}{'total ms':>11}{'mean µs':>10}{'p50 µs':>9}{'p95 µs':>9}{'worst µs':>10}"]
+            for name, timing in timings:
+                lines.append(f"{name:<34}{timing.calls:>8}{timing.total * 1e3:>11.1f}"
+                             f"{timing.total / timing.calls * 1e6:>10.1f}{timing.percentile(0.5) * 1e6:>9.0f}"
+                             f"{timing.percentile(0.95) * 1e6:>9.0f}{timing.worst * 1e6:>10.0f}")
+        if counters:
+            lines.append('')
+            lines += [f"{name:<34}{n:>8}" for name, n in counters]
+        if not self.enabled:
+            lines.append(f"\nTimers are off (set {PROFILE_ENV}=1 or turn them on in the debug panel)")
+        return '\n'.join(lines)
+
+    def histograms(self) -> str:
+        '''
+        :return: Each timer's histogram as a row of bars, one per power-of-two bucket of microseconds
+        '''
+        with self.lock:
+            timings = sorted(self.timings.items(), key=lambda item: item[1].total, reverse=True)
+            lines = []
+            for name, timing in timings:
+                lines.append(name)
+                most = max(timing.histogram)
+                for bucket, n in enumerate(timing.histogram):
+                    if n:
+                        label = f"<{1 << bucket}µs" if bucket < BUCKETS - 1 else "longer"
+                        lines.append(f"  {label:>10} {n:>8} {'#' * max(1, round(30 * n / most))}")
+        return '\n'.join(lines)
+
+    def dump_json(self, path: str) -> None:
+        '''
+        Writes the snapshot to a file, replacing it only once it is complete
+        :param path: The JSON file
+        '''
+        with open(path + '.tmp', 'w') as f:
+            json.dump(self.snapshot(), f, indent=1)
+        os.replace(path + '.tmp', path)
+
+    def start_profile(self) -> None:
+        '''
+        Starts cProfile on the calling thread, which sees every function call there, not just the timed ones
+        '''
+        if self.profile is not None:
+            raise ValueError("ValueError: cProfile is already running")
+        self.profile = cProfile.Profile()
+        self.profile.enable()
+
+    def stop_profile(self, path: str = None) -> str:
+        '''
+        Stops cProfile, optionally saving its statistics for pstats or a viewer such as snakeviz
+        :param path: The file to save the statistics to (not saved by default)
+        :return: The functions that took the most time including their callees
+        '''
+        if self.profile is None:
+            raise ValueError("ValueError: cProfile is not running")
+        profile, self.profile = self.profile, None
+        profile.disable()
+        if path is not None:
+            profile.dump_stats(path)
+        out = io.StringIO()
+        pstats.Stats(profile, stream=out).sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+        return out.getvalue()
+
+
+class _Section:
+    '''
+    The context manager made by Profiler.section while the timers are on
+    '''
+    def __init__(self, profiler: Profiler, name: str) -> None:
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc) -> None:
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+
+
+_NO_SECTION = nullcontext()
+
+
+profiler = Profiler(os.environ.get(PROFILE_ENV, '') not in ('', '0'))
+
+
+def timed(name: str):
+    '''
+    Decorates a function so each call is timed under a name while the profiler is enabled
+    :param name: The name the calls are added up under
+    :return: The decorator
+    '''
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler.record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
@@ -0,0 +1,284 @@
+from collections import Counter
+from itertools import chain
+from operator import itemgetter
+from patterns import CACHE_DIR, PatternMatrix, word_list_hash
+from priors import Prior, WeightedCandidates
+import math
+import os
+
+
+SCORE_BUDGET = 2_000_000 # Most (guess, answer) pairs one ranking is allowed before guesses are pre-screened
+PROGRESS_STEP = 256
+
+
+def expected_size(bucket_sizes: list, total: int) -> float:
+    '''
+    :param bucket_sizes: How many remaining answers give each feedback pattern
+    :param total: How many answers remain
+    :return: The expected number of answers left after the guess (lower is better)
+    '''
+    return sum(n * n for n in bucket_sizes) / total
+
+
+def information_gain(bucket_sizes: list, total: int) -> float:
+    '''
+    :param bucket_sizes: How many remaining answers give each feedback pattern
+    :param total: How many answers remain
+    :return: The expected bits of information the guess reveals (higher is better)
+    '''
+    return math.log2(total) - sum(n * math.log2(n) for n in bucket_sizes) / total
+
+
+def worst_case(bucket_sizes: list, total: int) -> float:
+    '''
+    :param bucket_sizes: How many remaining answers give each feedback pattern
+    :param total: How many answers remain
+    :return: The most answers that can be left after the guess (lower is better)
+    '''
+    return max(bucket_sizes)
+
+
+METHODS = {'expected_size': (expected_size, False), 'entropy': (information_gain, True), 'minimax': (worst_case, False)}
+
+
+class Recommender:
+    '''
+    A class that ranks guesses by how well they split the remaining answers
+    Remaining answers are bucketed by the pattern each guess would show, using the precomputed pattern table so that
+        scoring a guess is one row lookup and a count
+    '''
+    def __init__(self, matrix: PatternMatrix, method: str = 'expected_size') -> None:
+        '''
+        :param matrix: The pattern table of the word list that guesses and answers come from
+        :param method: How guesses are scored ('expected_size', 'entropy' or 'minimax')
+        '''
+        if method not in METHODS:
+            raise ValueError(f"ValueError: Unknown scoring method {method}")
+        self.matrix = matrix
+        self.method = method
+        self.score, self.higher_is_better = METHODS[method]
+        self.openers = None
+
+    def answer_indexes(self, words: list) -> list:
+        '''
+        :param words: Answers that remain
+        :return: Their indexes in the pattern table, which bucket_sizes counts
+        '''
+        index = self.matrix.index
+        return [index[word] for word in words]
+
+    def bucket_sizes(self, guess: str, remaining: list) -> list:
+        '''
+        :param guess: The word being scored
+        :param remaining: Indexes (in the pattern table) of the answers that remain
+        :return: How many remaining answers give each feedback pattern
+        '''
+        row = self.matrix.row(guess)
+        if len(remaining) == self.matrix.size:
+            return list(Counter(row).values())
+        if len(remaining) == 1:
+            return [1]
+        return list(Counter(itemgetter(*remaining)(row)).values())
+
+    def rank(self, remaining_words: list, top_n: int = 5, guesses: list = None, progress=None,
+             statistics: tuple = None) -> list:
+        '''
+        Ranks guesses by how well they split the remaining answers
+        If scoring every guess would take more than SCORE_BUDGET (guess, answer) pairs, guesses are first pre-screened by
+            how evenly their letters split the remaining answers and only the best of them are scored exactly (answers
+            are counted once however they are weighted, so a weighted ranking keeps as many guesses as a plain one)
+        :param remaining_words: The words that can still be the answer
+        :param top_n: How many guesses to return (None returns every guess that was scored)
+        :param guesses: The words that may be guessed (defaults to the whole word list)
+        :param progress: Called as progress(done, total) while guesses are scored; it may raise to stop the ranking
+        :param statistics: The remaining words' letter statistics if they are already known (see letter_statistics)
+        :return: A list of (guess, score) pairs, best first
+        '''
+        if not remaining_words:
+            return []
+        if guesses is None:
+            guesses = self.matrix.words
+            if len(remaining_words) == self.matrix.size: # The opening ranking is the same every game so it is cached
+                return self.opening_ranking()[:top_n]
+        if len(remaining_words) * len(guesses) > SCORE_BUDGET:
+            keep = max(top_n or 0, SCORE_BUDGET // len(remaining_words))
+            guesses = self.prescreen(remaining_words, guesses, keep, statistics)
+        remaining = self.answer_indexes(remaining_words)
+        return self.score_guesses(guesses, remaining, set(remaining_words), progress)[:top_n]
+
+    def score_guesses(self, guesses: list, remaining: list, candidates: set, progress=None) -> list:
+        '''
+        Scores every guess exactly
+        Ties are broken in favor of guesses that could be the answer themselves
+        :param guesses: The words being scored
+        :param remaining: Indexes of the answers that remain
+        :param candidates: The words that remain, as a set
+        :param progress: Called as progress(done, total) every PROGRESS_STEP guesses
+        :return: A list of (guess, score) pairs, best first
+        '''
+        total = len(remaining)
+        sign = -1 if self.higher_is_better else 1
+        scored = []
+        for n, guess in enumerate(guesses):
+            if progress is not None and n % PROGRESS_STEP == 0:
+                progress(n, len(guesses))
+            scored.append((sign * self.score(self.bucket_sizes(guess, remaining), total), guess not in candidates, guess))
+        scored.sort()
+        return [(guess, sign * score) for score, _, guess in scored]
+
+    def rank_boards(self, boards: list, top_n: int = 5, guesses: list = None, progress=None) -> list:
+        '''
+        Ranks guesses by how well they split the remaining answers of several boards at once, scoring each guess as
+            the sum of its scores on every board (for entropy this is the information it reveals about all boards)
+        Boards with the same remaining answers are scored once and counted as many times as they appear, and the
+            patterns of a guess against every board come from a single lookup into its row
+        :param boards: The words that can still be the answer on each unsolved board
+        :param top_n: How many guesses to return (None returns every guess that was scored)
+        :param guesses: The words that may be guessed (defaults to the whole word list)
+        :param progress: Called as progress(done, total) while guesses are scored; it may raise to stop the ranking
+        :return: A list of (guess, combined score) pairs, best first
+        '''
+        groups = Counter(tuple(words) for words in boards if words)
+        if not groups:
+            return []
+        if len(groups) == 1: # Every board is in the same state, so the single-board ranking (and its cache) applies
+            words, count = next(iter(groups.items()))
+            return [(guess, score * count) for guess, score in self.rank(list(words), top_n, guesses, progress)]
+        if guesses is None:
+            guesses = self.matrix.words
+        union = list(dict.fromkeys(word for words in groups for word in words))
+        slices = []
+        concatenated = []
+        for words, count in groups.items():
+            indexes = self.answer_indexes(words)
+            slices.append((len(concatenated), len(concatenated) + len(indexes), count))
+            concatenated += indexes
+        total = len(concatenated)
+        if total * len(guesses) > SCORE_BUDGET:
+            guesses = self.prescreen(union, guesses, max(top_n or 0, SCORE_BUDGET // total))
+        lookup = itemgetter(*concatenated) # At least two boards with different words, so this always returns a tuple
+        candidates = set(union)
+        sign = -1 if self.higher_is_better else 1
+        scored = []
+        for n, guess in enumerate(guesses):
+            if progress is not None and n % PROGRESS_STEP == 0:
+                progress(n, len(guesses))
+            patterns = lookup(self.matrix.row(guess))
+            score = 0
+            for start, end, count in slices:
+                score += count * self.score(list(Counter(patterns[start:end]).values()), end - start)
+            scored.append((sign * score, guess not in candidates, guess))
+        scored.sort()
+        return [(guess, sign * score) for score, _, guess in scored][:top_n]
+
+    def letter_statistics(self, remaining_words: list) -> tuple:
+        '''
+        :param remaining_words: The words that can still be the answer
+        :return: (how many words there are, how many contain each letter, how many have each letter in each position)
+        '''
+        letter_counts = Counter()
+        position_counts = Counter()
+        for word in remaining_words:
+            letter_counts.update(set(word))
+            position_counts.update(enumerate(word))
+        return len(remaining_words), letter_counts, position_counts
+
+    def prescreen(self, remaining_words: list, guesses: list, keep: int, statistics: tuple = None) -> list:
+        '''
+        Cheaply estimates how useful each guess is from letter frequencies among the remaining answers
+        A letter is most useful when it is in about half of the remaining answers
+        :param remaining_words: The words that can still be the answer
+        :param guesses: The words being considered
+        :param keep: How many guesses to keep
+        :param statistics: The result of letter_statistics for the remaining words, if it is already known
+        :return: The guesses with the best estimates
+        '''
+        total, letter_counts, position_counts = statistics or self.letter_statistics(remaining_words)
+        estimates = []
+        for guess in guesses:
+            estimate = 0
+            for letter in set(guess):
+                n = letter_counts[letter]
+                estimate += min(n, total - n)
+            for i, letter in enumerate(guess):
+                n = position_counts[(i, letter)]
+                estimate += min(n, total - n) / 2
+            estimates.append((-estimate, guess))
+        estimates.sort()
+        return [guess for _, guess in estimates[:keep]]
+
+    def opening_ranking(self) -> list:
+        '''
+        Ranks every guess against the full word list, computing the ranking once and caching it on disk
+        :return: A list of (guess, score) pairs, best first
+        '''
+        if self.openers is None:
+            path = self.opening_path()
+            if os.path.exists(path):
+                with open(path, 'r') as f:
+                    self.openers = [(guess, float(score)) for guess, score in (line.split() for line in f)]
+            else:
+                remaining = self.answer_indexes(self.matrix.words)
+                self.openers = self.score_guesses(self.matrix.words, remaining, set(self.matrix.words))
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                with open(f"{path}.tmp", 'w') as f:
+                    for guess, score in self.openers:
+                        f.write(f"{guess} {score!r}\n")
+                os.replace(f"{path}.tmp", path)
+        return self.openers
+
+    def opening_path(self) -> str:
+        '''
+        :return: Where the opening ranking is cached, named after the word list and the scoring method
+        '''
+        return os.path.join(CACHE_DIR, f"openers-{word_list_hash(self.matrix.words)}-{self.method}.txt")
+
+
+class WeightedRecommender(Recommender):
+    '''
+    A recommender that scores guesses as if some answers were more likely than others, by a prior (see priors.py)
+    Each answer is counted as many times as its weight, so a bucket's size is the total weight of its answers and
+        every scoring method becomes its weighted form (entropy becomes the expected information by the prior)
+        while scoring stays one row lookup and a count
+    '''
+    def __init__(self, matrix: PatternMatrix, prior: Prior, method: str = 'entropy') -> None:
+        '''
+        :param matrix: The pattern table of the word list that guesses and answers come from
+        :param prior: The weight of each word of the same list
+        :param method: How guesses are scored ('expected_size', 'entropy' or 'minimax')
+        '''
+        super().__init__(matrix, method)
+        self.prior = prior
+        self.copies = [(i,) * weight for i, weight in enumerate(prior.weights)] # Each index repeated by its word's weight
+
+    def answer_indexes(self, words: list) -> list:
+        '''
+        :param words: Answers that remain
+        :return: Their indexes in the pattern table, each repeated as many times as the word's weight
+        '''
+        index, copies = self.matrix.index, self.copies
+        return list(chain.from_iterable(copies[index[word]] for word in words))
+
+    def bucket_sizes(self, guess: str, remaining: list) -> list:
+        '''
+        :param guess: The word being scored
+        :param remaining: Indexes from answer_indexes
+        :return: The total weight of the remaining answers that give each feedback pattern
+        '''
+        if len(remaining) == 1:
+            return [1]
+        return list(Counter(itemgetter(*remaining)(self.matrix.row(guess))).values())
+
+    def letter_statistics(self, remaining_words: list) -> tuple:
+        '''
+        :param remaining_words: The words that can still be the answer
+        :return: (their total weight, the weight of the words with each letter, the weight of the words with each
+            letter in each position)
+        '''
+        return WeightedCandidates.of(self.prior, remaining_words).statistics()
+
+    def opening_path(self) -> str:
+        '''
+        :return: Where the opening ranking is cached, named after the word list, the scoring method and the weights
+        '''
+        return os.path.join(CACHE_DIR, f"openers-{word_list_hash(self.matrix.words)}-{self.method}-{self.prior.hash}.txt")
@@ -0,0 +1,120 @@
+from collections import Counter
+from recommender import METHODS
+
+
+def reference_score(guess: str, answer: str) -> list:
+    '''
+    The coloring rules exactly as Logic.check_against_answer first implemented them, without the widget updates
+    :param guess: The word guessed
+    :param answer: The answer
+    :return: A list of colors ('G', 'Y' or 'X'), one for each letter of the guess
+    '''
+    if len(guess) != len(answer):
+        raise ValueError("ValueError: Guess and answer must be the same length")
+    colors = ['X'] * len(guess) # The original was written for five letters: ['X', 'X', 'X', 'X', 'X']
+    guess_counts = {}
+    answer_counts = {}
+    for i, letter in enumerate(guess):
+        green_round = False
+        if letter == answer[i]:
+            colors[i] = 'G'
+            green_round = True
+        if letter in guess_counts:
+            guess_counts[letter] += 1
+        else:
+            guess_counts.update({letter: 1})
+        if not green_round:
+            if answer[i] in answer_counts:
+                answer_counts[answer[i]] += 1
+            else:
+                answer_counts.update({answer[i]: 1})
+    for i, letter in enumerate(guess):
+        if letter in guess_counts and letter in answer_counts and not colors[i] == 'G':
+            colors[i] = 'Y'
+            guess_counts[letter] -= 1
+            answer_counts[letter] -= 1
+            if guess_counts[letter] <= 0:
+                del guess_counts[letter]
+            if answer_counts[letter] <= 0:
+                del answer_counts[letter]
+    return colors
+
+
+class ReferenceInfo:
+    '''
+    The helper info exactly as WordleInfo first implemented it, with no index, caching or compact forms
+    '''
+    def __init__(self, word_length: int = 5) -> None:
+        self.green = ['_'] * word_length
+        self.yellow = {}
+        self.black = []
+
+    def check_against_info(self, word: str) -> bool:
+        for letter in self.black:
+            n = 0
+            for i in self.green:
+                if i == letter:
+                    n += 1
+            if letter in self.yellow:
+                n += len(self.yellow[letter])
+            if word.count(letter) > n:
+                return False
+        for i, letter in enumerate(self.green):
+            if letter != '_' and letter != word[i]:
+                return False
+        for key, [y_duplicity, y_indices] in self.yellow.items():
+            for i in y_indices:
+                if word[i] == key:
+                    return False
+            if word.count(key) < y_duplicity + ''.join(self.green).count(key):
+                return False
+        return True
+
+    def process_input_info(self, word: str, colors: str) -> None:
+        if len(word) != len(colors):
+            raise ValueError("ValueError: Word and colors must be of the same length")
+        dupe_info = {}
+        for letter in self.yellow:
+            dupe_info.update({letter: 0})
+        for i, letter in enumerate(word):
+            if colors[i] == 'G':
+                self.green[i] = letter
+                if letter in self.yellow:
+                    self.yellow[letter][0] -= 1
+            elif colors[i] == 'Y':
+                if letter in self.yellow:
+                    self.yellow[letter][1].append(i)
+                    dupe_info[letter] += 1
+                else:
+                    self.yellow.update({letter: [0, [i]]})
+                    dupe_info.update({letter: 1})
+            elif letter not in self.black:
+                self.black.append(letter)
+        for letter, n in dupe_info.items():
+            self.yellow[letter][0] = max(n, self.yellow[letter][0])
+        for letter, val in self.yellow.copy().items():
+            if val[0] == 0:
+                del self.yellow[letter]
+
+    def get_possible_words(self, all_words: list) -> list:
+        return [word for word in all_words if self.check_against_info(word)]
+
+
+def reference_scores(guesses: list, remaining_words: list, method: str) -> dict:
+    '''
+    :param guesses: The guesses to score
+    :param remaining_words: The answers still possible
+    :param method: One of recommender.METHODS
+    :return: Each guess's score, bucketing the remaining answers with reference_score
+    '''
+    score, _ = METHODS[method]
+    return {guess: score(list(Counter(''.join(reference_score(guess, answer)) for answer in remaining_words).values()),
+                         len(remaining_words)) for guess in guesses}
+
+
+def has_repeats(word: str) -> bool:
+    '''
+    :param word: A word
+    :return: Whether it uses a letter more than once, which is where the coloring rules are subtle
+    '''
+    return len(set(word)) < len(word)
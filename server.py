@@ -0,0 +1,337 @@
+from collections import OrderedDict
+from absurdle import AbsurdleGame
+from game import Game
+from lexicon import get_lexicon
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import asyncio
+import json
+import secrets
+import time
+import traceback
+
+
+MAX_BODY = 4096 # Largest request body accepted, since every request is a few small JSON fields
+SWEEP_INTERVAL = 30 # Seconds between passes that drop expired sessions
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    '''
+    Raised while handling a request to answer it with an error status and message
+    '''
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Session:
+    '''
+    One player's game, with a lock so that requests for the same game are handled one at a time
+    '''
+    def __init__(self, game: Game, now: float) -> None:
+        '''
+        :param game: The player's game, which shares the process-wide lexicon, index and pattern table
+        :param now: When the session was last used
+        '''
+        self.game = game
+        self.lock = asyncio.Lock()
+        self.last_used = now
+
+
+class SessionStore:
+    '''
+    A class that keeps sessions in memory in least recently used order
+    A session is dropped once it has not been used for ttl seconds, or when a new session needs room and it is the
+        least recently used; since sessions are kept in order of last use, expired sessions are always at the front
+    '''
+    def __init__(self, max_sessions: int = 10000, ttl: float = 1800, clock=time.monotonic) -> None:
+        '''
+        :param max_sessions: The most sessions kept at once
+        :param ttl: Seconds a session is kept without being used
+        :param clock: Gives the current time in seconds
+        '''
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.clock = clock
+        self.sessions = OrderedDict()
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def create(self, game: Game) -> str:
+        '''
+        :param game: The new session's game
+        :return: The new session's id
+        '''
+        self.sweep()
+        while len(self.sessions) >= self.max_sessions:
+            self.sessions.popitem(last=False)
+            self.evicted += 1
+        session_id = secrets.token_hex(8)
+        self.sessions[session_id] = Session(game, self.clock())
+        self.created += 1
+        return session_id
+
+    def get(self, session_id: str) -> Session:
+        '''
+        :param session_id: A session's id
+        :return: The session, marked as just used, or None if it does not exist or has expired
+        '''
+        session = self.sessions.get(session_id)
+        if session is None:
+            return None
+        now = self.clock()
+        if now - session.last_used > self.ttl:
+            del self.sessions[session_id]
+            self.expired += 1
+            return None
+        session.last_used = now
+        self.sessions.move_to_end(session_id)
+        return session
+
+    def sweep(self) -> None:
+        '''
+        Drops every expired session, stopping at the first session that has not expired
+        '''
+        cutoff = self.clock() - self.ttl
+        while self.sessions:
+            session_id, session = next(iter(self.sessions.items()))
+            if session.last_used > cutoff:
+                break
+            del self.sessions[session_id]
+            self.expired += 1
+
+    def stats(self) -> dict:
+        '''
+        :return: The store's counters and current size
+        '''
+        return {'sessions': len(self.sessions), 'created': self.created, 'expired': self.expired,
+                'evicted': self.evicted}
+
+
+class WordleServer:
+    '''
+    A class that serves Wordle games over HTTP with JSON bodies, with the same rules the GUI uses (game.Game)
+    Routes:
+        POST /games                         starts a game, body {"curated": bool, "helper": bool, "hard": bool,
+                                            "absurdle": bool} (all optional; hard requires every guess to use
+                                            the hints revealed so far, absurdle plays the adversarial mode in
+                                            absurdle.py)
+        POST /games/<id>/guesses            takes a guess, body {"guess": "CRANE"}
+        GET  /games/<id>/suggestions?n=3    suggests next guesses (helper games only)
+        GET  /stats                         session counters
+    Connections are kept alive between requests; making games, taking guesses and ranking suggestions run on a
+        thread so they do not hold up other players (the first game can load or build the pattern table)
+    '''
+    def __init__(self, store: SessionStore) -> None:
+        '''
+        :param store: Where sessions are kept
+        '''
+        self.store = store
+        self.lexicon = get_lexicon()
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        '''
+        Answers requests on one connection until the client closes it or asks for it to be closed
+        '''
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                body = None # Stays None if the request is rejected before its body is read
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    method, target, _ = request_line.decode('latin-1').split()
+                    length = int(headers.get('content-length', 0))
+                    if length > MAX_BODY:
+                        raise HTTPError(413, "Request body is too large")
+                    body = await reader.readexactly(length) if length else b''
+                    status, payload = await self.route(method, target, body)
+                except HTTPError as error:
+                    status, payload = error.status, {'error': error.message}
+                except ValueError:
+                    status, payload = 400, {'error': "Malformed request"}
+                except Exception: # Anything else is a bug, but the client still gets an answer
+                    traceback.print_exc()
+                    status, payload = 500, {'error': "Internal server error"}
+                # An unread body would be parsed as the next request, so the connection is only kept if it was read
+                keep_alive = body is not None and headers.get('connection', '').lower() != 'close'
+                data = json.dumps(payload, separators=(',', ':')).encode()
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}"
+                             f"\r\n\r\n".encode() + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def route(self, method: str, target: str, body: bytes) -> tuple:
+        '''
+        :param method: The request's HTTP method
+        :param target: The request's path and query string
+        :param body: The request's body
+        :return: (status, JSON-serializable payload)
+        '''
+        url = urlsplit(target)
+        parts = [part for part in url.path.split('/') if part]
+        if parts == ['games']:
+            self.require(method, 'POST')
+            return await self.start_game(self.parse_body(body))
+        if parts == ['stats']:
+            self.require(method, 'GET')
+            return 200, self.store.stats()
+        if len(parts) == 3 and parts[0] == 'games':
+            session = self.store.get(parts[1])
+            if session is None:
+                raise HTTPError(404, "No such game (it may have expired)")
+            if parts[2] == 'guesses':
+                self.require(method, 'POST')
+                options = self.parse_body(body)
+                async with session.lock:
+                    return await asyncio.get_running_loop().run_in_executor(None, self.take_guess, session.game,
+                                                                            options)
+            if parts[2] == 'suggestions':
+                self.require(method, 'GET')
+                top_n = int(parse_qs(url.query).get('n', ['3'])[0])
+                async with session.lock:
+                    return await self.suggest(session.game, top_n)
+        raise HTTPError(404, "No such route")
+
+    @staticmethod
+    def require(method: str, expected: str) -> None:
+        '''
+        :param method: The request's HTTP method
+        :param expected: The method the route accepts
+        '''
+        if method != expected:
+            raise HTTPError(405, f"Use {expected} for this route")
+
+    @staticmethod
+    def parse_body(body: bytes) -> dict:
+        '''
+        :param body: A request body
+        :return: The JSON object in the body (an empty body is an empty object)
+        '''
+        if not body:
+            return {}
+        data = json.loads(body)
+        if not isinstance(data, dict):
+            raise HTTPError(400, "The request body must be a JSON object")
+        return data
+
+    async def start_game(self, options: dict) -> tuple:
+        '''
+        :param options: The request body
+        :return: (201, the new game's id and settings)
+        '''
+        absurdle = bool(options.get('absurdle', False))
+        game = await asyncio.get_running_loop().run_in_executor(None, self.make_game, absurdle,
+                                                                bool(options.get('curated', False)),
+                                                                bool(options.get('helper', False)),
+                                                                bool(options.get('hard', False)))
+        session_id = self.store.create(game)
+        return 201, {'id': session_id, 'word_length': game.word_length, 'max_guesses': game.max_guesses,
+                     'helper': game.helper, 'curated': game.curated, 'hard': game.hard, 'absurdle': absurdle}
+
+    def make_game(self, absurdle: bool, curated: bool, helper: bool, hard: bool) -> Game:
+        '''
+        Starts a game without a post-game report, since nothing serves one
+        :param absurdle: Whether to play the adversarial mode
+        :param curated: Whether the answer is picked from the curated word list
+        :param helper: Whether the helper tracks the remaining possible words
+        :param hard: Whether every guess must use the hints revealed so far
+        :return: The game
+        '''
+        return (AbsurdleGame if absurdle else Game)(self.lexicon, curated=curated, helper=helper, hard=hard)
+
+    @staticmethod
+    def take_guess(game: Game, options: dict) -> tuple:
+        '''
+        :param game: The session's game
+        :param options: The request body
+        :return: (200, the guess's colors and the game's progress), with the answer once the game is over
+        '''
+        if game.is_over():
+            raise HTTPError(409, "The game is already over")
+        guess = str(options.get('guess', '')).strip().upper()
+        error = game.check_guess(guess)
+        if error:
+            raise HTTPError(400, error)
+        colors = game.take_guess(guess)
+        result = {'colors': ''.join(colors), 'guesses_made': game.guesses_made, 'over': game.is_over(),
+                  'won': game.is_won()}
+        if game.helper:
+            result['remaining'] = len(game.remaining_words)
+        if game.is_over():
+            result['answer'] = game.answer
+        return 200, result
+
+    @staticmethod
+    async def suggest(game: Game, top_n: int) -> tuple:
+        '''
+        :param game: The session's game
+        :param top_n: How many guesses to suggest
+        :return: (200, the suggested guesses, best first)
+        '''
+        if not game.helper:
+            raise HTTPError(409, "The helper is not enabled for this game")
+        if game.is_over():
+            raise HTTPError(409, "The game is already over")
+        suggestions = await asyncio.get_running_loop().run_in_executor(None, game.suggestions, max(1, min(top_n, 20)))
+        return 200, {'suggestions': suggestions}
+
+    async def sweep_forever(self) -> None:
+        '''
+        Drops expired sessions every SWEEP_INTERVAL seconds, so idle sessions do not hold memory until the store fills
+        '''
+        while True:
+            await asyncio.sleep(SWEEP_INTERVAL)
+            self.store.sweep()
+
+
+async def serve(host: str, port: int, store: SessionStore) -> None:
+    '''
+    Runs the server until it is interrupted
+    :param host: The address to listen on
+    :param port: The port to listen on
+    :param store: Where sessions are kept
+    '''
+    server = WordleServer(store)
+    listener = await asyncio.start_server(server.handle_connection, host, port)
+    sweeper = asyncio.create_task(server.sweep_forever())
+    print(f"Serving Wordle on http://{host}:{port}")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        sweeper.cancel()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serves Wordle games to many players over HTTP/JSON")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8080, help="port to listen on (default: 8080)")
+    parser.add_argument('--max-sessions', type=int, default=10000, help="most games kept in memory at once")
+    parser.add_argument('--ttl', type=float, default=1800, help="seconds an unused game is kept")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, SessionStore(args.max_sessions, args.ttl)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
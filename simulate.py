@@ -0,0 +1,299 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from game import MAX_GUESSES, filter_cached, get_allowed_guesses, get_candidate_cache, get_weighted_recommender, get_word_index
+from hardmode import HardModeRules
+from lexicon import ALL_WORDS_FILE, CURATED_WORDS_FILE, default_answers_file, get_lexicon
+from patterns import PatternMatrix, score_guess
+from recommender import Recommender
+from wordleinfo import WordleInfo
+import argparse
+import importlib
+import os
+import random
+import time
+
+
+PHASES = ['choose', 'score', 'filter']
+
+
+def read_words(curated: bool = False, all_file: str = ALL_WORDS_FILE, curated_file: str = CURATED_WORDS_FILE) -> list:
+    '''
+    Gets a word list from the shared lexicon, the same way lexicon.get_lexicon().get_words does
+    :param curated: Determines which list to use (False uses all_file, True uses curated_file)
+    :param all_file: The file of every valid word
+    :param curated_file: The file of curated answers (None lets every word be the answer)
+    :return: The shared word list
+    '''
+    return get_lexicon(True, all_file, curated_file).get_words(curated)
+
+
+class FirstStrategy:
+    '''
+    A strategy that always guesses the first word that can still be the answer
+    '''
+    def __init__(self, words: list) -> None:
+        self.words = words
+
+    def choose(self, remaining: list, guesses_made: int, allowed: list = None) -> str:
+        return remaining[0]
+
+
+class RandomStrategy:
+    '''
+    A strategy that guesses a random word that can still be the answer
+    '''
+    def __init__(self, words: list) -> None:
+        self.words = words
+        self.random = random.Random(0)
+
+    def choose(self, remaining: list, guesses_made: int, allowed: list = None) -> str:
+        return self.random.choice(remaining)
+
+
+class FrequencyStrategy:
+    '''
+    A strategy that guesses the possible word whose different letters are most common among the possible words
+    Like the other strategies that only guess possible words, it already follows hard mode, so it ignores allowed
+    '''
+    def __init__(self, words: list) -> None:
+        self.words = words
+        self.opening = None # The first guess is the same every game, so it is only worked out once
+
+    def choose(self, remaining: list, guesses_made: int, allowed: list = None) -> str:
+        if remaining is self.words and self.opening is not None:
+            return self.opening
+        counts = Counter(letter for word in remaining for letter in set(word))
+        guess = max(remaining, key=lambda word: sum(counts[letter] for letter in set(word)))
+        if remaining is self.words:
+            self.opening = guess
+        return guess
+
+
+class RecommenderStrategy:
+    '''
+    A strategy that always plays the helper's top recommendation
+    '''
+    method = 'expected_size'
+
+    def __init__(self, words: list) -> None:
+        self.words = words
+        self.recommender = Recommender(PatternMatrix(words), self.method)
+
+    def choose(self, remaining: list, guesses_made: int, allowed: list = None) -> str:
+        if len(remaining) <= 2:
+            return remaining[0]
+        return self.recommender.rank(remaining, 1, allowed)[0][0]
+
+
+class EntropyStrategy(RecommenderStrategy):
+    '''
+    A strategy that plays the guess expected to reveal the most information
+    '''
+    method = 'entropy'
+
+
+class MinimaxStrategy(RecommenderStrategy):
+    '''
+    A strategy that plays the guess whose worst case leaves the fewest possible words
+    '''
+    method = 'minimax'
+
+
+class OpenerStrategy(RecommenderStrategy):
+    '''
+    A strategy that always opens with the same well-known word, then plays the helper's top recommendation
+    '''
+    opener = 'CRANE'
+
+    def choose(self, remaining: list, guesses_made: int, allowed: list = None) -> str:
+        if guesses_made == 0 and self.opener in self.recommender.matrix.index:
+            return self.opener
+        return super().choose(remaining, guesses_made, allowed)
+
+
+class WeightedStrategy(RecommenderStrategy):
+    '''
+    A strategy that plays the helper's top recommendation, which weights answers by the word list's prior
+    '''
+    def __init__(self, words: list) -> None:
+        self.words = words
+        self.recommender = get_weighted_recommender(_worker['lexicon']) # Made after init_worker loads the lexicon
+
+
+STRATEGIES = {'first': FirstStrategy, 'random': RandomStrategy, 'frequency': FrequencyStrategy,
+              'recommender': RecommenderStrategy, 'entropy': EntropyStrategy, 'minimax': MinimaxStrategy,
+              'opener': OpenerStrategy, 'weighted': WeightedStrategy}
+
+
+def load_strategy(name: str):
+    '''
+    Finds a strategy class by name, either a built-in one or one given as module:class
+    A strategy is made with the full word list and has a choose(remaining, guesses_made) method returning a guess;
+        in hard mode choose is also passed the words hard mode allows (None when every word is allowed)
+    :param name: The strategy's name
+    :return: The strategy class
+    '''
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    if ':' not in name:
+        raise ValueError(f"ValueError: Unknown strategy {name}")
+    module, attribute = name.split(':', 1)
+    return getattr(importlib.import_module(module), attribute)
+
+
+_worker = {}
+
+
+def init_worker(strategy_name: str = None, all_file: str = ALL_WORDS_FILE, curated_file: str = CURATED_WORDS_FILE,
+                max_guesses: int = MAX_GUESSES, hard: bool = False) -> None:
+    '''
+    Loads the word list, bitset index and strategy once per worker process
+    :param strategy_name: The strategy the worker plays with (None leaves the strategy to be passed to play)
+    :param all_file: The file of every valid word
+    :param curated_file: The file of curated answers (None lets every word be the answer)
+    :param max_guesses: How many guesses a game allows
+    :param hard: Whether games are played in hard mode
+    '''
+    lexicon = get_lexicon(True, all_file, curated_file)
+    words = lexicon.get_words()
+    _worker['lexicon'] = lexicon
+    _worker['words'] = words
+    _worker['index'] = get_word_index(lexicon)
+    _worker['strategy'] = None if strategy_name is None else load_strategy(strategy_name)(words)
+    _worker['max_guesses'] = max_guesses
+    _worker['hard'] = hard
+
+
+def play_game(answer: str) -> tuple:
+    '''
+    Plays one game against an answer with the worker's strategy
+    :param answer: The hidden answer
+    :return: See play
+    '''
+    return play(answer, _worker['strategy'])
+
+
+def play(answer: str, strategy) -> tuple:
+    '''
+    Plays one game against an answer with the same rules as Logic.take_guess, with the helper enabled
+    In hard mode the strategy is given the words hard mode allows, looked up by state in the shared cache, and a
+        guess that does not use every revealed hint is an error, as is a guess outside the word list
+    :param answer: The hidden answer
+    :param strategy: The strategy to play with, made with the worker's full word list
+    :return: (answer, guesses made, whether the answer was found, time spent in each phase,
+        (worker process id, that worker's filter cache counters so far))
+    '''
+    lexicon = _worker['lexicon']
+    words = _worker['words']
+    helper_info = WordleInfo(_worker['index'], lexicon.word_length)
+    remaining = words
+    state_path = ()
+    rules = HardModeRules(lexicon.word_length) if _worker['hard'] else None
+    timings = dict.fromkeys(PHASES, 0.0)
+    guesses_made = 0
+    while guesses_made < _worker['max_guesses'] and remaining: # The helper can rule out every word, which ends the game early
+        start = time.perf_counter()
+        if rules is None:
+            guess = strategy.choose(remaining, guesses_made)
+        else:
+            guess = strategy.choose(remaining, guesses_made, get_allowed_guesses(lexicon).lookup(rules))
+        chosen = time.perf_counter()
+        if not lexicon.is_word(guess):
+            raise ValueError(f"ValueError: Strategy guessed {guess}, which is not in the word list")
+        colors = score_guess(guess, answer)
+        if rules is not None:
+            if rules.violation(guess):
+                raise ValueError(f"ValueError: Strategy guessed {guess}, which hard mode does not allow")
+            rules.update(guess, colors)
+        helper_info.process_input_info(guess, colors)
+        scored = time.perf_counter()
+        remaining, state_path = filter_cached(remaining, helper_info, state_path, lexicon)
+        filtered = time.perf_counter()
+        timings['choose'] += chosen - start
+        timings['score'] += scored - chosen
+        timings['filter'] += filtered - scored
+        guesses_made += 1
+        if guess == answer:
+            return answer, guesses_made, True, timings, (os.getpid(), get_candidate_cache(lexicon).stats())
+    return answer, guesses_made, False, timings, (os.getpid(), get_candidate_cache(lexicon).stats())
+
+
+def simulate(answers: list, strategy_name: str, workers: int = None, all_file: str = ALL_WORDS_FILE,
+             curated_file: str = CURATED_WORDS_FILE, max_guesses: int = MAX_GUESSES, hard: bool = False) -> dict:
+    '''
+    Plays a game against every answer, spreading the games over a pool of processes
+    :param answers: The answers to play against
+    :param strategy_name: The strategy to play with
+    :param workers: How many processes to use (defaults to one per core)
+    :param all_file: The file of every valid word
+    :param curated_file: The file of curated answers (None lets every word be the answer)
+    :param max_guesses: How many guesses a game allows
+    :param hard: Whether games are played in hard mode
+    :return: A report with the games played, wall time, guess-count histogram, total time per phase and
+        filter cache counters
+    '''
+    workers = workers or os.cpu_count() or 1
+    histogram = [0] * (max_guesses + 1) # Index 0 counts games that were not solved
+    phase_totals = dict.fromkeys(PHASES, 0.0)
+    cache_stats = {} # Latest filter cache counters of each worker process
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers, initializer=init_worker,
+                             initargs=(strategy_name, all_file, curated_file, max_guesses, hard)) as pool:
+        for _, guesses_made, solved, timings, (pid, stats) in pool.map(play_game, answers, chunksize=max(1, len(answers) // (workers * 8))):
+            histogram[guesses_made if solved else 0] += 1
+            cache_stats[pid] = stats
+            for phase, seconds in timings.items():
+                phase_totals[phase] += seconds
+    elapsed = time.perf_counter() - start
+    cache = {}
+    for stats in cache_stats.values():
+        for name, value in stats.items():
+            cache[name] = cache.get(name, 0) + value
+    return {'games': len(answers), 'seconds': elapsed, 'histogram': histogram, 'phases': phase_totals, 'cache': cache}
+
+
+def print_report(report: dict) -> None:
+    '''
+    Prints a simulation report
+    :param report: A report made by simulate
+    '''
+    games = report['games']
+    print(f"Games played: {games} in {report['seconds']:.2f}s ({games / report['seconds']:.1f} games/sec)")
+    max_guesses = len(report['histogram']) - 1
+    for n in range(1, max_guesses + 1):
+        print(f"Words found in {n} guess{'es' if n > 1 else ''}: {report['histogram'][n]}")
+    print(f"Words not found: {report['histogram'][0]}")
+    solved = games - report['histogram'][0]
+    if solved:
+        average = sum(n * report['histogram'][n] for n in range(1, max_guesses + 1)) / solved
+        print(f"Average guesses when found: {average:.3f}")
+    for phase, seconds in report['phases'].items():
+        print(f"Time in {phase}: {seconds:.3f}s ({seconds / games * 1000:.3f} ms/game)")
+    cache = report['cache']
+    if cache:
+        print(f"Filter cache: {cache['hits']} hits, {cache['misses']} misses, {cache['evictions']} evictions")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Plays Wordle games without the GUI and reports solver speed and results")
+    parser.add_argument('--curated', action='store_true', help="play against the curated answers instead of every word")
+    parser.add_argument('--words', default=ALL_WORDS_FILE, help=f"file of every valid word (default: {ALL_WORDS_FILE})")
+    parser.add_argument('--answers', default=None, help="file of curated answers (default: "
+                        f"{CURATED_WORDS_FILE} with the standard words, otherwise every word)")
+    parser.add_argument('--max-guesses', type=int, default=MAX_GUESSES, help=f"guesses allowed per game (default: {MAX_GUESSES})")
+    parser.add_argument('--hard', action='store_true', help="play in hard mode, where every guess must use the revealed hints")
+    parser.add_argument('--strategy', default='recommender', help=f"one of {', '.join(STRATEGIES)} or module:class")
+    parser.add_argument('--workers', type=int, default=None, help="number of processes (default: one per core)")
+    parser.add_argument('--limit', type=int, default=None, help="only play against this many randomly chosen answers")
+    parser.add_argument('--seed', type=int, default=0, help="seed used to choose answers with --limit")
+    args = parser.parse_args()
+
+    answers_file = default_answers_file(args.words, args.answers)
+    answers = read_words(args.curated, args.words, answers_file)
+    if args.limit is not None:
+        answers = random.Random(args.seed).sample(answers, min(args.limit, len(answers)))
+    print_report(simulate(answers, args.strategy, args.workers, args.words, answers_file, args.max_guesses, args.hard))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+from array import array
+from itertools import combinations
+from operator import itemgetter
+
+
+MAX_DISTANCE = 2 # Most letters a suggestion may differ by (a swap of two neighboring letters counts as one)
+
+
+def masks(length: int, distance: int = MAX_DISTANCE) -> list:
+    '''
+    :param length: The number of letters in a word
+    :param distance: The most letters that may be hidden
+    :return: The positions left visible when one to distance letters are hidden, fewest hidden first
+    '''
+    return [tuple(i for i in range(length) if i not in hidden)
+            for n in range(1, distance + 1) for hidden in combinations(range(length), n)]
+
+
+class SpellingIndex:
+    '''
+    A class that finds the valid words closest to a misspelled one without scanning the word list
+    For every way of hiding one or two letters, word indexes are kept sorted by the letters left visible, so the
+        words that differ from a guess only in the hidden letters are one binary search away; a guess is looked up
+        under every mask, closest first
+    The index is only arrays of word indexes, so it is saved in the lexicon's binary form and loaded without sorting
+    '''
+    def __init__(self, words: list, orders: list) -> None:
+        '''
+        :param words: The word list
+        :param orders: For each of masks(word length), an array of word indexes sorted by the visible letters
+        '''
+        self.words = words
+        self.length = len(words[0]) if words else 0
+        self.keys = [itemgetter(*visible) for visible in masks(self.length)]
+        self.orders = orders
+
+    @classmethod
+    def build(cls, words: list) -> 'SpellingIndex':
+        '''
+        :param words: The word list, all the same length
+        :return: The index of the list
+        '''
+        length = len(words[0]) if words else 0
+        orders = []
+        for visible in masks(length):
+            key = itemgetter(*visible)
+            orders.append(array('I', sorted(range(len(words)), key=lambda i: key(words[i]))))
+        return cls(words, orders)
+
+    def to_bytes(self) -> bytes:
+        '''
+        :return: Every sorted array, one after another
+        '''
+        return b''.join(order.tobytes() for order in self.orders)
+
+    @classmethod
+    def from_bytes(cls, words: list, data: bytes) -> 'SpellingIndex':
+        '''
+        :param words: The word list the index was built over
+        :param data: Bytes written by to_bytes
+        :return: The saved index
+        '''
+        orders = []
+        size = len(words) * array('I').itemsize
+        for n in range(len(masks(len(words[0]) if words else 0))):
+            order = array('I')
+            order.frombytes(data[n * size:(n + 1) * size])
+            orders.append(order)
+        return cls(words, orders)
+
+    def matches(self, n: int, guess: str) -> range:
+        '''
+        :param n: Which mask to look under
+        :param guess: A word
+        :return: Positions in self.orders[n] of every word whose visible letters are the guess's
+        '''
+        key, order, words = self.keys[n], self.orders[n], self.words
+        target = key(guess)
+        low, high = 0, len(order)
+        while low < high: # First word whose visible letters are not before the guess's
+            middle = (low + high) // 2
+            if key(words[order[middle]]) < target:
+                low = middle + 1
+            else:
+                high = middle
+        start, high = low, len(order)
+        while low < high: # First word whose visible letters are after the guess's
+            middle = (low + high) // 2
+            if key(words[order[middle]]) <= target:
+                low = middle + 1
+            else:
+                high = middle
+        return range(start, low)
+
+    def suggest(self, guess: str, top_n: int = 3, preferred=frozenset()) -> list:
+        '''
+        Finds the closest valid words: words one letter away, then words with two neighboring letters swapped, then
+            words two letters away, with preferred words first within each group
+        :param guess: A word of the list's length, usually one that is not in the list
+        :param top_n: How many words to return
+        :param preferred: Words to rank first within a group (such as the curated answers)
+        :return: Up to top_n words, closest first
+        '''
+        if len(guess) != self.length:
+            return []
+        found = {}
+        for n in range(self.length): # The first masks hide one letter each
+            for position in self.matches(n, guess):
+                found.setdefault(self.orders[n][position], 1)
+        for i in range(self.length - 1):
+            swapped = guess[:i] + guess[i + 1] + guess[i] + guess[i + 2:]
+            for position in self.matches(0, swapped): # A word equal to the swap is among the words matching it under any mask
+                if self.words[self.orders[0][position]] == swapped != guess:
+                    found.setdefault(self.orders[0][position], 2)
+        found = {i: rank for i, rank in found.items() if self.words[i] != guess}
+        if len(found) < top_n: # Words two letters away are only needed when closer words run short
+            for n in range(self.length, len(self.orders)):
+                for position in self.matches(n, guess):
+                    if self.words[self.orders[n][position]] != guess:
+                        found.setdefault(self.orders[n][position], 3)
+        ranked = sorted((rank, self.words[i] not in preferred, i) for i, rank in found.items())
+        return [self.words[i] for _, _, i in ranked[:top_n]]
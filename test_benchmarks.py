@@ -0,0 +1,81 @@
+from game import get_word_index
+from patterns import PatternScorer, score_guess
+from recommender import Recommender
+from reference import ReferenceInfo, reference_score, reference_scores
+from wordleinfo import WordleInfo
+import pytest
+import statistics
+import time
+
+
+ROUNDS = 20 # Timing rounds per benchmark
+
+pytestmark = pytest.mark.benchmark
+
+
+def bench(name: str, run, rounds: int = ROUNDS, operations: int = 1) -> tuple:
+    '''
+    Times a piece of work several times, in the style of pytest-benchmark
+    :param name: What is being timed
+    :param run: Does the work once
+    :param rounds: How many times to time it
+    :param operations: How many operations one run is, so times are reported per operation
+    :return: (name, min, median, mean) in microseconds per operation
+    '''
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        run()
+        times.append((time.perf_counter() - start) / operations * 1e6)
+    return name, min(times), statistics.median(times), statistics.fmean(times)
+
+
+@pytest.fixture
+def table(capsys):
+    '''
+    :return: A function that prints a timing table past pytest's output capture, slowest (reference) row first
+    '''
+    def print_table(title: str, rows: list) -> None:
+        with capsys.disabled():
+            print(f"\n{title}")
+            print(f"{'':<36}{'min us':>12}{'median us':>12}{'mean us':>12}{'vs first':>10}")
+            baseline = rows[0][2]
+            for name, low, median, mean in rows:
+                print(f"{name:<36}{low:>12.3f}{median:>12.3f}{mean:>12.3f}{baseline / median:>9.1f}x")
+    return print_table
+
+
+def test_scoring(words, answers, matrix, rng, table):
+    pairs = [(rng.choice(words), rng.choice(answers)) for _ in range(2000)]
+    scorer = PatternScorer(answers)
+    guess = rng.choice(words)
+    table("Scoring (per guess/answer pair)", [
+        bench("reference check_against_answer", lambda: [reference_score(g, a) for g, a in pairs], operations=len(pairs)),
+        bench("score_guess", lambda: [score_guess(g, a) for g, a in pairs], operations=len(pairs)),
+        bench("PatternScorer row", lambda: scorer.row(guess), operations=len(answers)),
+        bench("PatternMatrix lookup", lambda: [matrix.pattern(g, a) for g, a in pairs], operations=len(pairs)),
+    ])
+
+
+def test_filtering(words, answers, rng, table):
+    answer = rng.choice(answers)
+    reference, indexed = ReferenceInfo(), WordleInfo(get_word_index())
+    for guess in rng.sample(words, 2):
+        colors = reference_score(guess, answer)
+        reference.process_input_info(guess, colors)
+        indexed.process_input_info(guess, colors)
+    table("Filtering (per pass over the full list, after two guesses)", [
+        bench("reference WordleInfo", lambda: reference.get_possible_words(words)),
+        bench("bitset index", lambda: indexed.get_possible_words(words)),
+    ])
+
+
+def test_recommendation(words, answers, matrix, rng, table):
+    remaining_words = rng.sample(answers, 200)
+    guesses = rng.sample(words, 500)
+    recommender = Recommender(matrix)
+    table("Recommendation (per guess scored, 200 remaining answers)", [
+        bench("reference buckets", lambda: reference_scores(guesses[:50], remaining_words, 'expected_size'),
+              ROUNDS // 5, 50),
+        bench("Recommender.rank", lambda: recommender.rank(remaining_words, None, guesses), operations=len(guesses)),
+    ])
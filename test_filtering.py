@@ -0,0 +1,37 @@
+from game import Game, filter_cached, get_word_index
+from reference import ReferenceInfo, reference_score
+from wordleinfo import WordleInfo
+
+
+GAMES = 100 # Random games of 1 to 4 guesses, each filtered every way after every guess
+
+
+def test_filtering_matches_reference(words, answers, rng):
+    '''
+    Checks every way of filtering against ReferenceInfo after each guess of random games: the string check and the
+        bitset index against the reference filtering the full list, and the filter cache and deferred filtering
+        through Game against the reference filtering what the last guess left, as the game always has (the two can
+        differ, since a yellow letter's excluded positions are forgotten once it turns green)
+    '''
+    index = get_word_index()
+    for _ in range(GAMES):
+        answer = rng.choice(answers)
+        reference, plain, indexed = ReferenceInfo(), WordleInfo(), WordleInfo(index)
+        game = Game()
+        game.new_game(helper=True, answer=answer)
+        chained, cached, state_path = words, words, ()
+        for turn in range(rng.randint(1, 4)):
+            guess = rng.choice(words)
+            colors = reference_score(guess, answer)
+            for info in (reference, plain, indexed):
+                info.process_input_info(guess, colors)
+            guesses = game.guesses + [(guess, colors)]
+            expected = reference.get_possible_words(words)
+            assert plain.get_possible_words(words) == expected, guesses
+            assert indexed.get_possible_words(words) == expected, guesses
+            chained = reference.get_possible_words(chained)
+            cached, state_path = filter_cached(cached, indexed.copy(), state_path)
+            assert cached == chained, guesses
+            game.take_guess(guess, filter_now=turn % 2 == 1) # Alternates deferred and immediate filtering
+        game.apply_filtered(*game.filter_pending(*game.pending_work(), game.lexicon), len(game.pending_infos))
+        assert game.remaining_words == chained, game.guesses
@@ -0,0 +1,71 @@
+from multiboard import MultiGame
+from reference import reference_score
+import pytest
+
+
+@pytest.fixture(params=[False, True], ids=['plain', 'helper'])
+def game(request):
+    game = MultiGame(2)
+    game.new_game(False, request.param, ['CRANE', 'SLOTH'])
+    return game
+
+
+def test_check_guess(game):
+    assert game.check_guess('CRATE') == ''
+    assert game.check_guess('CR4TE') == "Guesses must only contain letters."
+    assert game.check_guess('CRATER') == "Guesses must be 5 letters long."
+    assert game.check_guess('CRATX').startswith("Cratx is not an English word.")
+    game.take_guess('CRATE')
+    assert game.check_guess('SLOTH') == '' # Multi-board games are never played in hard mode
+
+
+def test_hard_mode_is_refused(game):
+    with pytest.raises(ValueError):
+        game.new_game(hard=True)
+
+
+def test_take_guess_scores_unsolved_boards(game):
+    assert game.take_guess('CRATE') == [reference_score('CRATE', 'CRANE'), reference_score('CRATE', 'SLOTH')]
+    assert game.take_guess('CRANE') == [list('GGGGG'), reference_score('CRANE', 'SLOTH')]
+    assert game.take_guess('TOOTH') == [None, reference_score('TOOTH', 'SLOTH')]
+    assert game.solved_at == [2, None] and not game.is_over()
+    if game.helper:
+        assert game.remaining_words[0] == ['CRANE']
+        assert 'SLOTH' in game.remaining_words[1]
+        assert all(reference_score(guess, word) == colors for guess, colors in zip(game.guesses, game.board_colors[1])
+                   for word in game.remaining_words[1])
+        assert game.possible_words() == game.remaining_words[1]
+    game.take_guess('SLOTH')
+    assert game.is_won() and game.is_over()
+    assert game.record()['solved_at'] == [2, 4]
+    with pytest.raises(ValueError):
+        game.take_guess('CRATE')
+
+
+def test_deferred_filtering_matches_immediate():
+    game, immediate = MultiGame(2), MultiGame(2)
+    for each in (game, immediate):
+        each.new_game(False, True, ['CRANE', 'SLOTH'])
+    for guess in ('CRATE', 'TOOTH'):
+        game.take_guess(guess, filter_now=False)
+        immediate.take_guess(guess)
+    game.apply_filtered(*game.filter_pending(*game.pending_work(), game.lexicon))
+    assert game.remaining_words == immediate.remaining_words
+    assert game.pending_infos == [[], []]
+
+
+def test_game_runs_out_of_guesses():
+    game = MultiGame(2, max_guesses=2)
+    game.new_game(False, False, ['CRANE', 'SLOTH'])
+    game.take_guess('CRANE')
+    game.take_guess('CRATE')
+    assert game.is_over() and not game.is_won()
+
+
+def test_completions_keep_to_unsolved_boards(game):
+    game.take_guess('CRANE')
+    count, words = game.completions('S', top_n=10000)
+    assert count == len(words) and 'SLOTH' in words
+    if game.helper:
+        assert set(words) <= set(game.remaining_words[1])
+        assert game.completions('CRAN') == (0, [])
@@ -0,0 +1,38 @@
+from priors import get_prior
+from recommender import METHODS, SCORE_BUDGET, Recommender, WeightedRecommender
+from reference import reference_scores
+import pytest
+
+
+SETS = 10 # Random sets of remaining answers per method
+
+
+@pytest.mark.parametrize('method', list(METHODS))
+def test_scores_match_reference(method, words, answers, matrix, rng):
+    '''
+    Checks the recommender's scores against buckets made with reference_score over random sets of remaining answers,
+        and that multi-board scores are the sum of single-board scores
+    '''
+    recommender = Recommender(matrix, method)
+    for _ in range(SETS):
+        remaining_words = rng.sample(answers, rng.choice([2, 5, 20, 100]))
+        guesses = rng.sample(words, 40) + remaining_words[:5]
+        expected = reference_scores(guesses, remaining_words, method)
+        for guess, score in recommender.rank(remaining_words, None, guesses):
+            assert score == pytest.approx(expected[guess], rel=1e-9, abs=1e-12), guess
+        boards = [remaining_words, rng.sample(answers, 30)]
+        combined = dict(recommender.rank_boards(boards, None, guesses))
+        other = reference_scores(guesses, boards[1], method)
+        for guess in guesses:
+            assert combined[guess] == pytest.approx(expected[guess] + other[guess], rel=1e-9, abs=1e-12), guess
+
+
+def test_weighted_ranking_keeps_as_many_guesses(lexicon, words, matrix, rng):
+    '''
+    Checks that pre-screening keeps as many guesses for a weighted ranking as for a plain one, since the weights
+        repeat answers without adding any
+    '''
+    remaining_words = rng.sample(words, 2000)
+    plain = Recommender(matrix).rank(remaining_words, None)
+    weighted = WeightedRecommender(matrix, get_prior(lexicon)).rank(remaining_words, None)
+    assert len(weighted) == len(plain) == SCORE_BUDGET // len(remaining_words)
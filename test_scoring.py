@@ -0,0 +1,48 @@
+from patterns import PatternScorer, decode_pattern, encode_pattern, pattern_width, score_guess
+from reference import has_repeats, reference_score
+import pytest
+
+
+PAIRS = 20000 # Random guess/answer pairs, half of them between words that repeat a letter
+
+
+def check_pairs(guesses: list, answers: list, matrix) -> None:
+    '''
+    Checks score_guess, the pattern encoding, the pattern table and the lane scorer against reference_score for
+        every guess against every answer
+    '''
+    scorer = PatternScorer(answers)
+    width = pattern_width(len(answers[0]))
+    for guess in guesses:
+        row = scorer.row(guess)
+        for j, answer in enumerate(answers):
+            colors = reference_score(guess, answer)
+            assert score_guess(guess, answer) == colors, (guess, answer)
+            assert matrix.colors(guess, answer) == colors, (guess, answer)
+            assert int.from_bytes(row[j * width:(j + 1) * width], 'little') == encode_pattern(colors), (guess, answer)
+
+
+def test_random_pairs(words, answers, matrix, rng):
+    repeated_guesses = [word for word in words if has_repeats(word)]
+    repeated_answers = [word for word in answers if has_repeats(word)]
+    cases = [(rng.choice(words), rng.choice(answers)) for _ in range(PAIRS // 2)]
+    cases += [(rng.choice(repeated_guesses), rng.choice(repeated_answers)) for _ in range(PAIRS - PAIRS // 2)]
+    for guess, answer in cases:
+        colors = reference_score(guess, answer)
+        assert score_guess(guess, answer) == colors, (guess, answer)
+        assert decode_pattern(encode_pattern(colors), len(guess)) == colors
+        assert matrix.colors(guess, answer) == colors, (guess, answer)
+
+
+def test_sampled_rows(words, answers, matrix, rng):
+    repeated_guesses = [word for word in words if has_repeats(word)]
+    check_pairs(rng.sample(repeated_guesses, 50) + rng.sample(words, 50), answers, matrix)
+
+
+def test_every_curated_pair(answers, matrix):
+    check_pairs(answers, answers, matrix)
+
+
+@pytest.mark.exhaustive
+def test_every_word_against_every_answer(words, answers, matrix):
+    check_pairs(words, answers, matrix)
@@ -0,0 +1,17 @@
+from lexicon import ALL_WORDS_FILE, CURATED_WORDS_FILE
+from wordlists import find_word_lists
+
+
+def test_answers_and_prior_files_belong_to_their_list(tmp_path):
+    for filename, lines in [('themed.txt', ['CRANE', 'SLOTH']), ('themed.answers.txt', ['CRANE']),
+                            ('themed.prior.txt', ['CRANE 120', 'SLOTH 3']), ('plain_words.txt', ['CRANE']),
+                            ('notes.md', ['not a list'])]:
+        (tmp_path / filename).write_text('\n'.join(lines) + '\n')
+    assert find_word_lists(str(tmp_path)) == [
+        ("Standard", ALL_WORDS_FILE, CURATED_WORDS_FILE),
+        ("Plain Words", str(tmp_path / 'plain_words.txt'), None),
+        ("Themed", str(tmp_path / 'themed.txt'), str(tmp_path / 'themed.answers.txt'))]
+
+
+def test_missing_directory_only_has_the_standard_list(tmp_path):
+    assert find_word_lists(str(tmp_path / 'missing')) == [("Standard", ALL_WORDS_FILE, CURATED_WORDS_FILE)]
@@ -0,0 +1,223 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from game import MAX_GUESSES
+from lexicon import ALL_WORDS_FILE, CURATED_WORDS_FILE, default_answers_file
+from patterns import word_list_hash
+from simulate import STRATEGIES, init_worker, load_strategy, play, read_words
+import argparse
+import json
+import os
+import time
+
+
+CHUNK_SIZE = 100 # Answers per unit of work, which is also how often results reach the disk
+
+
+_files = (ALL_WORDS_FILE, CURATED_WORDS_FILE)
+_strategies = {}
+
+
+def play_chunk(strategy_name: str, chunk: int, answers: list) -> dict:
+    '''
+    Plays one strategy against a chunk of answers in a worker process, making each strategy once per process
+    :param strategy_name: The strategy to play with
+    :param chunk: The chunk's number
+    :param answers: The answers in the chunk
+    :return: The chunk's results: each answer with the guesses made (0 if it was not found), and the seconds spent
+    '''
+    if strategy_name not in _strategies:
+        _strategies[strategy_name] = load_strategy(strategy_name)(read_words(False, *_files))
+    strategy = _strategies[strategy_name]
+    start = time.perf_counter()
+    results = []
+    for answer in answers:
+        _, guesses_made, solved, _, _ = play(answer, strategy)
+        results.append([answer, guesses_made if solved else 0])
+    return {'strategy': strategy_name, 'chunk': chunk, 'results': results, 'seconds': time.perf_counter() - start}
+
+
+def init_tournament_worker(all_file: str, curated_file: str, max_guesses: int, hard: bool = False) -> None:
+    '''
+    Loads the word list and bitset index once per worker process; strategies are made when first needed
+    '''
+    global _files
+    _files = (all_file, curated_file)
+    init_worker(None, all_file, curated_file, max_guesses, hard)
+
+
+class Checkpoint:
+    '''
+    A class that streams finished chunks to an append-only file of JSON lines, so an interrupted tournament picks up
+        where it stopped
+    The first line describes the tournament, and a file describing a different tournament is never resumed; a last
+        line cut off by a crash is ignored and closed off by the next append
+    '''
+    def __init__(self, path: str, settings: dict) -> None:
+        '''
+        :param path: The results file
+        :param settings: Everything that changes the results, which must match the file's to resume it
+        '''
+        self.path = path
+        self.settings = settings
+        self.chunks = []
+
+    def load(self) -> None:
+        '''
+        Reads the chunks finished by earlier runs, starting a new file if there is none
+        '''
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            self.write({'settings': self.settings}, fresh=True)
+            return
+        with open(self.path, 'rb') as file:
+            lines = [line for line in file if line.endswith(b'\n')]
+        if not lines or json.loads(lines[0]).get('settings') != self.settings:
+            raise ValueError(f"ValueError: {self.path} holds a different tournament (use --fresh to replace it)")
+        for line in lines[1:]:
+            try:
+                self.chunks.append(json.loads(line))
+            except ValueError: # A line cut off by a crash and then closed off by a later append
+                continue
+
+    def done(self) -> set:
+        '''
+        :return: (strategy, chunk) pairs already finished
+        '''
+        return {(chunk['strategy'], chunk['chunk']) for chunk in self.chunks}
+
+    def append(self, chunk: dict) -> None:
+        '''
+        Writes one finished chunk to the end of the file
+        :param chunk: The result of play_chunk
+        '''
+        self.chunks.append(chunk)
+        self.write(chunk)
+
+    def write(self, entry: dict, fresh: bool = False) -> None:
+        '''
+        :param entry: One line's JSON object
+        :param fresh: Whether to start the file over
+        '''
+        line = (json.dumps(entry, separators=(',', ':')) + '\n').encode()
+        if not fresh and os.path.getsize(self.path) > 0:
+            with open(self.path, 'rb') as file:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b'\n':
+                    line = b'\n' + line # Closes off a line left unfinished by a crash so it cannot corrupt this one
+        with open(self.path, 'wb' if fresh else 'ab') as file:
+            file.write(line)
+            file.flush()
+            os.fsync(file.fileno())
+
+
+def run_tournament(checkpoint: Checkpoint, strategies: list, answers: list, chunk_size: int = CHUNK_SIZE,
+                   workers: int = None, all_file: str = ALL_WORDS_FILE, curated_file: str = CURATED_WORDS_FILE,
+                   max_guesses: int = MAX_GUESSES, hard: bool = False, progress=None) -> None:
+    '''
+    Plays every strategy against every answer in chunks spread over a pool of processes, skipping chunks the
+        checkpoint already has and saving each chunk as soon as it finishes
+    Strategies take turns chunk by chunk, so partial results already compare every strategy on the same answers
+    Only a few chunks per process are queued at a time, so stopping the run loses little work
+    :param checkpoint: Where finished chunks are kept
+    :param strategies: The strategies' names
+    :param answers: The answers to play against
+    :param chunk_size: Answers per chunk
+    :param workers: How many processes to use (defaults to one per core)
+    :param all_file: The file of every valid word
+    :param curated_file: The file of curated answers (None lets every word be the answer)
+    :param max_guesses: How many guesses a game allows
+    :param hard: Whether games are played in hard mode
+    :param progress: Called as progress(chunks done, chunks in total) after every chunk
+    '''
+    workers = workers or os.cpu_count() or 1
+    chunks = [answers[i:i + chunk_size] for i in range(0, len(answers), chunk_size)]
+    done = checkpoint.done()
+    todo = [(name, n) for n in reversed(range(len(chunks))) for name in reversed(strategies) if (name, n) not in done]
+    total = len(chunks) * len(strategies)
+    finished = total - len(todo)
+    with ProcessPoolExecutor(workers, initializer=init_tournament_worker,
+                             initargs=(all_file, curated_file, max_guesses, hard)) as pool:
+        queued = set()
+        while todo or queued:
+            while todo and len(queued) < workers * 2:
+                name, n = todo.pop() # todo is reversed, so chunks are played in order
+                queued.add(pool.submit(play_chunk, name, n, chunks[n]))
+            ready, queued = wait(queued, return_when=FIRST_COMPLETED)
+            for future in ready:
+                checkpoint.append(future.result())
+                finished += 1
+                if progress is not None:
+                    progress(finished, total)
+
+
+def summarize(chunks: list, strategies: list) -> list:
+    '''
+    :param chunks: Finished chunks
+    :param strategies: The strategies' names, in the order to report them
+    :return: (strategy, games, average guesses when found, worst case when found, not found, seconds playing)
+        for each strategy
+    '''
+    rows = []
+    for name in strategies:
+        counts = [guesses for chunk in chunks if chunk['strategy'] == name for _, guesses in chunk['results']]
+        found = [n for n in counts if n]
+        seconds = sum(chunk['seconds'] for chunk in chunks if chunk['strategy'] == name)
+        rows.append((name, len(counts), sum(found) / max(len(found), 1), max(found, default=0),
+                     len(counts) - len(found), seconds))
+    return rows
+
+
+def print_summary(rows: list, wall: float) -> None:
+    '''
+    Prints each strategy's results, best average first
+    :param rows: The result of summarize
+    :param wall: Wall time of this run in seconds
+    '''
+    print(f"{'strategy':<14}{'games':>8}{'average':>10}{'worst':>8}{'missed':>8}{'seconds':>10}")
+    for name, games, average, worst, missed, seconds in sorted(rows, key=lambda row: (row[4], row[2])):
+        print(f"{name:<14}{games:>8}{average:>10.4f}{worst:>8}{missed:>8}{seconds:>10.1f}")
+    print(f"Seconds are time spent playing each strategy, summed over processes; this run took {wall:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Plays several strategies against every answer and compares them")
+    parser.add_argument('--strategies', default='opener,frequency,recommender,entropy,minimax',
+                        help=f"comma-separated strategies: {', '.join(STRATEGIES)} or module:class")
+    parser.add_argument('--curated', action='store_true', help="play against the curated answers instead of every word")
+    parser.add_argument('--words', default=ALL_WORDS_FILE, help=f"file of every valid word (default: {ALL_WORDS_FILE})")
+    parser.add_argument('--answers', default=None, help="file of curated answers (default: "
+                        f"{CURATED_WORDS_FILE} with the standard words, otherwise every word)")
+    parser.add_argument('--max-guesses', type=int, default=MAX_GUESSES, help=f"guesses allowed per game (default: {MAX_GUESSES})")
+    parser.add_argument('--hard', action='store_true', help="play in hard mode, where every guess must use the revealed hints")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help="answers per chunk saved to the results file")
+    parser.add_argument('--workers', type=int, default=None, help="number of processes (default: one per core)")
+    parser.add_argument('--out', default='tournament.jsonl', help="results file, resumed if it holds the same tournament")
+    parser.add_argument('--fresh', action='store_true', help="start over instead of resuming the results file")
+    args = parser.parse_args()
+
+    strategies = [name.strip() for name in args.strategies.split(',') if name.strip()]
+    for name in strategies:
+        load_strategy(name) # Fails now rather than in every worker
+    answers_file = default_answers_file(args.words, args.answers)
+    answers = read_words(args.curated, args.words, answers_file)
+    settings = {'strategies': strategies, 'answers': word_list_hash(answers),
+                'words': word_list_hash(read_words(False, args.words, answers_file)), 'max_guesses': args.max_guesses,
+                'chunk_size': args.chunk_size}
+    if args.hard: # Only recorded when set, so results files from before hard mode existed still resume
+        settings['hard'] = True
+    if args.fresh and os.path.exists(args.out):
+        os.remove(args.out)
+    checkpoint = Checkpoint(args.out, settings)
+    checkpoint.load()
+    if checkpoint.chunks:
+        print(f"Resuming {args.out}: {len(checkpoint.chunks)} chunks already played")
+    start = time.perf_counter()
+    try:
+        run_tournament(checkpoint, strategies, answers, args.chunk_size, args.workers, args.words, answers_file,
+                       args.max_guesses, args.hard, lambda done, total: print(f"\r{done}/{total} chunks", end='', flush=True))
+        print()
+    except KeyboardInterrupt:
+        print(f"\nStopped; run again to resume from {args.out}")
+    print_summary(summarize(checkpoint.chunks, strategies), time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,50 @@
+from constraints import ConstraintIndex
+from profiling import timed
+
+
 class WordleInfo:
     '''
     A class that contains data used for the wordle helper
+    Instances have a fixed set of attributes (no per-instance dictionary), since the helper keeps a snapshot after
+        every guess
     '''
-    def __init__(self) -> None:
+    __slots__ = ('green', 'yellow', 'black', 'index')
+
+    def __init__(self, index: ConstraintIndex = None, word_length: int = 5) -> None:
         '''
         Initializes data groups (green, yellow, and black)
         Green data is represented as a list of characters, letters in this list belong in that index in the answer
         Yellow data is a dictionary of letter/position pairs (char/list), where the letter is in the answer but not in any
             of the indexes in the position list
         Black data is a list of characters where none of the letters in the list are in the answer
+        :param index: A bitset index of the word list, used to filter every word at once (optional)
+        :param word_length: The number of letters in the answer
         '''
-        self.green = ['_', '_', '_', '_', '_']
+        self.green = ['_'] * word_length
         self.yellow = {}
         self.black = []
+        self.index = index
+
+    def copy(self) -> 'WordleInfo':
+        '''
+        Makes an independent copy of the known information, so it can be used while this object keeps changing
+        :return: A WordleInfo with the same green, yellow and black data and the same index
+        '''
+        info = WordleInfo(self.index, len(self.green))
+        info.green = list(self.green)
+        info.yellow = {letter: [y_duplicity, list(y_indices)] for letter, [y_duplicity, y_indices] in self.yellow.items()}
+        info.black = list(self.black)
+        return info
+
+    def canonical_state(self) -> tuple:
+        '''
+        Makes a hashable form of the known information that is the same for any two states that filter words the same way
+        Letter order in yellow and black and repeated yellow positions do not change filtering, so they are normalized
+        :return: A tuple of the green, yellow and black data
+        '''
+        yellow = tuple(sorted((letter, y_duplicity, tuple(sorted(set(y_indices))))
+                              for letter, [y_duplicity, y_indices] in self.yellow.items()))
+        return tuple(self.green), yellow, tuple(sorted(set(self.black)))
 
     def check_against_info(self, word: str) -> bool:
         '''
@@ -47,6 +79,7 @@ class WordleInfo:
                 return False
         return True
     
+    @timed('WordleInfo.process_input_info')
     def process_input_info(self, word: str, colors: str) -> None:
         '''
         Takes a guess and the colors the wordle program used for it and sorts it into usable data
@@ -79,14 +112,25 @@ class WordleInfo:
             if val[0] == 0:
                 del self.yellow[letter]
 
+    @timed('WordleInfo.get_possible_words')
     def get_possible_words(self, all_words: list) -> list:
         '''
         Takes a list of all possibilities for the answer and reduces it based on the known information
         :param all_words: A list of all words that are known to be answer candidates
         :return: An updated list of all answer candidates based on known information from guesses
         '''
-        possible_words = []        
+        if self.index is not None:
+            return self.index.words_of(self.get_possible_mask(self.index.mask_of(all_words)))
+        possible_words = []
         for word in all_words:
             if self.check_against_info(word):
                 possible_words.append(word)
         return possible_words
+
+    def get_possible_mask(self, mask: int) -> int:
+        '''
+        Reduces a bitset of answer candidates based on the known information, using the bitset index
+        :param mask: A bitset of all words that are known to be answer candidates
+        :return: An updated bitset of all answer candidates based on known information from guesses
+        '''
+        return mask & self.index.filter(self.green, self.yellow, self.black)
@@ -0,0 +1,31 @@
+from lexicon import ALL_WORDS_FILE, CURATED_WORDS_FILE, PRIOR_SUFFIX
+import os
+
+
+WORD_LISTS_DIR = "word_lists"
+ANSWERS_SUFFIX = ".answers.txt"
+
+
+def find_word_lists(directory: str = WORD_LISTS_DIR, default: tuple = (ALL_WORDS_FILE, CURATED_WORDS_FILE)) -> list:
+    '''
+    Finds the word lists that can be played, without reading any of them
+    A list is a text file of every valid word in the directory (such as themed.txt), with an optional file of the
+        words that may be the answer beside it (themed.answers.txt); without one, every word may be the answer
+    A prior file beside a list (themed.prior.txt, see priors.py) belongs to that list, so it is not offered as one
+    Everything derived from a list is cached under a hash of its contents (see lexicon.binary_path and
+        patterns.word_list_hash), so a list is only slow to play the first time it is used or after it is edited
+    :param directory: The directory of extra lists
+    :param default: (file of every valid word, file of curated answers) of the standard list, which comes first
+    :return: (name, file of every valid word, file of curated answers or None) for each list
+    '''
+    word_lists = [("Standard", *default)]
+    if not os.path.isdir(directory):
+        return word_lists
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith('.txt') or filename.endswith((ANSWERS_SUFFIX, PRIOR_SUFFIX)):
+            continue
+        stem = filename[:-len('.txt')]
+        answers = os.path.join(directory, stem + ANSWERS_SUFFIX)
+        word_lists.append((stem.replace('_', ' ').title(), os.path.join(directory, filename),
+                           answers if os.path.exists(answers) else None))
+    return word_lists
@@ -0,0 +1,106 @@
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+from profiling import timed
+
+
+class PossibleWordsModel(QAbstractListModel):
+    '''
+    A list model of the words that can still be the answer
+    Views only ask for the rows they show, and each guess removes words as row deltas instead of resetting the model
+    '''
+    def __init__(self, parent=None) -> None:
+        '''
+        Initializes an empty model
+        :param parent: The model's Qt parent
+        '''
+        super().__init__(parent)
+        self.words = []
+        self.scores = {}
+        self.weighted = None # The words with their prior weights, used to show each word's chance of being the answer
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        '''
+        :param parent: Unused, since the model is a flat list
+        :return: The number of words in the model
+        '''
+        return 0 if parent.isValid() else len(self.words)
+
+    @timed('PossibleWordsModel.data')
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        '''
+        :param index: The row being shown
+        :param role: What the view wants to know about the row
+        :return: The word, followed by its recommender score if it has one and its chance of being the answer if the
+            weights are known
+        '''
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        word = self.words[index.row()]
+        text = word
+        if word in self.scores:
+            text += f"  {self.scores[word]:.2f}"
+        if self.weighted is not None:
+            text += f"  {self.weighted.probability(word):.1%}"
+        return text
+
+    def set_words(self, words: list, weighted=None) -> None:
+        '''
+        Replaces every word in the model, used only when a game starts
+        :param words: The words that can be the answer
+        :param weighted: The same words with their prior weights (see priors.WeightedCandidates), or None
+        '''
+        self.beginResetModel()
+        self.words = list(words)
+        self.scores = {}
+        self.weighted = weighted
+        self.endResetModel()
+
+    def set_weights(self, weighted) -> None:
+        '''
+        Updates the chances shown once the words have been narrowed, which changes every row's text but no row
+        :param weighted: The words left with their prior weights (see priors.WeightedCandidates)
+        '''
+        self.weighted = weighted
+        if self.words:
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.words) - 1, 0))
+
+    def apply_filter(self, remaining_words: list, keep: set = None) -> None:
+        '''
+        Removes every word that is no longer possible, as one removal per run of consecutive rows
+        Runs are removed from the bottom up so the rows of runs still to be removed do not move
+        :param remaining_words: The words that can still be the answer
+        :param keep: The same words as a set, if one has already been made
+        '''
+        keep = set(remaining_words) if keep is None else keep
+        runs = []
+        start = None
+        for row, word in enumerate(self.words):
+            if word in keep:
+                if start is not None:
+                    runs.append((start, row - 1))
+                    start = None
+            elif start is None:
+                start = row
+        if start is not None:
+            runs.append((start, len(self.words) - 1))
+        for first, last in reversed(runs):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.words[first:last + 1]
+            self.endRemoveRows()
+
+    def sort_by_ranking(self, ranking: list) -> None:
+        '''
+        Reorders the words so the best-ranked come first, as a layout change rather than a reset
+        Words that were not ranked keep their order after the ranked ones
+        :param ranking: A list of (word, score) pairs from the recommender, best first
+        '''
+        position = {word: i for i, (word, _) in enumerate(ranking)}
+        unranked = len(position)
+        self.layoutAboutToBeChanged.emit()
+        old_indexes = self.persistentIndexList()
+        old_words = [self.words[index.row()] for index in old_indexes]
+        self.words.sort(key=lambda word: position.get(word, unranked))
+        self.scores = dict(ranking)
+        if old_indexes: # Keeps selections and the current item on the same words
+            new_rows = {word: row for row, word in enumerate(self.words)}
+            self.changePersistentIndexList(old_indexes, [self.index(new_rows[word], 0) for word in old_words])
+        self.layoutChanged.emit()
@@ -0,0 +1,167 @@
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+from analysis import GameAnalysis
+from game import Game, get_allowed_guesses, get_recommender, get_weighted_recommender
+from multiboard import MultiGame
+from profiling import profiler
+import threading
+
+
+class TaskCancelled(Exception):
+    '''
+    Raised inside a helper task when its results are no longer wanted
+    '''
+
+
+class HelperSignals(QObject):
+    '''
+    Signals a helper task uses to post results back to the GUI thread
+    Every signal carries the task's generation so the GUI can ignore results from stale tasks
+    '''
+    progress = pyqtSignal(int, int) # generation, percent done
+    # generation, remaining words, state path, snapshots applied, ranking, weighted remaining words (None for multi-board tasks)
+    finished = pyqtSignal(int, object, object, object, object, object)
+
+
+class HelperTask(QRunnable):
+    '''
+    A task that filters the remaining words and ranks suggestions off the GUI thread
+    It only works on snapshots taken when it was started, so the game can keep changing while it runs
+    '''
+    def __init__(self, generation: int, game: Game) -> None:
+        '''
+        :param generation: A number identifying this task, increased every time a new task replaces an old one
+        :param game: The game whose pending helper work is done
+        '''
+        super().__init__()
+        self.generation = generation
+        self.lexicon = game.lexicon
+        self.remaining_words, self.infos, self.state_path = game.pending_work()
+        self.rules = game.rules.copy() if game.hard else None
+        self.weighted = game.weighted # Never changed in place (None in multi-board games, which do not weight boards)
+        self.signals = HelperSignals()
+        self.cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        '''
+        Asks the task to stop at its next check; it then posts nothing
+        '''
+        self.cancelled.set()
+
+    def report(self, done: int, total: int) -> None:
+        '''
+        Posts progress while suggestions are ranked and stops the task if it was cancelled
+        :param done: Guesses scored so far
+        :param total: Guesses to score
+        '''
+        if self.cancelled.is_set():
+            raise TaskCancelled()
+        self.signals.progress.emit(self.generation, 100 * done // max(total, 1))
+
+    def run(self) -> None:
+        '''
+        Filters the words with each pending snapshot of helper info, then ranks guesses over what is left weighted by
+            the prior, only ranking the guesses hard mode allows in a hard mode game
+        '''
+        try:
+            remaining_words, state_path = self.remaining_words, self.state_path
+            with profiler.section('HelperTask filter'):
+                for info in self.infos:
+                    if self.cancelled.is_set():
+                        return
+                    remaining_words, state_path = Game.filter_pending(remaining_words, [info], state_path, self.lexicon)
+            with profiler.section('HelperTask rank'):
+                guesses = None if self.rules is None else get_allowed_guesses(self.lexicon).lookup(self.rules)
+                weighted = self.weighted.narrowed(remaining_words) # Posted too, so the GUI thread does not narrow again
+                ranking = get_weighted_recommender(self.lexicon).rank(remaining_words, None, guesses, self.report,
+                                                                      weighted.statistics())
+        except TaskCancelled:
+            profiler.count('helper tasks cancelled')
+            return
+        if not self.cancelled.is_set():
+            self.signals.finished.emit(self.generation, remaining_words, state_path, len(self.infos), ranking, weighted)
+
+
+class MultiHelperTask(HelperTask):
+    '''
+    A helper task for a multi-board game, which filters every board and ranks guesses over all unsolved boards
+    Its finished signal carries one entry per board for the remaining words, state paths and snapshots applied
+    '''
+    def __init__(self, generation: int, game: MultiGame) -> None:
+        '''
+        :param generation: A number identifying this task, increased every time a new task replaces an old one
+        :param game: The multi-board game whose pending helper work is done
+        '''
+        super().__init__(generation, game)
+        self.unsolved = game.unsolved()
+
+    def run(self) -> None:
+        '''
+        Filters each board with its pending snapshots of helper info, then ranks guesses over the unsolved boards
+        '''
+        try:
+            remaining_words, state_paths, applied = MultiGame.filter_pending(self.remaining_words, self.infos,
+                                                                             self.state_path, self.lexicon)
+            if self.cancelled.is_set():
+                return
+            boards = [remaining_words[board] for board in self.unsolved]
+            ranking = get_recommender(self.lexicon).rank_boards(boards, None, progress=self.report)
+        except TaskCancelled:
+            return
+        if not self.cancelled.is_set():
+            self.signals.finished.emit(self.generation, remaining_words, state_paths, applied, ranking, None)
+
+
+class AnalysisSignals(QObject):
+    '''
+    Signals an analysis task uses to post results back to the GUI thread
+    '''
+    finished = pyqtSignal(int, object) # generation, result of GameAnalysis.compute
+
+
+class AnalysisTask(QRunnable):
+    '''
+    A task that analyzes the turns of a game not yet analyzed, and ranks the position the player is thinking about
+    It only works on a snapshot taken when it was started, like a helper task
+    '''
+    def __init__(self, generation: int, game: Game, ahead: bool = True) -> None:
+        '''
+        :param generation: A number identifying this task, increased every time a new task replaces an old one
+        :param game: The game being analyzed
+        :param ahead: Whether to rank the position after the last guess (not needed once the game is over)
+        '''
+        super().__init__()
+        self.generation = generation
+        self.lexicon = game.lexicon
+        self.work = game.analysis.pending_work(game.guesses)
+        self.ahead = ahead
+        self.warm = game.helper and not game.guesses # The helper's recommender is loaded before its first ranking
+        self.signals = AnalysisSignals()
+        self.cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        '''
+        Asks the task to stop at its next check; it then posts nothing
+        '''
+        self.cancelled.set()
+
+    def check(self, done: int, total: int) -> None:
+        '''
+        Stops the ranking if the task was cancelled
+        '''
+        if self.cancelled.is_set():
+            raise TaskCancelled()
+
+    def run(self) -> None:
+        '''
+        Analyzes the snapshot's turns, loading the helper's weighted recommender first at the start of a helper game
+        '''
+        try:
+            if self.warm:
+                get_weighted_recommender(self.lexicon)
+            with profiler.section('AnalysisTask compute'):
+                result = GameAnalysis.compute(self.lexicon, *self.work, self.ahead, self.check)
+        except TaskCancelled:
+            profiler.count('analysis tasks cancelled')
+            return
+        if not self.cancelled.is_set():
+            self.signals.finished.emit(self.generation, result)